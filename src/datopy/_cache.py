@@ -0,0 +1,482 @@
+"""
+Caches and request coalescing for the metadata retrieval routines.
+
+.. warning:: The contents of this module will be moved in a future release.
+
+.. rubric:: Negative results
+
+.. autosummary::
+    :toctree: generated/
+
+    NegativeCache
+    negative_cache
+    query_key
+
+.. rubric:: Coalescing
+
+.. autosummary::
+    :toctree: generated/
+
+    SingleFlight
+    single_flight
+"""
+
+import os
+import sys
+import time
+import asyncio
+import sqlite3
+import inspect
+import threading
+import functools
+from typing import (
+    Any, Awaitable, Callable, Hashable, NamedTuple, TypeVar, cast,
+)
+
+from datopy.etl import normalize_title
+from datopy.util._numpydoc_validate import numpydoc_validate_module
+
+
+T = TypeVar('T')
+
+# -- Negative results --------------------------------------------------------
+
+
+class NegativeCacheStats(NamedTuple):
+    """
+    Usage counters of a :class:`NegativeCache`.
+    """
+    lookups: int
+    avoided: int
+    recorded: int
+    expired: int
+
+
+def query_key(
+    query: str | tuple[Any, ...],
+    base_url: str | None = None
+) -> str:
+    """
+    Normalize a query (a title, or a ``MediaQuery`` such as a ``Film``) into
+    a cache key, so that variants in case, spacing, and accents share it.
+
+    Parameters
+    ----------
+    query : str | tuple
+        A title, or a named tuple of query fields.
+    base_url : str, default=None
+        The URL of the host queried, if the source may be served by several
+        (e.g. a local stand-in), so that each host has its own keys.
+
+    Returns
+    -------
+    str
+        The host's URL, if any, then the query's type and its normalized
+        fields.
+
+    Examples
+    --------
+    >>> from datopy._cache import query_key
+    >>> from datopy._examples import Album
+
+    >>> query_key(Album("Amnesiac ", "Radiohead"))
+    'Album|amnesiac|radiohead'
+    >>> query_key("  Amélie")
+    'str|amelie'
+    >>> query_key("Amélie", base_url="http://127.0.0.1:8000")
+    'http://127.0.0.1:8000|str|amelie'
+    """
+    fields = [query] if isinstance(query, str) else list(query)
+    prefix = [base_url] if base_url else []
+    return "|".join(prefix + [type(query).__name__] + [
+        normalize_title(field) if isinstance(field, str) else ''
+        for field in fields
+    ])
+
+
+class NegativeCache:
+    """
+    Persistent record of queries that a source found no result for.
+
+    Misses are kept in a SQLite database, so they are shared by threads and
+    processes and survive across runs. Each expires ``ttl`` seconds after it
+    was recorded, after which the source is queried again.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The database file (``':memory:'`` for a cache private to the
+        instance).
+    ttl : float, default=86400
+        Seconds for which a miss is remembered.
+
+    Examples
+    --------
+    >>> from datopy._cache import NegativeCache
+    >>> from datopy._examples import Film
+
+    >>> cache = NegativeCache(':memory:', ttl=60)
+    >>> cache.contains('imdb', Film("ths shukshank redumption"))
+    False
+    >>> cache.add('imdb', Film("ths shukshank redumption"))
+    >>> cache.contains('imdb', Film("Ths Shukshank  Redumption"))
+    True
+    >>> cache.contains('wiki', Film("ths shukshank redumption"))
+    False
+    >>> cache.contains('imdb', Film("ths shukshank redumption"),
+    ...                base_url="http://127.0.0.1:8000")
+    False
+    >>> cache.stats
+    NegativeCacheStats(lookups=4, avoided=1, recorded=1, expired=0)
+
+    Expired misses are forgotten
+
+    >>> cache.ttl = 0
+    >>> cache.add('imdb', Film("stalker"))
+    >>> cache.contains('imdb', Film("stalker"))
+    False
+    >>> cache.stats.expired
+    1
+    """
+
+    def __init__(self, path: str | os.PathLike[str], ttl: float = 86400):
+        self.path = os.fspath(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS misses (source TEXT, key TEXT, "
+                "expires REAL, PRIMARY KEY (source, key))")
+        self._lookups = 0
+        self._avoided = 0
+        self._recorded = 0
+        self._expired = 0
+
+    @property
+    def stats(self) -> NegativeCacheStats:
+        """
+        Lookups, lookups answered from the cache (requests avoided), misses
+        recorded, and misses found to have expired.
+        """
+        with self._lock:
+            return NegativeCacheStats(self._lookups, self._avoided,
+                                      self._recorded, self._expired)
+
+    def contains(
+        self,
+        source: str,
+        query: str | tuple[Any, ...],
+        base_url: str | None = None
+    ) -> bool:
+        """
+        Whether ``source`` is known to have no result for ``query``.
+
+        Parameters
+        ----------
+        source : str
+            The source queried (e.g. ``'imdb'``).
+        query : str | tuple
+            The title or ``MediaQuery`` looked up.
+        base_url : str, default=None
+            The URL of the host queried, if not the source's usual one.
+
+        Returns
+        -------
+        bool
+            True if an unexpired miss is recorded, in which case the source
+            need not be queried.
+        """
+        key = query_key(query, base_url)
+        with self._lock:
+            self._lookups += 1
+            row = self._conn.execute(
+                "SELECT expires FROM misses WHERE source = ? AND key = ?",
+                (source, key)).fetchone()
+            if row is None:
+                return False
+            if row[0] <= time.time():
+                self._expired += 1
+                with self._conn:
+                    self._conn.execute(
+                        "DELETE FROM misses WHERE source = ? AND key = ?",
+                        (source, key))
+                return False
+            self._avoided += 1
+            return True
+
+    def add(
+        self,
+        source: str,
+        query: str | tuple[Any, ...],
+        base_url: str | None = None
+    ) -> None:
+        """
+        Record that ``source`` has no result for ``query``.
+
+        Parameters
+        ----------
+        source : str
+            The source queried.
+        query : str | tuple
+            The title or ``MediaQuery`` looked up.
+        base_url : str, default=None
+            The URL of the host queried, if not the source's usual one.
+        """
+        with self._lock, self._conn:
+            self._recorded += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO misses VALUES (?, ?, ?)",
+                (source, query_key(query, base_url), time.time() + self.ttl))
+
+    def clear(self) -> None:
+        """
+        Forget every recorded miss.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM misses")
+
+
+@functools.lru_cache(maxsize=1)
+def negative_cache() -> NegativeCache:
+    """
+    Return the process-wide cache of retrieval misses.
+
+    Misses are kept in memory, for the process only, unless a database is
+    given by the ``NEGATIVE_CACHE_PATH`` environment variable (e.g.
+    ``.cache-negative-results``), to share them with other processes and
+    runs. The time to live, in seconds, is read from ``NEGATIVE_CACHE_TTL``
+    (default one day). Both are read when the cache is first used.
+
+    Returns
+    -------
+    NegativeCache
+        The shared cache.
+    """
+    path = os.getenv("NEGATIVE_CACHE_PATH") or ':memory:'
+    ttl = float(os.getenv("NEGATIVE_CACHE_TTL", 86400))
+    return NegativeCache(path, ttl=ttl)
+
+
+# -- Coalescing --------------------------------------------------------------
+
+
+class SingleFlightStats(NamedTuple):
+    """
+    Usage counters of a :class:`SingleFlight`.
+    """
+    calls: int
+    coalesced: int
+
+
+class _Call:
+    """
+    A fetch in flight, awaited by the threads that requested it.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Share one in-flight fetch among concurrent identical requests.
+
+    While a fetch for a key is running, further requests for the same key
+    wait for it and receive its result, or its exception, instead of
+    fetching again. Once it completes the key is forgotten, so later
+    requests fetch afresh. Threads call :meth:`do`; asyncio tasks await
+    :meth:`do_async`.
+
+    Examples
+    --------
+    >>> import threading, time
+    >>> from datopy._cache import SingleFlight
+
+    >>> fetches = []
+    >>> def fetch(title):
+    ...     fetches.append(title)
+    ...     time.sleep(0.1)
+    ...     return title.upper()
+
+    >>> group = SingleFlight()
+    >>> results = []
+    >>> threads = [
+    ...     threading.Thread(target=lambda: results.append(
+    ...         group.do('stalker', fetch, 'stalker')))
+    ...     for _ in range(4)
+    ... ]
+    >>> for thread in threads:
+    ...     thread.start()
+    >>> for thread in threads:
+    ...     thread.join()
+    >>> results, fetches
+    (['STALKER', 'STALKER', 'STALKER', 'STALKER'], ['stalker'])
+    >>> group.stats
+    SingleFlightStats(calls=4, coalesced=3)
+
+    Asyncio tasks share coroutines in the same way
+
+    >>> import asyncio
+    >>> async def afetch(title):
+    ...     await asyncio.sleep(0.1)
+    ...     return title.upper()
+    >>> async def main():
+    ...     return await asyncio.gather(
+    ...         *[group.do_async('solaris', afetch, 'solaris')
+    ...           for _ in range(3)])
+    >>> asyncio.run(main())
+    ['SOLARIS', 'SOLARIS', 'SOLARIS']
+    >>> group.stats.coalesced
+    5
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple[Any, Hashable], asyncio.Future[Any]] = {}
+        self._n_calls = 0
+        self._coalesced = 0
+
+    @property
+    def stats(self) -> SingleFlightStats:
+        """
+        Requests made, and requests that shared another's fetch.
+        """
+        with self._lock:
+            return SingleFlightStats(self._n_calls, self._coalesced)
+
+    def do(
+        self,
+        key: Hashable,
+        fn: Callable[..., T],
+        *args: Any,
+        **kwargs: Any
+    ) -> T:
+        """
+        Call ``fn(*args, **kwargs)``, unless a call for ``key`` is in flight.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the request; requests with equal keys are coalesced.
+        fn : Callable
+            Performs the fetch.
+        *args, **kwargs
+            Arguments passed to ``fn``.
+
+        Returns
+        -------
+        T
+            The result of the fetch, whichever thread performed it.
+
+        Raises
+        ------
+        BaseException
+            Whatever the fetch raised.
+        """
+        with self._lock:
+            self._n_calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self._coalesced += 1
+
+        if leader:
+            try:
+                call.result = fn(*args, **kwargs)
+            except BaseException as err:
+                call.error = err
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return cast(T, call.result)
+
+    async def do_async(
+        self,
+        key: Hashable,
+        fn: Callable[..., Awaitable[T] | T],
+        *args: Any,
+        **kwargs: Any
+    ) -> T:
+        """
+        Await ``fn(*args, **kwargs)``, unless a call for ``key`` is in flight.
+
+        Parameters
+        ----------
+        key : Hashable
+            Identifies the request; requests with equal keys are coalesced.
+        fn : Callable
+            A coroutine function performing the fetch. A blocking function
+            is run in a worker thread via :meth:`do`, so that it is also
+            coalesced with requests from other threads.
+        *args, **kwargs
+            Arguments passed to ``fn``.
+
+        Returns
+        -------
+        T
+            The result of the fetch, whichever task performed it.
+
+        Raises
+        ------
+        BaseException
+            Whatever the fetch raised. Cancelling one waiting task does not
+            cancel the shared fetch.
+        """
+        task_key = (asyncio.get_running_loop(), key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                if inspect.iscoroutinefunction(fn):
+                    self._n_calls += 1
+                    coro = fn(*args, **kwargs)
+                else:
+                    coro = asyncio.to_thread(self.do, key, fn, *args,
+                                             **kwargs)
+                task = self._tasks[task_key] = asyncio.ensure_future(coro)
+                task.add_done_callback(
+                    functools.partial(self._forget_task, task_key))
+            else:
+                self._n_calls += 1
+                self._coalesced += 1
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key: tuple[Any, Hashable], _: Any) -> None:
+        """
+        Remove a completed fetch, so that later requests fetch afresh.
+        """
+        with self._lock:
+            del self._tasks[task_key]
+
+
+@functools.lru_cache(maxsize=1)
+def single_flight() -> SingleFlight:
+    """
+    Return the process-wide group of coalesced retrieval requests.
+
+    Returns
+    -------
+    SingleFlight
+        The shared group.
+    """
+    return SingleFlight()
+
+
+if __name__ == "__main__":
+    # Comment out (2) to run all tests in script; (1) to run specific tests
+    # doctest.testmod(verbose=True)
+    # doctest_function(NegativeCache, globs=globals())
+
+    numpydoc_validate_module(sys.modules['__main__'])
@@ -0,0 +1,377 @@
+"""
+Shared, reusable clients for the metadata sources.
+
+.. warning:: The contents of this module will be moved in a future release.
+
+Constructing an API client repeats its setup and discards its open HTTP
+connections. The routines here hand out long-lived clients instead.
+
+.. rubric:: Pools
+
+.. autosummary::
+    :toctree: generated/
+
+    ClientPool
+    cinemagoer_pool
+
+.. rubric:: Spotify
+
+.. autosummary::
+    :toctree: generated/
+
+    SharedClientCredentials
+    spotify_client
+"""
+
+import os
+import sys
+import time
+import queue
+import threading
+import functools
+import contextlib
+from typing import Any, Callable, Generic, Iterator, NamedTuple, TypeVar
+
+import spotipy
+from imdb import Cinemagoer
+from spotipy.cache_handler import CacheFileHandler
+from spotipy.oauth2 import SpotifyClientCredentials
+
+if sys.platform == "win32":
+    import msvcrt
+else:
+    import fcntl
+
+from datopy._http import resilient_session
+from datopy.util._numpydoc_validate import numpydoc_validate_module
+
+
+T = TypeVar('T')
+
+
+# -- Pools -------------------------------------------------------------------
+
+
+class PoolStats(NamedTuple):
+    """
+    Usage counters of a :class:`ClientPool`.
+    """
+    created: int
+    checkouts: int
+    waits: int
+    wait_seconds: float
+
+
+class ClientPool(Generic[T]):
+    """
+    Thread-safe pool of up to ``size`` reusable clients.
+
+    Clients are created lazily, on checkout, until the pool holds ``size`` of
+    them. Further checkouts wait for a client to be returned, most recently
+    used first so that its connections are still warm.
+
+    Parameters
+    ----------
+    factory : Callable[[], T]
+        Creates a new client.
+    size : int, default=4
+        Maximum number of clients, and hence of concurrent checkouts.
+
+    Examples
+    --------
+    >>> import itertools, threading, time
+    >>> from datopy._clients import ClientPool
+
+    >>> ids = itertools.count()
+    >>> pool = ClientPool(lambda: f"client {next(ids)}", size=2)
+    >>> with pool.client() as client:
+    ...     print(client)
+    client 0
+    >>> with pool.client() as client:
+    ...     print(client)
+    client 0
+
+    Concurrent checkouts share at most ``size`` clients
+
+    >>> def work():
+    ...     with pool.client():
+    ...         time.sleep(0.05)
+    >>> threads = [threading.Thread(target=work) for _ in range(6)]
+    >>> for thread in threads:
+    ...     thread.start()
+    >>> for thread in threads:
+    ...     thread.join()
+    >>> pool.stats.created, pool.stats.checkouts
+    (2, 8)
+    >>> pool.stats.waits
+    4
+    """
+
+    def __init__(self, factory: Callable[[], T], size: int = 4):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.factory = factory
+        self.size = size
+        self._idle: queue.LifoQueue[T] = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+
+    @property
+    def stats(self) -> PoolStats:
+        """
+        Clients created, checkouts, checkouts that waited, and time waited.
+        """
+        with self._lock:
+            return PoolStats(self._created, self._checkouts, self._waits,
+                             self._wait_seconds)
+
+    def _checkout(self, timeout: float | None) -> T:
+        """
+        Take an idle client, create one if below capacity, or else wait.
+        """
+        with self._lock:
+            self._checkouts += 1
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+        if create:
+            try:
+                return self.factory()
+            except BaseException:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        start = time.perf_counter()
+        try:
+            client = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No client was returned to the pool within {timeout} s."
+            ) from None
+        finally:
+            with self._lock:
+                self._waits += 1
+                self._wait_seconds += time.perf_counter() - start
+        return client
+
+    @contextlib.contextmanager
+    def client(self, timeout: float | None = None) -> Iterator[T]:
+        """
+        Check out a client for the duration of a ``with`` block.
+
+        Parameters
+        ----------
+        timeout : float, default=None
+            Seconds to wait for a client if all are in use. None waits
+            indefinitely.
+
+        Yields
+        ------
+        T
+            A client, returned to the pool when the block exits.
+
+        Raises
+        ------
+        TimeoutError
+            If no client becomes available within ``timeout`` seconds.
+        """
+        client = self._checkout(timeout)
+        try:
+            yield client
+        finally:
+            self._idle.put(client)
+
+
+@functools.lru_cache(maxsize=1)
+def cinemagoer_pool() -> ClientPool[Cinemagoer]:
+    """
+    Return the process-wide pool of :class:`~imdb.Cinemagoer` clients.
+
+    The pool size is read from the ``CINEMAGOER_POOL_SIZE`` environment
+    variable (default 4) when the pool is first used.
+
+    Returns
+    -------
+    ClientPool[Cinemagoer]
+        The shared pool.
+    """
+    size = int(os.getenv("CINEMAGOER_POOL_SIZE", 4))
+    return ClientPool(Cinemagoer, size=size)
+
+
+# -- Spotify -----------------------------------------------------------------
+
+
+@contextlib.contextmanager
+def _file_lock(path: str | os.PathLike[str]) -> Iterator[None]:
+    """
+    Hold an exclusive lock on ``path`` (created if necessary), blocking
+    until other threads and processes release it.
+    """
+    with open(path, "a+b") as file:
+        if sys.platform == "win32":
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if sys.platform == "win32":
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class SharedClientCredentials(SpotifyClientCredentials):
+    """
+    Spotify client credentials whose token is shared across processes.
+
+    The token is kept in memory and in a cache file. Reading, refreshing, and
+    saving the cached token happen under a file lock, so concurrent threads
+    and worker processes exchange credentials once per token rather than
+    once each. Tokens are refreshed ``refresh_margin`` seconds before they
+    expire, so requests never carry an expired token.
+
+    Parameters
+    ----------
+    cache_path : str | os.PathLike
+        The token cache file. Its lock is ``{cache_path}.lock``.
+    refresh_margin : float, default=300
+        Seconds before expiry at which the token is refreshed.
+    token_url : str, default=None
+        Optional token endpoint replacing Spotify's (e.g. a local stand-in).
+    **kwargs
+        Options passed to :class:`~spotipy.oauth2.SpotifyClientCredentials`,
+        such as ``client_id`` and ``client_secret`` (read from the
+        ``SPOTIPY_CLIENT_ID`` and ``SPOTIPY_CLIENT_SECRET`` environment
+        variables if omitted).
+    """
+
+    def __init__(
+        self,
+        cache_path: str | os.PathLike[str],
+        refresh_margin: float = 300,
+        token_url: str | None = None,
+        **kwargs
+    ):
+        super().__init__(
+            cache_handler=CacheFileHandler(cache_path=os.fspath(cache_path)),
+            **kwargs)
+        self.lock_path = f"{os.fspath(cache_path)}.lock"
+        self.refresh_margin = refresh_margin
+        if token_url is not None:
+            self.OAUTH_TOKEN_URL = token_url
+        self.exchanges = 0
+        self._token: dict[str, Any] | None = None
+        self._lock = threading.Lock()
+
+    def is_token_expired(  # type: ignore [override]
+        self,
+        token_info: dict[str, Any]
+    ) -> bool:
+        """
+        Whether the token is due to be refreshed.
+
+        Parameters
+        ----------
+        token_info : dict
+            A token, with its ``expires_at`` time.
+
+        Returns
+        -------
+        bool
+            True if the token expires within ``refresh_margin`` seconds.
+        """
+        remaining = token_info['expires_at'] - time.time()
+        return bool(remaining < self.refresh_margin)
+
+    def get_access_token(
+        self,
+        as_dict: bool = False,
+        check_cache: bool = True
+    ) -> dict[str, Any] | str:
+        """
+        Return a current access token, refreshing the shared token if due.
+
+        Parameters
+        ----------
+        as_dict : bool, default=False
+            Option to return the token's full description.
+        check_cache : bool, default=True
+            Option to use a current cached token; False forces a refresh.
+
+        Returns
+        -------
+        dict | str
+            The access token.
+        """
+        with self._lock:
+            token = self._token if check_cache else None
+            if token is None or self.is_token_expired(token):
+                with _file_lock(self.lock_path):
+                    # Another process may have refreshed the token already
+                    token = (self.cache_handler.get_cached_token()
+                             if check_cache else None)
+                    if not token or self.is_token_expired(token):
+                        token = self._add_custom_values_to_token_info(
+                            self._request_access_token())
+                        self.cache_handler.save_token_to_cache(token)
+                        self.exchanges += 1
+                self._token = token
+        return token if as_dict else token['access_token']
+
+
+@functools.lru_cache(maxsize=None)
+def spotify_client(
+    cache_path: str | None = None,
+    token_url: str | None = None,
+    api_url: str | None = None
+) -> spotipy.Spotify:
+    """
+    Return the process-wide Spotify client for the given settings.
+
+    Parameters
+    ----------
+    cache_path : str, default=None
+        The shared token cache file. Defaults to the ``SPOTIFY_TOKEN_CACHE``
+        environment variable, or ``.cache-spotify-token`` in the working
+        directory.
+    token_url : str, default=None
+        Optional token endpoint replacing Spotify's.
+    api_url : str, default=None
+        Optional Web API root replacing Spotify's (e.g. a local stand-in),
+        such as ``'http://localhost:8000/v1/'``.
+
+    Returns
+    -------
+    spotipy.Spotify
+        A client authorized by :class:`SharedClientCredentials`, reused by
+        every call with the same arguments. Its API requests are sent
+        through a :func:`~datopy._http.resilient_session`, so they respect
+        the current deadline.
+    """
+    token_cache = cache_path or os.getenv("SPOTIFY_TOKEN_CACHE") or \
+        ".cache-spotify-token"
+    sp = spotipy.Spotify(
+        auth_manager=SharedClientCredentials(token_cache, token_url=token_url),
+        requests_session=resilient_session())
+    if api_url is not None:
+        sp.prefix = api_url
+    return sp
+
+
+if __name__ == "__main__":
+    # Comment out (2) to run all tests in script; (1) to run specific tests
+    # doctest.testmod(verbose=True)
+    # doctest_function(ClientPool, globs=globals())
+
+    numpydoc_validate_module(sys.modules['__main__'])
@@ -28,24 +28,32 @@ import re
 import sys
 import copy
 import json
+import contextlib
 import pprint
 import doctest
 import pathlib
 import pandas as pd
 from jsonschema import validate
 from collections import namedtuple
-from typing import Literal, NamedTuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, Literal, NamedTuple
 
 import imdb
 import spotipy
 import wptools
-from imdb import Cinemagoer
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 from spotipy.oauth2 import SpotifyClientCredentials
 
 # import datopy._settings
-from datopy.etl import omit_string_patterns
+from datopy.etl import TrigramIndex, omit_string_patterns
+from datopy._cache import negative_cache, query_key, single_flight
+from datopy._clients import cinemagoer_pool, spotify_client
+from datopy._http import (
+    AdaptiveLimiter, DeadlineExceeded, carry_deadline, check_deadline,
+    expiry, remaining,
+)
+from datopy._media_scrape import WikiBackend, get_wiki_infoboxes
 from datopy.workflow import doctest_function
 from datopy.modeling import (
     apply_recursive, list_to_dict, schema_jsonify
@@ -179,62 +187,191 @@ def _leaf_2(x: int, y: int):
 # -- Helpers -----------------------------------------------------------------
 
 
+def correct_query_title(
+    query: MediaQuery,
+    matcher: TrigramIndex,
+    min_score: float = 0.5
+) -> MediaQuery:
+    """
+    Replace a misspelled query title with the closest known title.
+
+    Parameters
+    ----------
+    query : MediaQuery
+        The query (e.g. a ``Film``, ``Album``, or ``Book``) to correct.
+    matcher : TrigramIndex
+        An approximate-matching index over known titles.
+    min_score : float, default=0.5
+        Minimum similarity required to replace the title.
+
+    Returns
+    -------
+    MediaQuery
+        A query of the same type, with its title replaced by the best match
+        (in normalized form), or the original query if nothing matches.
+
+    Examples
+    --------
+    >>> from datopy.etl import TrigramIndex
+    >>> from datopy._examples import Album, Film, correct_query_title
+
+    >>> matcher = TrigramIndex(["Kid A", "Amnesiac", "Spirited Away"])
+    >>> correct_query_title(Film("spirted awya"), matcher)
+    Film(title='spirited away', artist=None)
+    >>> correct_query_title(Album("amnesaic", "radiohead"), matcher)
+    Album(title='amnesiac', artist='radiohead')
+    >>> correct_query_title(Album("ok computer", "radiohead"), matcher)
+    Album(title='ok computer', artist='radiohead')
+    """
+    matches = matcher.search(query.title, k=1, min_score=min_score)
+    return query._replace(title=matches[0][0]) if matches else query
+
+
 # TODO: refactor later into SubProcessor
 
 
-def spotify_album_retrieve(album: Album) -> dict:
+def spotify_album_retrieve(
+    album: Album,
+    sp: spotipy.Spotify | None = None
+) -> dict:
     """
     Retrieve metadata for a given musical album via Spotify.
+
+    Concurrent retrievals of the same album share one fetch.
     """
-    sp = spotipy.Spotify(
-        client_credentials_manager=SpotifyClientCredentials()
-    )
-    results = sp.search(
-        q=f'artist:{album.artist} album:{album.title}', type='album'
-    )
-    if results['albums']['total'] == 0:
-        raise LookupError(f"No result found for {album}.")
-
-    album_results = results['albums']['items'][0]
-    album_id = album_results['id']
-    album_details = sp.album(album_id)
-    tracks = sp.album_tracks(album_id)['items']
-
-    # Retrieve additional track details
-    track_audio_features_tmp = []
-    track_streams_tmp = []
-    for track_num, track_info in enumerate(tracks, start=1):
-        track_id = track_info['id']
-        # sp.audio_analysis(track_id)
-        track_audio_features_tmp.append(sp.audio_features(track_id)[0])
-        track_streams_tmp.append(sp.track(track_id)['popularity'])
+    sp = sp or spotify_client()
+    key = ('spotify', query_key(album), sp)
+    return single_flight().do(key, spotify_albums_retrieve, [album], sp)[0]
 
-    track_audio_features = list_to_dict(track_audio_features_tmp)
-    track_streams = list_to_dict(track_streams_tmp)
+
+def spotify_albums_retrieve(
+    albums: Iterable[Album],
+    sp: spotipy.Spotify | None = None
+) -> list[dict]:
+    """
+    Retrieve metadata for many musical albums via Spotify.
+
+    Album details are requested 20 albums at a time, and the audio features
+    and popularity of their tracks 100 and 50 tracks at a time, with each
+    distinct track requested once however many albums include it.
+
+    Parameters
+    ----------
+    albums : Iterable[Album]
+        The albums to retrieve.
+    sp : spotipy.Spotify, default=None
+        The Spotify client to use. Defaults to the shared
+        :func:`~datopy._clients.spotify_client`.
+
+    Returns
+    -------
+    list[dict]
+        Each album's details, with ``track_audio_features`` and
+        ``track_streams`` (popularity) of its tracks, in order.
+    """
+    sp = sp or spotify_client()
+    misses = negative_cache()
+
+    album_ids = []
+    for album in albums:
+        if misses.contains('spotify', album, sp.prefix):
+            raise LookupError(f"No result found for {album}.")
+        results = sp.search(
+            q=f'artist:{album.artist} album:{album.title}', type='album'
+        )
+        if results['albums']['total'] == 0:
+            misses.add('spotify', album, sp.prefix)
+            raise LookupError(f"No result found for {album}.")
+        album_ids.append(results['albums']['items'][0]['id'])
+
+    # Album details, and every page of each album's tracks
+    album_details = {}
+    track_ids = {}
+    for chunk in _chunked(list(dict.fromkeys(album_ids)), 20):
+        for details in sp.albums(chunk)['albums']:
+            page = details['tracks']
+            tracks = list(page['items'])
+            while page['next']:
+                page = sp.next(page)
+                tracks.extend(page['items'])
+            album_details[details['id']] = details
+            track_ids[details['id']] = [track['id'] for track in tracks]
+
+    # Retrieve additional track details, once per distinct track
+    unique_ids = list(dict.fromkeys(
+        track_id for ids in track_ids.values() for track_id in ids))
+    audio_features = {}
+    for chunk in _chunked(unique_ids, 100):
+        # sp.audio_analysis(track_id)
+        audio_features.update(zip(chunk, sp.audio_features(chunk)))
+    popularity = {}
+    for chunk in _chunked(unique_ids, 50):
+        popularity.update(
+            (track_id, track['popularity'] if track else None)
+            for track_id, track in zip(chunk, sp.tracks(chunk)['tracks']))
 
     # Merge album details with additional track details
-    obj = copy.deepcopy(album_details)
-    obj['track_audio_features'] = track_audio_features
-    obj['track_streams'] = track_streams
+    objs = []
+    for album_id in album_ids:
+        obj = copy.deepcopy(album_details[album_id])
+        obj['track_audio_features'] = list_to_dict(
+            [audio_features[track_id] for track_id in track_ids[album_id]])
+        obj['track_streams'] = list_to_dict(
+            [popularity[track_id] for track_id in track_ids[album_id]])
+        objs.append(obj)
 
-    return obj
+    return objs
+
+
+def _chunked(items: list, size: int) -> Iterator[list]:
+    """
+    Split a list into consecutive chunks of at most ``size`` items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
 
 
 def imdb_film_retrieve(film: Film) -> dict:
     """
     IMDb film metadata retrieval routine.
+
+    Concurrent retrievals of the same film share one fetch.
     """
-    ia = Cinemagoer()
-    movies = ia.search_movie(film.title)
-    if not movies:
+    check_deadline()
+    if negative_cache().contains('imdb', film):
         raise LookupError(f"No result found for {film}.")
-    else:
-        obj = ia.get_movie(movies[0].movieID)
+
+    return single_flight().do(('imdb', query_key(film)), _imdb_film_fetch,
+                              film)
+
+
+def _imdb_film_fetch(film: Film) -> dict:
+    """
+    Search for a film with a pooled Cinemagoer client and fetch the best match.
+    """
+    misses = negative_cache()
+    budget = remaining()
+    with contextlib.ExitStack() as stack:
+        try:
+            ia = stack.enter_context(cinemagoer_pool().client(
+                timeout=None if budget is None else max(budget, 0)))
+        except TimeoutError as err:
+            raise DeadlineExceeded(
+                f"Deadline exceeded awaiting a client for {film}.") from err
+        movies = ia.search_movie(film.title)
+        if not movies:
+            misses.add('imdb', film)
+            raise LookupError(f"No result found for {film}.")
+        else:
+            obj = ia.get_movie(movies[0].movieID)
 
     return obj
 
 
-def wiki_metadata_retrieve(query: Film | Album | Book) -> dict:
+def wiki_metadata_retrieve(
+    query: Film | Album | Book,
+    backend: WikiBackend | None = None
+) -> dict:
     """
     Extract metadata for the supplied work.
 
@@ -242,18 +379,167 @@ def wiki_metadata_retrieve(query: Film | Album | Book) -> dict:
     ----------
     query : Film | Album | Book
         The work to be inexed.
+    backend : WikiBackend, default=None
+        The Wikipedia backend to query (see
+        :func:`~datopy._media_scrape.get_wiki_infoboxes`).
 
     Returns
     -------
     dict
         A dictionary containing metadata retrieved from the Wikipedia infobox.
     """
+    misses = negative_cache()
+    api_url = getattr(backend, 'api_url', None)
+    if misses.contains('wiki', query, api_url):
+        raise LookupError(f"No result found for {query}.")
+
     try:
-        obj = wptools.page(query.title).get_parse().data['infobox']
+        # Concurrent retrievals of the same work share one request
+        pages = single_flight().do(('wiki', query_key(query), backend),
+                                   get_wiki_infoboxes, [query.title], backend)
+        page = pages[query.title]
     except Exception:
         raise LookupError(f"No result found for {query}.") from None
+    if page.infobox is None:
+        misses.add('wiki', query, api_url)
+        raise LookupError(f"No result found for {query}.")
 
-    return obj
+    return page.infobox
+
+
+# Retrieval routine of each source, and the sources applicable to each query
+RETRIEVERS = {
+    'imdb': imdb_film_retrieve,         # Movie
+    'spotify': spotify_album_retrieve,  # Album
+    'wiki': wiki_metadata_retrieve,     # Books etc.
+}
+SOURCES = {Film: ['imdb', 'wiki'], Album: ['spotify', 'wiki'], Book: ['wiki']}
+
+
+def retrieve_all_sources(
+    query: Film | Album | Book,
+    timeout: float | None = None
+) -> tuple[dict, dict[str, str]]:
+    """
+    Query every source applicable to a work concurrently.
+
+    Parameters
+    ----------
+    query : Film | Album | Book
+        The work to be indexed.
+    timeout : float, default=None
+        Seconds to wait for the sources, also imposed as a deadline on
+        their requests. Sources still running are left behind and reported
+        as failed. None waits for all of them.
+
+    Returns
+    -------
+    tuple[dict, dict[str, str]]
+        The retrieved objects keyed by source, and the reason each failed
+        source was left out.
+
+    Raises
+    ------
+    LookupError
+        If no source returned a result.
+    """
+    sources = SOURCES[type(query)]
+    expires = expiry(timeout)
+    executor = ThreadPoolExecutor(len(sources))
+    futures = {
+        source: executor.submit(carry_deadline(RETRIEVERS[source], expires),
+                                query)
+        for source in sources
+    }
+    done, _ = wait(futures.values(), timeout=timeout)
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    objs, failed = {}, {}
+    for source, future in futures.items():
+        if future not in done:
+            failed[source] = f"No result within {timeout} s."
+        elif future.exception() is not None:
+            failed[source] = str(future.exception())
+        else:
+            objs[source] = dict(future.result())
+
+    if not objs:
+        raise LookupError(f"No result found for {query}: {failed}")
+    return objs, failed
+
+
+def retrieve_media(
+    queries: Iterable[Film | Album | Book],
+    source: Literal['imdb', 'spotify', 'wiki'],
+    max_workers: int = 16,
+    limiter: AdaptiveLimiter | None = None,
+    deadline: float | None = None
+) -> dict[MediaQuery, dict | None]:
+    """
+    Retrieve many works from one source concurrently.
+
+    Parameters
+    ----------
+    queries : Iterable[Film | Album | Book]
+        The works to retrieve. Repeated queries are retrieved once.
+    source : Literal['imdb', 'spotify', 'wiki']
+        The source to retrieve them from.
+    max_workers : int, default=16
+        Maximum number of concurrent retrievals.
+    limiter : AdaptiveLimiter, default=None
+        Optional limit on the retrievals in flight (capped by
+        ``max_workers``), raised while the source responds promptly and
+        lowered when retrievals slow down or fail. A work that is not found
+        counts as a prompt response.
+    deadline : float, default=None
+        Seconds within which every retrieval must complete, capped by any
+        enclosing :func:`~datopy._http.deadline`.
+
+    Returns
+    -------
+    dict[MediaQuery, dict | None]
+        Each distinct query mapped to its retrieved object, or to None if it
+        was not found or its retrieval failed.
+
+    Raises
+    ------
+    DeadlineExceeded
+        If the deadline expired. Its ``timed_out`` lists the queries not
+        retrieved in time, and ``completed`` maps the others.
+    """
+    retrieve = RETRIEVERS[source]
+    expires = expiry(deadline)
+
+    def retrieve_one(query):
+        check_deadline()
+        with limiter.slot() if limiter else contextlib.nullcontext():
+            try:
+                return retrieve(query)
+            except LookupError:
+                return None
+
+    # Worker threads do not inherit the caller's deadline
+    retrieve_one = carry_deadline(retrieve_one, expires)
+
+    objs: dict[MediaQuery, dict | None] = {}
+    timed_out = []
+    queries = list(dict.fromkeys(queries))
+    with ThreadPoolExecutor(max_workers) as executor:
+        futures = [executor.submit(retrieve_one, query) for query in queries]
+        for query, future in zip(queries, futures):
+            try:
+                objs[query] = future.result()
+            except DeadlineExceeded:
+                timed_out.append(query)
+            except Exception as err:
+                print(f"Failed to retrieve {query} from {source}: {err}")
+                objs[query] = None
+
+    if timed_out:
+        raise DeadlineExceeded(
+            f"{len(timed_out)} retrievals from {source} exceeded the "
+            "deadline.", timed_out=timed_out, completed=objs)
+    return objs
 
 
 def extract_datamodel(obj, verbose: bool = False) -> DataModel:
@@ -292,6 +578,204 @@ def extract_datamodel(obj, verbose: bool = False) -> DataModel:
     return DataModel(obj, schema, json_schema, obj_serialized, obj_normalized)
 
 
+BulkDataModel = namedtuple(
+    'BulkDataModel', ['schema', 'json_schema', 'normalized']
+)
+"""
+Custom bulk data model return type.
+"""
+
+
+def _merge_schemas(schema1, schema2):
+    """
+    Merge two (key, type) schemas, joining conflicting type names.
+    """
+    if isinstance(schema1, dict) and isinstance(schema2, dict):
+        merged = dict(schema1)
+        for key, value in schema2.items():
+            merged[key] = (_merge_schemas(merged[key], value)
+                           if key in merged else value)
+        return merged
+
+    # Nested structure takes precedence over a scalar placeholder
+    if isinstance(schema1, dict) or isinstance(schema2, dict):
+        return schema1 if isinstance(schema1, dict) else schema2
+    if schema1 == schema2:
+        return schema1
+    types = set(schema1.split(' | ')) | set(schema2.split(' | '))
+    return ' | '.join(sorted(types))
+
+
+# JSON types of scalar values, by Python type (bool before its subclass int)
+_JSON_TYPES = {str: 'string', bool: 'boolean', int: 'number',
+               float: 'number', type(None): 'null'}
+
+
+def _infer_json_schema(obj) -> dict:
+    """
+    Infer a JSON schema accepting a payload; values of other than JSON
+    types are left unconstrained.
+    """
+    if hasattr(obj, 'items') and obj and all(
+            isinstance(key, int) for key in obj):
+        # Numbered items (as from `list_to_dict`) share one schema
+        schema = {'type': 'object'}
+        for value in obj.values():
+            schema = _merge_json_schemas(schema, {
+                'type': 'object',
+                'additionalProperties': _infer_json_schema(value)})
+        return schema
+    if hasattr(obj, 'items'):
+        return {'type': 'object',
+                'properties': {key: _infer_json_schema(value)
+                               for key, value in obj.items()},
+                'required': list(obj.keys())}
+    if isinstance(obj, (list, tuple, set)):
+        schema = {'type': 'array'}
+        for value in obj:
+            schema = _merge_json_schemas(schema, {
+                'type': 'array', 'items': _infer_json_schema(value)})
+        return schema
+    for kind, name in _JSON_TYPES.items():
+        if isinstance(obj, kind):
+            return {'type': name}
+    return {}
+
+
+def _merge_json_schemas(schema1: dict | None, schema2: dict) -> dict:
+    """
+    Merge two JSON schemas into one accepting what either accepts: types
+    are joined into a list, and only keys required by both are required.
+    """
+    if schema1 is None or schema1 == schema2:
+        return schema2
+    if not schema1 or not schema2:
+        return {}  # Either accepts anything
+
+    def types(schema):
+        kind = schema['type']
+        return set(kind) if isinstance(kind, list) else {kind}
+    kinds = sorted(types(schema1) | types(schema2))
+    merged: dict = {'type': kinds[0] if len(kinds) == 1 else kinds}
+
+    objects = [schema for schema in (schema1, schema2)
+               if 'object' in types(schema)]
+    if any('properties' in schema for schema in objects):
+        properties: dict = {}
+        for schema in objects:
+            for key, value in schema.get('properties', {}).items():
+                properties[key] = _merge_json_schemas(
+                    properties.get(key), value)
+        required = set(objects[-1].get('required', []))
+        merged['properties'] = properties
+        merged['required'] = [key for key in objects[0].get('required', [])
+                              if key in required]
+
+    for keyword in ('items', 'additionalProperties'):
+        values = [schema[keyword] for schema in (schema1, schema2)
+                  if keyword in schema]
+        if values:
+            merged[keyword] = _merge_json_schemas(values[0], values[-1])
+    return merged
+
+
+def _extract_chunk(objs: list) -> tuple[dict, dict | None, pd.DataFrame]:
+    """
+    Extract merged schemas and normalized rows from a chunk of payloads.
+
+    Runs in a worker process, so only the compact schemas and data frame are
+    sent back to the parent (the payloads and serialized strings are not).
+    """
+    schema: dict = {}
+    json_schema = None
+    parsed = []
+    for obj in objs:
+        schema = _merge_schemas(
+            schema, apply_recursive(lambda x: type(x).__name__, obj))
+        json_schema = _merge_json_schemas(
+            json_schema, _infer_json_schema(obj))
+        parsed.append(json.loads(json.dumps(apply_recursive(str, obj))))
+
+    return schema, json_schema, pd.json_normalize(parsed)
+
+
+def extract_datamodels(
+    objs: list,
+    max_workers: int | None = None,
+    chunksize: int = 256
+) -> BulkDataModel:
+    """
+    Construct a single data model from many scraped data structures.
+
+    Payloads are distributed across a process pool in chunks. Each worker
+    performs the schema inference, serialization, and normalization steps of
+    :func:`extract_datamodel` and the parent merges the results.
+
+    Parameters
+    ----------
+    objs : list
+        Scraped data structures (e.g. cached API payloads). These must be
+        picklable when ``max_workers`` is not 1.
+    max_workers : int, default=None
+        Number of worker processes. Defaults to the number of CPUs.
+        With ``max_workers=1`` all work happens in the current process.
+    chunksize : int, default=256
+        Number of payloads sent to a worker at a time.
+
+    Returns
+    -------
+    BulkDataModel
+        The merged ``schema`` and ``json_schema`` of all payloads and a
+        ``normalized`` data frame with one row per payload.
+
+    Notes
+    -----
+    When payloads disagree on the type of a field, the merged schema joins
+    the type names (e.g. ``'NoneType | str'``) and the JSON schema lists the
+    JSON types (e.g. ``['null', 'string']``). The JSON schema only requires
+    the keys present in every payload, so that it accepts each of them.
+
+    Examples
+    --------
+    >>> from datopy._examples import extract_datamodels
+
+    >>> objs = [{'title': 'kid a', 'tracks': [{'ms': 251}, {'ms': 284}]},
+    ...         {'title': 'amnesiac', 'tracks': [{'ms': 240}], 'year': None}]
+    >>> datamodel = extract_datamodels(objs, max_workers=1)
+    >>> datamodel.schema
+    {'title': 'str', 'tracks': {1: {'ms': 'int'}, 2: {'ms': 'int'}}, \
+'year': 'NoneType'}
+    >>> datamodel.json_schema['required']
+    ['title', 'tracks']
+    >>> datamodel.json_schema['properties']['tracks']
+    {'type': 'array', 'items': {'type': 'object', \
+'properties': {'ms': {'type': 'number'}}, 'required': ['ms']}}
+    >>> datamodel.normalized
+          title tracks.1.ms tracks.2.ms  year
+    0     kid a         251         284   NaN
+    1  amnesiac         240         NaN  None
+    """
+    chunks = [objs[i:i + chunksize] for i in range(0, len(objs), chunksize)]
+
+    if max_workers == 1 or len(chunks) <= 1:
+        results = [_extract_chunk(chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_extract_chunk, chunks))
+
+    schema: dict = {}
+    json_schema = None
+    for chunk_schema, chunk_json_schema, _ in results:
+        schema = _merge_schemas(schema, chunk_schema)
+        if chunk_json_schema is not None:
+            json_schema = _merge_json_schemas(json_schema, chunk_json_schema)
+    frames = [frame for _, _, frame in results] or [pd.DataFrame()]
+    normalized = pd.concat(frames, ignore_index=True)
+
+    return BulkDataModel(schema, json_schema or schema_jsonify(schema),
+                         normalized)
+
+
 def save_datamodel(
     schema: dict, json_schema: dict,
     obj_serialized: dict, obj_normalized: pd.DataFrame,
@@ -325,24 +809,32 @@ def save_datamodel(
 
 
 def run_auto_datamodel_example(
-    source: Literal['imdb', 'spotify', 'wiki'],
+    source: Literal['imdb', 'spotify', 'wiki', 'all'],
     search_terms: Film | Album | Book,
     verbose: bool = False,
-    do_save: bool = False
+    do_save: bool = False,
+    timeout: float | None = None
 ) -> DataModel:
     r"""
     Generate an exemplar data model from an API-extracted data structure.
 
     Parameters
     ----------
-    source : Literal['imdb', 'spotify', 'wiki'])
+    source : Literal['imdb', 'spotify', 'wiki', 'all'])
         The source from which to retrieve data about the requested topic.
+        With ``'all'``, every source applicable to the query is queried
+        concurrently (see :func:`retrieve_all_sources`) and the results are
+        merged under source keys (e.g. ``'imdb'``, ``'wiki'``), so that the
+        normalized columns read ``imdb.title``, ``wiki.budget``, etc.
+        Sources that fail or time out are reported and left out.
     search_terms : Film | Album | Book
         A namedtuple of required properties (e.g., title) for the topic query.
     verbose : bool, default=False
         Option to enable printouts of the retrieved data and schema.
     do_save : bool, default=False
         Option to enable saving of the retrieved data and schema.
+    timeout : float, default=None
+        Seconds to wait for the sources when ``source='all'``.
 
     Returns
     -------
@@ -446,62 +938,16 @@ def run_auto_datamodel_example(
     # Check assumptions
     # TODO: remove line below (redundant)
     # source = str(source).lower()
-    message = "Source must be either 'imdb', 'spotify', or 'wiki'."
-    assert source in ['imdb', 'spotify', 'wiki'], message
+    message = "Source must be either 'imdb', 'spotify', 'wiki', or 'all'."
+    assert source in ['imdb', 'spotify', 'wiki', 'all'], message
 
     # TODO: refactor retrieval w/ retrieve method of resp Processor subclasses
-    # Movie
-    if source == 'imdb':
-        ia = Cinemagoer()
-        movies = ia.search_movie(search_terms.title)
-        if not movies:
-            raise LookupError(f"No result found for {search_terms}.")
-        else:
-            obj = ia.get_movie(movies[0].movieID)
-
-    # Album
-    elif source == 'spotify':
-        sp = spotipy.Spotify(
-            client_credentials_manager=SpotifyClientCredentials()
-        )
-        results = sp.search(
-            q=f'artist:{search_terms.artist} album:{search_terms.title}',
-            type='album'
-        )
-        if results['albums']['total'] == 0:
-            raise LookupError(f"No result found for {search_terms}.")
-
-        album_results = results['albums']['items'][0]
-        album_id = album_results['id']
-        album_details = sp.album(album_id)
-        tracks = sp.album_tracks(album_id)['items']
-
-        # Retrieve additional track details
-        track_audio_features_tmp = []
-        track_streams_tmp = []
-        for track_num, track_info in enumerate(tracks, start=1):
-            track_id = track_info['id']
-            # sp.audio_analysis(track_id)
-            track_audio_features_tmp.append(sp.audio_features(track_id)[0])
-        track_streams_tmp.append(sp.track(track_id)['popularity'])
-
-        track_audio_features = list_to_dict(track_audio_features_tmp)
-        track_streams = list_to_dict(track_streams_tmp)
-
-        # Merge album details with additional track details
-        obj = copy.deepcopy(album_details)
-        obj['track_audio_features'] = track_audio_features
-        obj['track_streams'] = track_streams
-
-    # Books etc.
-    elif source == 'wiki':
-        try:
-            obj = wptools.page(search_terms.title).get_parse().data['infobox']
-        except Exception:
-            raise LookupError(f"No result found for {search_terms}.") from None
-
+    if source == 'all':
+        obj, failed = retrieve_all_sources(search_terms, timeout)
+        for failed_source, reason in failed.items():
+            print(f"Omitted {failed_source} for {search_terms}: {reason}")
     else:
-        return None
+        obj = RETRIEVERS[source](search_terms)
 
     # Extract & save
     datamodel = extract_datamodel(obj, verbose)
@@ -582,7 +1028,8 @@ if __name__ == "__main__":
     # doctest.testmod(verbose=True)
     # doctest_function(find_project_root, globs=globals(),verbose=False)
 
-    skip = ["Album", "Book", "Film", "DataModel", "MediaQuery"]
+    skip = ["Album", "Book", "Film", "DataModel", "BulkDataModel",
+            "MediaQuery"]
     numpydoc_validate_module(sys.modules['__main__'], excluded_objects=skip)
 
     pass
@@ -7,9 +7,9 @@ Reference: https://github.com/mCodingLLC/SlapThatLikeButton-TestingStarterProjec
 import re
 import enum
 import pandas as pd
-from imdb import Cinemagoer
 
 from datopy.inspection import make_df
+from datopy._clients import cinemagoer_pool
 
 
 # --- Interfaces ---
@@ -63,13 +63,13 @@ def omit_string_patterns(input_string: str, patterns: list[str]) -> str:
 def imdb_film_retrieve(movie_title: str) -> object:
     """IMDb film metadata retrieval routine.
     """
-    ia = Cinemagoer()
-    movies = ia.search_movie(movie_title)
+    with cinemagoer_pool().client() as ia:
+        movies = ia.search_movie(movie_title)
 
-    if not movies:
-        raise LookupError(f"No result found for {movie_title}.")
-    else:
-        obj = ia.get_movie(movies[0].movieID)
+        if not movies:
+            raise LookupError(f"No result found for {movie_title}.")
+        else:
+            obj = ia.get_movie(movies[0].movieID)
 
     return obj
 
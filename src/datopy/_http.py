@@ -0,0 +1,1857 @@
+"""
+Resilient HTTP requests for the scraping routines.
+
+.. warning:: The contents of this module will be moved in a future release.
+
+Requests to each host pass through a token bucket, which spaces them out to
+the host's rate limit, and a circuit breaker, which fails fast while the host
+is down. Failed idempotent requests (connection errors, timeouts, 429 and 5xx
+responses) are retried with exponentially growing, jittered delays, or after
+the delay requested by the server's ``Retry-After`` header. A ``Retry-After``
+pauses every request to the host, not only the one that received it.
+Optionally, an :class:`AdaptiveLimiter` adjusts the number of requests in
+flight to what the hosts sustain, and a :class:`Hedger` duplicates requests
+slower than most, within a small budget. An :class:`HTTPCache` keeps GET
+responses on disk and revalidates them with their host, so that unchanged
+bodies are not downloaded again. Within a :func:`deadline`, every request is
+cut short when the operation's time budget runs out.
+
+.. rubric:: Sessions
+
+.. autosummary::
+    :toctree: generated/
+
+    ResilientSession
+    resilient_session
+
+.. rubric:: Deadlines
+
+.. autosummary::
+    :toctree: generated/
+
+    deadline
+    remaining
+    check_deadline
+    carry_deadline
+    expiry
+    DeadlineExceeded
+
+.. rubric:: Concurrency
+
+.. autosummary::
+    :toctree: generated/
+
+    AdaptiveLimiter
+
+.. rubric:: Hedging
+
+.. autosummary::
+    :toctree: generated/
+
+    Hedger
+    default_hedger
+
+.. rubric:: Caching
+
+.. autosummary::
+    :toctree: generated/
+
+    HTTPCache
+    CachingAdapter
+    http_cache
+
+.. rubric:: Host policies
+
+.. autosummary::
+    :toctree: generated/
+
+    HostRegistry
+    host_registry
+    TokenBucket
+    CircuitBreaker
+    CircuitOpenError
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import sqlite3
+import random
+import threading
+import functools
+import contextlib
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait,
+)
+from email.utils import parsedate_to_datetime
+from contextvars import ContextVar
+from typing import (
+    Any, Callable, Iterable, Iterator, Mapping, NamedTuple, TypeVar,
+)
+from urllib.parse import urlsplit
+
+import urllib3
+import requests
+from requests.adapters import HTTPAdapter
+
+from datopy.util._numpydoc_validate import numpydoc_validate_module
+
+
+T = TypeVar('T')
+
+# -- Deadlines ---------------------------------------------------------------
+
+
+# Monotonic time by which the current operation must complete, if any
+_DEADLINE: ContextVar[float | None] = ContextVar('deadline', default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when an operation runs out of its time budget.
+
+    Parameters
+    ----------
+    message : str, default="Deadline exceeded."
+        Description of the operation cut short.
+    timed_out : Iterable, default=()
+        For a batch operation, the items it did not complete in time.
+    completed : Any, default=None
+        For a batch operation, the results of the items it completed.
+    """
+
+    def __init__(
+        self,
+        message: str = "Deadline exceeded.",
+        timed_out: Iterable[Any] = (),
+        completed: Any = None
+    ):
+        super().__init__(message)
+        self.timed_out = list(timed_out)
+        self.completed = completed
+
+
+def expiry(seconds: float | None) -> float | None:
+    """
+    Return the monotonic time at which a budget of ``seconds`` expires,
+    capped by the current deadline.
+
+    Parameters
+    ----------
+    seconds : float
+        The budget. None imposes none beyond the current deadline.
+
+    Returns
+    -------
+    float | None
+        The earlier of the two expiry times, or None if neither is set.
+    """
+    current = _DEADLINE.get()
+    if seconds is None:
+        return current
+    expires = time.monotonic() + seconds
+    return expires if current is None else min(current, expires)
+
+
+@contextlib.contextmanager
+def deadline(seconds: float | None) -> Iterator[float | None]:
+    """
+    Give the operations in a ``with`` block a time budget.
+
+    The deadline applies to every request sent through a
+    :class:`ResilientSession` in the block, including by nested calls and by
+    worker threads started with :func:`carry_deadline`. Each request's
+    connect and read timeouts are capped by the time remaining, and
+    :class:`DeadlineExceeded` is raised once it runs out. Nested deadlines
+    can shorten, but not extend, the budget.
+
+    Parameters
+    ----------
+    seconds : float
+        The budget. None imposes none beyond an enclosing deadline.
+
+    Yields
+    ------
+    float | None
+        The monotonic time at which the budget expires.
+
+    Examples
+    --------
+    >>> import time
+    >>> from datopy._http import check_deadline, deadline, remaining
+
+    >>> with deadline(5):
+    ...     with deadline(60):
+    ...         print(round(remaining()))
+    5
+    >>> with deadline(0.05):
+    ...     time.sleep(0.1)
+    ...     check_deadline()
+    Traceback (most recent call last):
+    ...
+    datopy._http.DeadlineExceeded: Deadline exceeded.
+    >>> print(remaining())
+    None
+    """
+    expires = expiry(seconds)
+    token = _DEADLINE.set(expires)
+    try:
+        yield expires
+    finally:
+        _DEADLINE.reset(token)
+
+
+def remaining() -> float | None:
+    """
+    Return the seconds left before the current deadline.
+
+    Returns
+    -------
+    float | None
+        The time remaining (negative once expired), or None if no deadline
+        is set.
+    """
+    expires = _DEADLINE.get()
+    return None if expires is None else expires - time.monotonic()
+
+
+def _expired() -> bool:
+    budget = remaining()
+    return budget is not None and budget <= 0
+
+
+def check_deadline() -> None:
+    """
+    Raise if the current deadline has passed.
+
+    Raises
+    ------
+    DeadlineExceeded
+        If the deadline has passed.
+    """
+    if _expired():
+        raise DeadlineExceeded()
+
+
+def carry_deadline(
+    fn: Callable[..., T],
+    expires: float | None = None
+) -> Callable[..., T]:
+    """
+    Bind the current deadline to a function to be run in another thread.
+
+    Context variables are not inherited by pooled worker threads, so
+    functions submitted to an executor should be wrapped.
+
+    Parameters
+    ----------
+    fn : Callable
+        The function.
+    expires : float, default=None
+        A monotonic expiry time to bind instead of the current deadline.
+
+    Returns
+    -------
+    Callable
+        ``fn``, run under the bound deadline.
+    """
+    bound = _DEADLINE.get() if expires is None else expires
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        token = _DEADLINE.set(bound)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _DEADLINE.reset(token)
+
+    return wrapper
+
+
+def _cap_timeout(
+    timeout: float | tuple[float, float],
+    url: str
+) -> float | tuple[float, float]:
+    """
+    Cap a request's connect and read timeouts by the current deadline.
+    """
+    budget = remaining()
+    if budget is None:
+        return timeout
+    if budget <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before requesting {url}.")
+    if isinstance(timeout, tuple):
+        return (min(timeout[0], budget), min(timeout[1], budget))
+    return min(timeout, budget)
+
+
+# -- Host policies -----------------------------------------------------------
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """
+    Raised instead of sending a request to a host that is failing.
+    """
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket admitting ``rate`` requests per second on
+    average, and bursts of up to ``burst`` requests.
+
+    Parameters
+    ----------
+    rate : float, default=None
+        Tokens added per second. None admits requests without limit, except
+        while the bucket is paused.
+    burst : int, default=1
+        Capacity of the bucket.
+
+    Examples
+    --------
+    >>> import time
+    >>> from datopy._http import TokenBucket
+
+    >>> bucket = TokenBucket(rate=20, burst=2)
+    >>> start = time.monotonic()
+    >>> waits = [bucket.acquire() for _ in range(6)]
+    >>> round(time.monotonic() - start, 1)
+    0.2
+    >>> waits[:2]
+    [0.0, 0.0]
+    """
+
+    def __init__(self, rate: float | None = None, burst: int = 1):
+        if rate is not None and rate <= 0:
+            raise ValueError("Rate must be positive.")
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float | None = None) -> float:
+        """
+        Take a token, waiting until one is available.
+
+        Parameters
+        ----------
+        timeout : float, default=None
+            Longest wait, in seconds. None waits indefinitely.
+
+        Returns
+        -------
+        float
+            Seconds waited.
+
+        Raises
+        ------
+        TimeoutError
+            If no token becomes available within ``timeout`` seconds.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    delay = self._paused_until - now
+                elif self.rate is None:
+                    return waited
+                else:
+                    self._tokens = min(
+                        self.burst,
+                        self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    delay = (1 - self._tokens) / self.rate
+            if timeout is not None and waited + delay > timeout:
+                raise TimeoutError(
+                    f"No token was available within {timeout:.3g} s.")
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        """
+        Admit no requests for ``seconds``, then resume from an empty bucket.
+
+        Parameters
+        ----------
+        seconds : float
+            Duration of the pause.
+        """
+        with self._lock:
+            resume = time.monotonic() + seconds
+            self._paused_until = max(self._paused_until, resume)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker for one host.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests are refused with :class:`CircuitOpenError`. After
+    ``reset_timeout`` seconds a single trial request is let through: the
+    circuit closes if it succeeds and opens again if it fails.
+
+    Parameters
+    ----------
+    failure_threshold : int, default=10
+        Consecutive failures that open the circuit.
+    reset_timeout : float, default=30
+        Seconds for which an open circuit refuses requests.
+
+    Examples
+    --------
+    >>> from datopy._http import CircuitBreaker
+
+    >>> breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    >>> for _ in range(2):
+    ...     breaker.before_request()
+    ...     breaker.record(success=False)
+    >>> breaker.state
+    'open'
+    >>> breaker.before_request()
+    Traceback (most recent call last):
+    ...
+    datopy._http.CircuitOpenError: Circuit open after 2 consecutive failures.
+    """
+
+    def __init__(self, failure_threshold: int = 10, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """
+        ``'closed'``, ``'open'``, or ``'half-open'`` (awaiting a trial).
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return 'closed'
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return 'open'
+            return 'half-open'
+
+    def before_request(self) -> None:
+        """
+        Admit a request, or refuse it while the circuit is open.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit is open, or half-open with a trial in flight.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return
+            elapsed = time.monotonic() - self._opened_at
+            if elapsed < self.reset_timeout or self._trial:
+                raise CircuitOpenError(
+                    f"Circuit open after {self._failures} consecutive "
+                    "failures.")
+            self._trial = True
+
+    def abandon(self) -> None:
+        """
+        Forget an admitted request that was given up on by the caller, such
+        as one cut short by a deadline, without counting its outcome.
+        """
+        with self._lock:
+            self._trial = False
+
+    def record(self, success: bool) -> None:
+        """
+        Record the outcome of an admitted request.
+
+        Parameters
+        ----------
+        success : bool
+            Whether the host responded normally.
+        """
+        with self._lock:
+            self._trial = False
+            if success:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            # A failed trial reopens the circuit
+            tripped = self._failures >= self.failure_threshold
+            if tripped or self._opened_at is not None:
+                self._opened_at = time.monotonic()
+
+
+class HTTPStats(NamedTuple):
+    """
+    Usage counters of a :class:`HostRegistry`.
+    """
+    requests: int
+    retries: int
+    rejected: int
+    throttled_seconds: float
+
+
+class HostRegistry:
+    """
+    Per-host token buckets and circuit breakers, and the retry policy, shared
+    by the sessions that use the registry.
+
+    Parameters
+    ----------
+    rate : float, default=None
+        Default requests per second admitted to each host. None is
+        unlimited.
+    burst : int, default=1
+        Default burst size of each host's token bucket.
+    max_retries : int, default=4
+        Retries of a failed idempotent request.
+    backoff : float, default=0.5
+        Base of the exponential backoff, in seconds. The delay before retry
+        ``n`` is drawn uniformly from ``[0, backoff * 2**n]``.
+    max_backoff : float, default=30
+        Longest delay between retries, including delays requested by
+        ``Retry-After``.
+    failure_threshold : int, default=10
+        Consecutive failures that open a host's circuit. Keep it above
+        ``max_retries`` so that a single failing request cannot open it.
+    reset_timeout : float, default=30
+        Seconds for which an open circuit refuses requests.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: int = 1,
+        max_retries: int = 4,
+        backoff: float = 0.5,
+        max_backoff: float = 30,
+        failure_threshold: int = 10,
+        reset_timeout: float = 30
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._hosts: dict[str, tuple[TokenBucket, CircuitBreaker]] = {}
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._rejected = 0
+        self._throttled = 0.0
+
+    @property
+    def stats(self) -> HTTPStats:
+        """
+        Requests sent, retries, requests refused by an open circuit, and
+        time spent waiting for the hosts' token buckets.
+        """
+        with self._lock:
+            return HTTPStats(self._requests, self._retries, self._rejected,
+                             self._throttled)
+
+    def limit(
+        self,
+        host: str,
+        rate: float | None,
+        burst: int = 1
+    ) -> None:
+        """
+        Set the rate limit of one host.
+
+        Parameters
+        ----------
+        host : str
+            The host, with its port if not the scheme's default (e.g.
+            ``'www.imdb.com'``).
+        rate : float
+            Requests per second. None is unlimited.
+        burst : int, default=1
+            Burst size.
+        """
+        with self._lock:
+            breaker = (self._hosts[host][1] if host in self._hosts
+                       else self._breaker())
+            self._hosts[host] = (TokenBucket(rate, burst), breaker)
+
+    def host(self, host: str) -> tuple[TokenBucket, CircuitBreaker]:
+        """
+        Return the token bucket and circuit breaker of a host.
+
+        Parameters
+        ----------
+        host : str
+            The host, with its port if not the scheme's default.
+
+        Returns
+        -------
+        tuple[TokenBucket, CircuitBreaker]
+            The host's policies, created on first use.
+        """
+        with self._lock:
+            if host not in self._hosts:
+                self._hosts[host] = (TokenBucket(self.rate, self.burst),
+                                     self._breaker())
+            return self._hosts[host]
+
+    def _breaker(self) -> CircuitBreaker:
+        return CircuitBreaker(self.failure_threshold, self.reset_timeout)
+
+    def _count(self, **counts: float) -> None:
+        with self._lock:
+            self._requests += int(counts.get('requests', 0))
+            self._retries += int(counts.get('retries', 0))
+            self._rejected += int(counts.get('rejected', 0))
+            self._throttled += counts.get('throttled', 0.0)
+
+
+@functools.lru_cache(maxsize=1)
+def host_registry() -> HostRegistry:
+    """
+    Return the process-wide registry of host policies.
+
+    The default rate limit (requests per second per host), burst size,
+    number of retries, and backoff base (in seconds) are read from the
+    ``HTTP_RATE_LIMIT`` (default unlimited), ``HTTP_RATE_BURST`` (default 1),
+    ``HTTP_MAX_RETRIES`` (default 4), and ``HTTP_BACKOFF`` (default 0.5)
+    environment variables when the registry is first used.
+
+    Returns
+    -------
+    HostRegistry
+        The shared registry.
+    """
+    rate = os.getenv("HTTP_RATE_LIMIT")
+    return HostRegistry(
+        rate=float(rate) if rate else None,
+        burst=int(os.getenv("HTTP_RATE_BURST", 1)),
+        max_retries=int(os.getenv("HTTP_MAX_RETRIES", 4)),
+        backoff=float(os.getenv("HTTP_BACKOFF", 0.5)),
+    )
+
+
+# -- Concurrency -------------------------------------------------------------
+
+
+class LimiterStats(NamedTuple):
+    """
+    Usage counters of an :class:`AdaptiveLimiter`.
+    """
+    limit: int
+    in_flight: int
+    peak_limit: int
+    increases: int
+    decreases: int
+
+
+class Slot:
+    """
+    A request admitted by an :class:`AdaptiveLimiter`.
+
+    Set ``throttled`` (e.g. on a 429 response) or ``failed`` before the slot
+    is released to report an unhealthy outcome; an exception raised in the
+    ``with`` block is reported as a failure.
+    """
+
+    def __init__(self, start: float):
+        self.start = start
+        self.throttled = False
+        self.failed = False
+
+
+class AdaptiveLimiter:
+    """
+    Thread-safe concurrency limit adjusted by additive increase,
+    multiplicative decrease (AIMD).
+
+    Each healthy completion raises the limit by ``1 / limit``, i.e. by one
+    per round of ``limit`` requests. A throttled or failed request, or a
+    latency spike, multiplies the limit by ``backoff``; at most once per
+    round, since the requests already in flight were admitted under the old
+    limit.
+
+    A spike is a latency over ``latency_tolerance`` times a baseline: the
+    5th percentile of the last 100 latencies, which tracks the host's
+    unloaded latency. Their minimum would be lowered by a single unusually
+    fast request, and their median rises with the queueing of an overloaded
+    host. So that a share of near-instant requests (e.g. answered from a
+    cache) cannot collapse it either, latencies under a tenth of the median
+    are left out of the percentile, and spikes are only looked for once
+    ``min_samples`` latencies are known.
+
+    Parameters
+    ----------
+    initial : int, default=4
+        The starting limit.
+    min_limit : int, default=1
+        The lowest limit.
+    max_limit : int, default=64
+        The highest limit.
+    backoff : float, default=0.5
+        Factor applied to the limit on a decrease.
+    latency_tolerance : float, default=2.0
+        Latency, relative to the baseline, taken as a spike.
+    min_samples : int, default=20
+        Latencies to observe before looking for spikes.
+
+    Examples
+    --------
+    >>> import time
+    >>> from datopy._http import AdaptiveLimiter
+
+    >>> limiter = AdaptiveLimiter(initial=2, max_limit=4)
+    >>> for _ in range(10):
+    ...     with limiter.slot():
+    ...         time.sleep(0.01)
+    >>> limiter.limit
+    4
+    >>> with limiter.slot() as slot:
+    ...     slot.throttled = True
+    >>> limiter.limit
+    2
+    >>> [limit for _, limit in limiter.history]
+    [2, 3, 4, 2]
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        backoff: float = 0.5,
+        latency_tolerance: float = 2.0,
+        min_samples: int = 20
+    ):
+        if not 1 <= min_limit <= initial <= max_limit:
+            raise ValueError("Limits must satisfy "
+                             "1 <= min_limit <= initial <= max_limit.")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.min_samples = min_samples
+        self._limit = float(initial)
+        self._in_flight = 0
+        self._latencies: deque[float] = deque(maxlen=100)
+        self._last_decrease = -float('inf')
+        self._created = time.monotonic()
+        self._history = [(0.0, initial)]
+        self._increases = 0
+        self._decreases = 0
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        """
+        The current number of requests admitted concurrently.
+        """
+        with self._condition:
+            return int(self._limit)
+
+    @property
+    def history(self) -> list[tuple[float, int]]:
+        """
+        ``(seconds, limit)`` at creation and at each change of the limit.
+        """
+        with self._condition:
+            return list(self._history)
+
+    @property
+    def stats(self) -> LimiterStats:
+        """
+        The limit, requests in flight, highest limit reached, and numbers of
+        increases and decreases of the limit.
+        """
+        with self._condition:
+            return LimiterStats(
+                int(self._limit), self._in_flight,
+                max(limit for _, limit in self._history),
+                self._increases, self._decreases)
+
+    def acquire(self, timeout: float | None = None) -> Slot:
+        """
+        Wait until fewer than ``limit`` requests are in flight.
+
+        Parameters
+        ----------
+        timeout : float, default=None
+            Longest wait, in seconds. None waits indefinitely.
+
+        Returns
+        -------
+        Slot
+            The admitted request, to be passed to :meth:`release`.
+
+        Raises
+        ------
+        TimeoutError
+            If no slot becomes available within ``timeout`` seconds.
+        """
+        with self._condition:
+            admitted = self._condition.wait_for(
+                lambda: self._in_flight < int(self._limit), timeout)
+            if not admitted:
+                raise TimeoutError(
+                    f"No slot was available within {timeout:.3g} s.")
+            self._in_flight += 1
+        return Slot(time.monotonic())
+
+    def release(self, slot: Slot) -> None:
+        """
+        Record the outcome of an admitted request and adjust the limit.
+
+        Parameters
+        ----------
+        slot : Slot
+            The request, as returned by :meth:`acquire`.
+        """
+        now = time.monotonic()
+        latency = now - slot.start
+        with self._condition:
+            self._in_flight -= 1
+            healthy = not (slot.throttled or slot.failed)
+            if healthy:
+                spike = len(self._latencies) >= self.min_samples and (
+                    latency > self.latency_tolerance * self._baseline())
+                self._latencies.append(latency)
+                healthy = not spike
+
+            previous = int(self._limit)
+            if healthy:
+                self._limit = min(self.max_limit,
+                                  self._limit + 1 / self._limit)
+                self._increases += int(self._limit) > previous
+            elif slot.start > self._last_decrease:
+                self._limit = max(self.min_limit, self._limit * self.backoff)
+                self._last_decrease = now
+                self._decreases += int(self._limit) < previous
+            if int(self._limit) != previous:
+                self._history.append((now - self._created, int(self._limit)))
+            self._condition.notify_all()
+
+    def _baseline(self) -> float:
+        """
+        The 5th percentile of recent latencies, other than those under a
+        tenth of their median.
+        """
+        latencies = sorted(self._latencies)
+        median = latencies[len(latencies) // 2]
+        typical = [latency for latency in latencies if latency >= median / 10]
+        return typical[round(0.05 * (len(typical) - 1))]
+
+    @contextlib.contextmanager
+    def slot(self, timeout: float | None = None) -> Iterator[Slot]:
+        """
+        Hold a slot for the duration of a ``with`` block.
+
+        Parameters
+        ----------
+        timeout : float, default=None
+            Longest wait for the slot, in seconds.
+
+        Yields
+        ------
+        Slot
+            The admitted request.
+        """
+        slot = self.acquire(timeout)
+        try:
+            yield slot
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            self.release(slot)
+
+
+# -- Hedging -----------------------------------------------------------------
+
+
+class HedgeStats(NamedTuple):
+    """
+    Usage counters of a :class:`Hedger`.
+    """
+    requests: int
+    hedged: int
+    won: int
+
+
+class Hedger:
+    """
+    Thread-safe hedging of slow requests.
+
+    A request to a host that has not answered within the ``percentile`` of
+    the host's recent latencies is duplicated, and whichever copy answers
+    first is used. Hedges are limited to ``budget`` times the number of
+    requests, so that the slowest requests are hedged without adding much
+    load. Until ``min_samples`` latencies of a host are known, its requests
+    are not hedged.
+
+    Requests and hedges run on at most ``max_workers`` worker threads. When
+    all are busy, requests run on the calling thread, unhedged, rather than
+    queueing for a worker: time spent queued would count towards the
+    hedging delay, and cap the requests in flight.
+
+    Parameters
+    ----------
+    percentile : float, default=95
+        Percentile of recent latency after which a request is hedged.
+    budget : float, default=0.05
+        Maximum hedges as a fraction of requests.
+    min_samples : int, default=20
+        Latencies to observe before hedging.
+    window : int, default=200
+        Number of recent latencies kept per host.
+    max_workers : int, default=64
+        Maximum number of hedged requests and hedges in flight.
+
+    Examples
+    --------
+    >>> import time
+    >>> from datopy._http import Hedger
+
+    >>> hedger = Hedger(percentile=90, budget=0.2, min_samples=5)
+    >>> delays = iter([0.01] * 5 + [1.0, 0.01])
+    >>> def fetch():
+    ...     time.sleep(next(delays))
+    ...     return 'ok'
+    >>> [hedger.call('host', fetch) for _ in range(5)]
+    ['ok', 'ok', 'ok', 'ok', 'ok']
+
+    The sixth request takes a second, so it is hedged after about 10 ms
+
+    >>> start = time.monotonic()
+    >>> hedger.call('host', fetch), time.monotonic() - start < 0.5
+    ('ok', True)
+    >>> hedger.stats
+    HedgeStats(requests=6, hedged=1, won=1)
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95,
+        budget: float = 0.05,
+        min_samples: int = 20,
+        window: int = 200,
+        max_workers: int = 64
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("The percentile must be between 0 and 100.")
+        self.percentile = percentile
+        self.budget = budget
+        self.min_samples = min_samples
+        self.window = window
+        self.max_workers = max_workers
+        self._latencies: dict[str, deque[float]] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers,
+                                            thread_name_prefix='hedge')
+        self._busy = 0
+        self._requests = 0
+        self._hedged = 0
+        self._won = 0
+
+    @property
+    def stats(self) -> HedgeStats:
+        """
+        Requests made, hedges sent, and hedges that answered first.
+        """
+        with self._lock:
+            return HedgeStats(self._requests, self._hedged, self._won)
+
+    def delay(self, host: str) -> float | None:
+        """
+        Return the seconds after which a request to a host is hedged.
+
+        Parameters
+        ----------
+        host : str
+            The host.
+
+        Returns
+        -------
+        float | None
+            The ``percentile`` of the host's recent latencies, or None if
+            too few are known.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(host, ()))
+        if len(latencies) < self.min_samples:
+            return None
+        rank = round(self.percentile / 100 * (len(latencies) - 1))
+        return latencies[rank]
+
+    def call(
+        self,
+        host: str,
+        fn: Callable[[], T],
+        hedge: Callable[[], T] | None = None
+    ) -> T:
+        """
+        Call ``fn``, hedging it with a second call if it is slow.
+
+        Parameters
+        ----------
+        host : str
+            The host requested, whose latencies set the hedging delay.
+        fn : Callable
+            Sends the request; called from a worker thread, so bind any
+            deadline with :func:`carry_deadline`.
+        hedge : Callable, default=None
+            Sends the duplicate request (e.g. once admitted by the host's
+            rate limit). Defaults to ``fn``.
+
+        Returns
+        -------
+        T
+            The result of the call answering first. A successful response
+            of the other is closed.
+
+        Raises
+        ------
+        Exception
+            Whatever the primary call raised, if both calls failed.
+        """
+        delay = self.delay(host)
+        with self._lock:
+            self._requests += 1
+        if delay is None or not self._reserve():
+            return self._timed(host, fn)
+
+        primary = self._submit(host, fn)
+        if wait([primary], timeout=delay).done or not self._reserve():
+            return primary.result()
+        if not self._spend():
+            self._unreserve()
+            return primary.result()
+        duplicate = self._submit(host, fn if hedge is None else hedge)
+
+        pending = {primary, duplicate}
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((future for future in done
+                           if future.exception() is None), None)
+            if winner is not None or not pending:
+                break
+        if winner is None:
+            return primary.result()
+        if winner is duplicate:
+            with self._lock:
+                self._won += 1
+        for future in (primary, duplicate):
+            if future is not winner:
+                future.add_done_callback(_close_response)
+        return winner.result()
+
+    def _spend(self) -> bool:
+        """
+        Take a hedge from the budget, if any is left.
+        """
+        with self._lock:
+            if self._hedged + 1 > self.budget * self._requests:
+                return False
+            self._hedged += 1
+            return True
+
+    def _reserve(self) -> bool:
+        """
+        Reserve a worker thread, if any is idle.
+        """
+        with self._lock:
+            if self._busy >= self.max_workers:
+                return False
+            self._busy += 1
+            return True
+
+    def _unreserve(self) -> None:
+        """
+        Return a reserved worker thread.
+        """
+        with self._lock:
+            self._busy -= 1
+
+    def _submit(self, host: str, fn: Callable[[], T]) -> Future[T]:
+        """
+        Run ``fn`` on a reserved worker thread, returning it when done.
+        """
+        def run() -> T:
+            try:
+                return self._timed(host, fn)
+            finally:
+                self._unreserve()
+        return self._executor.submit(run)
+
+    def _timed(self, host: str, fn: Callable[[], T]) -> T:
+        """
+        Call ``fn``, recording its latency if it succeeds.
+        """
+        start = time.monotonic()
+        result = fn()
+        with self._lock:
+            latencies = self._latencies.setdefault(
+                host, deque(maxlen=self.window))
+            latencies.append(time.monotonic() - start)
+        return result
+
+
+def _close_response(future: Future[Any]) -> None:
+    """
+    Close the response of a call that lost a hedge.
+    """
+    if not future.cancelled() and future.exception() is None:
+        result = future.result()
+        if isinstance(result, requests.Response):
+            result.close()
+
+
+@functools.lru_cache(maxsize=1)
+def default_hedger() -> Hedger | None:
+    """
+    Return the process-wide hedger of scraper requests, if enabled.
+
+    Hedging is enabled by setting the ``HTTP_HEDGE_PERCENTILE`` environment
+    variable (e.g. to 95). The budget, as a fraction of requests, is read
+    from ``HTTP_HEDGE_BUDGET`` (default 0.05).
+
+    Returns
+    -------
+    Hedger | None
+        The shared hedger, or None if hedging is disabled.
+    """
+    percentile = os.getenv("HTTP_HEDGE_PERCENTILE")
+    if not percentile:
+        return None
+    return Hedger(percentile=float(percentile),
+                  budget=float(os.getenv("HTTP_HEDGE_BUDGET", 0.05)))
+
+
+# -- Caching -----------------------------------------------------------------
+
+
+class HTTPCacheStats(NamedTuple):
+    """
+    Usage counters of an :class:`HTTPCache`.
+    """
+    lookups: int
+    fresh: int
+    revalidated: int
+    stored: int
+    bytes_saved: int
+
+
+class CachedResponse(NamedTuple):
+    """
+    A response body stored by an :class:`HTTPCache`, with its headers and
+    the time (since the epoch) until which it is fresh.
+    """
+    status: int
+    headers: dict[str, str]
+    body: bytes
+    expires: float
+
+    @property
+    def fresh(self) -> bool:
+        """
+        Whether the response may be served without asking the host.
+        """
+        return time.time() < self.expires
+
+    @property
+    def validators(self) -> dict[str, str]:
+        """
+        The conditional request headers revalidating the response.
+        """
+        return _validators(self.headers)
+
+
+# Headers describing the body as it was sent, not as it is stored
+_UNSTORED_HEADERS = frozenset({
+    'content-encoding', 'content-length', 'transfer-encoding', 'connection',
+    'keep-alive'})
+
+
+def _stored_headers(headers: Mapping[str, str]) -> dict[str, str]:
+    """
+    The headers of a response that still hold once its body is decoded.
+    """
+    return {name: value for name, value in headers.items()
+            if name.lower() not in _UNSTORED_HEADERS}
+
+
+def _validators(headers: Mapping[str, str]) -> dict[str, str]:
+    """
+    Conditional request headers built from a response's validators.
+    """
+    headers = requests.structures.CaseInsensitiveDict(headers)
+    return {name: headers[field] for name, field in [
+        ('If-None-Match', 'ETag'),
+        ('If-Modified-Since', 'Last-Modified')] if field in headers}
+
+
+def _freshness(headers: Mapping[str, str]) -> float | None:
+    """
+    Seconds for which a response is fresh according to its ``Cache-Control``
+    (or ``Expires``) header, or None if it may not be stored.
+    """
+    directives = {}
+    for directive in headers.get('Cache-Control', '').split(','):
+        name, _, value = directive.strip().partition('=')
+        directives[name.lower()] = value.strip('"')
+    if 'no-store' in directives:
+        return None
+    if 'no-cache' in directives:
+        return 0.0
+    try:
+        if 'max-age' in directives:
+            age = float(headers.get('Age', 0))
+            return max(float(directives['max-age']) - age, 0.0)
+        if 'Expires' in headers:
+            return max(parsedate_to_datetime(
+                headers['Expires']).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        pass
+    return 0.0
+
+
+class HTTPCache:
+    """
+    Persistent store of GET responses, revalidated with their host.
+
+    Responses carrying a validator (an ``ETag`` or ``Last-Modified``
+    header) or a ``Cache-Control`` max-age are kept, with their headers, in
+    a SQLite database shared by threads and processes. While fresh, they are
+    served without a request; once stale, they are revalidated with a
+    conditional request, and a ``304 Not Modified`` answer is served from
+    the cache. Attach the cache to a session with :class:`CachingAdapter`.
+
+    Parameters
+    ----------
+    path : str | os.PathLike
+        The database file (``':memory:'`` for a cache private to the
+        instance).
+    max_size : int, default=10485760
+        Bytes above which a body is not stored.
+
+    Examples
+    --------
+    >>> from datopy._http import HTTPCache
+
+    >>> cache = HTTPCache(':memory:')
+    >>> url = "https://example.com/module.py"
+    >>> cache.lookup(url) is None
+    True
+    >>> response = requests.Response()
+    >>> response.status_code, response._content = 200, b"print('hi')\\n"
+    >>> response.headers.update({'ETag': '"v1"', 'Cache-Control': "max-age=60"})
+    >>> cache.store(url, response)
+    True
+    >>> entry = cache.lookup(url)
+    >>> entry.fresh, entry.body, entry.validators
+    (True, b"print('hi')\\n", {'If-None-Match': '"v1"'})
+    >>> cache.stats
+    HTTPCacheStats(lookups=2, fresh=1, revalidated=0, stored=1, bytes_saved=12)
+
+    Responses that forbid storage are not stored
+
+    >>> response.headers['Cache-Control'] = "no-store"
+    >>> cache.store("https://example.com/private", response)
+    False
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_size: int = 10 * 2 ** 20
+    ):
+        self.path = os.fspath(path)
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.path, timeout=30, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, "
+                "status INTEGER, headers TEXT, body BLOB, expires REAL)")
+        self._lookups = 0
+        self._fresh = 0
+        self._revalidated = 0
+        self._stored = 0
+        self._bytes_saved = 0
+
+    @property
+    def stats(self) -> HTTPCacheStats:
+        """
+        Lookups, lookups answered by a fresh response, stale responses
+        confirmed by the host, responses stored, and bytes of response bodies
+        not downloaded thanks to the cache.
+        """
+        with self._lock:
+            return HTTPCacheStats(self._lookups, self._fresh,
+                                  self._revalidated, self._stored,
+                                  self._bytes_saved)
+
+    def lookup(self, url: str) -> CachedResponse | None:
+        """
+        Find the stored response to a GET request.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL, including its query.
+
+        Returns
+        -------
+        CachedResponse | None
+            The stored response, fresh or stale, or None.
+        """
+        with self._lock:
+            self._lookups += 1
+            row = self._conn.execute(
+                "SELECT status, headers, body, expires FROM responses "
+                "WHERE url = ?", (url,)).fetchone()
+            if row is None:
+                return None
+            entry = CachedResponse(row[0], json.loads(row[1]), row[2], row[3])
+            if entry.fresh:
+                self._fresh += 1
+                self._bytes_saved += len(entry.body)
+            return entry
+
+    def has_fresh(self, url: str) -> bool:
+        """
+        Whether a fresh response to a GET request is stored, without counting
+        a lookup.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL, including its query.
+
+        Returns
+        -------
+        bool
+            Whether the response would be served without a request.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires FROM responses WHERE url = ?",
+                (url,)).fetchone()
+        return row is not None and time.time() < row[0]
+
+    def store(
+        self,
+        url: str,
+        response: requests.Response,
+        stream: bool = False
+    ) -> bool:
+        """
+        Store a response, if it is cacheable.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL, including its query.
+        response : requests.Response
+            A 200 response, whose body is read.
+        stream : bool, default=False
+            Whether the body is to be streamed to the caller. It is then only
+            read (and stored) if its ``Content-Length`` is known and at most
+            ``max_size``, rather than held in memory whatever its size.
+
+        Returns
+        -------
+        bool
+            Whether the response was stored.
+        """
+        headers = response.headers
+        freshness = _freshness(headers)
+        length = headers.get('Content-Length', '')
+        cacheable = response.status_code == 200 and freshness is not None
+        if not cacheable or headers.get('Vary') == '*':
+            return False
+        if not (freshness or _validators(headers)):
+            return False  # Could be neither served nor revalidated
+        if length.isdigit() and int(length) > self.max_size:
+            return False
+        if stream and not length.isdigit():
+            return False
+        body = response.content
+        if len(body) > self.max_size:
+            return False
+        self._put(url, response.status_code, headers, body,
+                  time.time() + (freshness or 0.0))
+        with self._lock:
+            self._stored += 1
+        return True
+
+    def revalidated(
+        self,
+        url: str,
+        entry: CachedResponse,
+        response: requests.Response
+    ) -> CachedResponse:
+        """
+        Refresh a stale response that the host confirmed to be unchanged.
+
+        Parameters
+        ----------
+        url : str
+            The requested URL, including its query.
+        entry : CachedResponse
+            The stale response.
+        response : requests.Response
+            The host's ``304 Not Modified`` answer, whose headers update the
+            stored ones.
+
+        Returns
+        -------
+        CachedResponse
+            The refreshed response.
+        """
+        headers = requests.structures.CaseInsensitiveDict(entry.headers)
+        headers.update(response.headers)
+        freshness = _freshness(headers) or 0.0
+        entry = self._put(url, entry.status, headers, entry.body,
+                          time.time() + freshness)
+        with self._lock:
+            self._revalidated += 1
+            self._bytes_saved += len(entry.body)
+        return entry
+
+    def clear(self) -> None:
+        """
+        Forget every stored response.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def _put(
+        self,
+        url: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+        expires: float
+    ) -> CachedResponse:
+        entry = CachedResponse(status, _stored_headers(headers), body, expires)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+                (url, status, json.dumps(entry.headers), body, expires))
+        return entry
+
+
+class CachingAdapter(HTTPAdapter):
+    """
+    A transport adapter answering GET requests from an :class:`HTTPCache`.
+
+    Fresh responses are served without a request and stale ones are
+    revalidated with ``If-None-Match`` and ``If-Modified-Since``. Requests
+    that carry their own conditional or ``Range`` headers are passed
+    through.
+
+    Parameters
+    ----------
+    cache : HTTPCache
+        The cache.
+    **kwargs
+        Arguments of :class:`requests.adapters.HTTPAdapter`.
+    """
+
+    def __init__(self, cache: HTTPCache, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.cache = cache
+
+    def send(  # type: ignore [override]
+        self,
+        request: requests.PreparedRequest,
+        *args: Any,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request, or answer it from the cache.
+
+        Parameters
+        ----------
+        request : requests.PreparedRequest
+            The request.
+        *args, **kwargs
+            Arguments of :meth:`requests.adapters.HTTPAdapter.send`.
+
+        Returns
+        -------
+        requests.Response
+            The host's response, or the cached one.
+        """
+        url = request.url
+        if url is None or not self._cacheable(request):
+            return super().send(request, *args, **kwargs)
+
+        entry = self.cache.lookup(url)
+        if entry is not None:
+            if entry.fresh:
+                return self._respond(request, entry)
+            request.headers.update(entry.validators)
+        response = super().send(request, *args, **kwargs)
+        if entry is not None and response.status_code == 304:
+            response.close()
+            return self._respond(
+                request, self.cache.revalidated(url, entry, response))
+        stream = kwargs.get('stream', bool(args and args[0]))
+        if self.cache.store(url, response, stream=stream) and stream:
+            # The body was read to be stored, so stream it from memory
+            return self._respond(request, CachedResponse(
+                response.status_code, _stored_headers(response.headers),
+                response.content, 0.0))
+        return response
+
+    def answers(self, request: requests.PreparedRequest) -> bool:
+        """
+        Whether a request would be answered from the cache, without a request
+        to its host.
+
+        Parameters
+        ----------
+        request : requests.PreparedRequest
+            The request.
+
+        Returns
+        -------
+        bool
+            Whether a fresh response to the request is stored.
+        """
+        return request.url is not None and self._cacheable(request) and (
+            self.cache.has_fresh(request.url))
+
+    @staticmethod
+    def _cacheable(request: requests.PreparedRequest) -> bool:
+        """
+        Whether a request may be answered from the cache.
+        """
+        return request.method == 'GET' and not any(
+            name in request.headers
+            for name in ('If-None-Match', 'If-Modified-Since', 'Range'))
+
+    def _respond(
+        self,
+        request: requests.PreparedRequest,
+        entry: CachedResponse
+    ) -> requests.Response:
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(entry.body),
+            headers={**entry.headers, 'Content-Length': str(len(entry.body))},
+            status=entry.status, preload_content=False, decode_content=False)
+        return self.build_response(request, raw)
+
+
+@functools.lru_cache(maxsize=1)
+def http_cache() -> HTTPCache | None:
+    """
+    Return the process-wide cache of HTTP responses, if enabled.
+
+    The cache is enabled by setting the ``HTTP_CACHE_PATH`` environment
+    variable to the path of its database (e.g. ``.cache-http``), which is
+    read when the cache is first used. Otherwise responses are not cached.
+
+    Returns
+    -------
+    HTTPCache | None
+        The shared cache, or None if caching is disabled.
+    """
+    path = os.getenv("HTTP_CACHE_PATH")
+    return HTTPCache(path) if path else None
+
+
+# -- Sessions ----------------------------------------------------------------
+
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+
+
+def _retry_after(response: requests.Response) -> float | None:
+    """
+    Seconds to wait requested by a ``Retry-After`` header, given either as
+    seconds or as an HTTP date.
+    """
+    value = response.headers.get('Retry-After')
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(),
+                   0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientSession(requests.Session):
+    """
+    A :class:`requests.Session` that rate limits, retries, and circuit
+    breaks its requests according to a :class:`HostRegistry`.
+
+    Requests without a ``timeout`` are given the session's. Requests that
+    the ``cache`` answers with a fresh response bypass the host's policies,
+    the limiter, and the hedger, which see only requests sent to the host.
+    Once retries are exhausted, the last 429 or 5xx response is returned (so that
+    ``raise_for_status`` raises as usual) or the last connection error or
+    timeout is raised.
+
+    Parameters
+    ----------
+    registry : HostRegistry, default=None
+        The host policies. Defaults to the shared :func:`host_registry`.
+    timeout : float, default=10
+        Default seconds to wait for a host to respond.
+    max_connections : int, default=10
+        Number of connections kept open per host.
+    limiter : AdaptiveLimiter, default=None
+        Optional limit on the requests in flight, adapted to their latency
+        and to throttled or failed responses.
+    hedger : Hedger, default=None
+        Optional hedging of slow idempotent requests.
+    cache : HTTPCache, default=None
+        Optional cache of GET responses, revalidated with their host.
+    """
+
+    def __init__(
+        self,
+        registry: HostRegistry | None = None,
+        timeout: float = 10,
+        max_connections: int = 10,
+        limiter: AdaptiveLimiter | None = None,
+        hedger: Hedger | None = None,
+        cache: HTTPCache | None = None
+    ):
+        super().__init__()
+        self.registry = registry or host_registry()
+        self.timeout = timeout
+        self.limiter = limiter
+        self.hedger = hedger
+        self.cache = cache
+        if cache is None:
+            adapter = HTTPAdapter(pool_maxsize=max_connections)
+        else:
+            adapter = CachingAdapter(cache, pool_maxsize=max_connections)
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+
+    def request(  # type: ignore [override]
+        self,
+        method: str,
+        url: str,
+        *args: Any,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request, applying the host's policies.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        *args, **kwargs
+            Arguments of :meth:`requests.Session.request`.
+
+        Returns
+        -------
+        requests.Response
+            The response.
+
+        Raises
+        ------
+        CircuitOpenError
+            If the host's circuit is open.
+        requests.exceptions.RequestException
+            If the request still fails after the last retry.
+        """
+        if self.cache is not None and self._answered_locally(
+                method, url, args, kwargs):
+            return super().request(method, url, *args, **kwargs)
+
+        timeout = kwargs.get('timeout') or self.timeout
+        registry = self.registry
+        bucket, breaker = registry.host(urlsplit(url).netloc)
+        retries = registry.max_retries if (
+            method.upper() in IDEMPOTENT_METHODS) else 0
+
+        attempt = 0
+        while True:
+            kwargs['timeout'] = _cap_timeout(timeout, url)
+            try:
+                breaker.before_request()
+            except CircuitOpenError:
+                registry._count(rejected=1)
+                raise
+            try:
+                waited = bucket.acquire(remaining())
+            except TimeoutError:
+                breaker.abandon()
+                raise DeadlineExceeded(
+                    f"Deadline exceeded waiting to request {url}.") from None
+            registry._count(requests=1, throttled=waited)
+
+            try:
+                response = self._send(method, url, *args, **kwargs)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as err:
+                if _expired():
+                    breaker.abandon()
+                    raise DeadlineExceeded(
+                        f"Deadline exceeded requesting {url}.") from err
+                breaker.record(success=False)
+                if attempt >= retries:
+                    raise
+                retry_after = None
+            except DeadlineExceeded:
+                breaker.abandon()
+                raise
+            else:
+                # A 429 shows the host is up, if busy
+                breaker.record(
+                    success=response.status_code not in RETRY_STATUSES - {429})
+                retryable = response.status_code in RETRY_STATUSES
+                if not retryable or attempt >= retries:
+                    return response
+                retry_after = _retry_after(response)
+                response.close()
+
+            if retry_after is not None:
+                # Hold back every request to the host, not only this one
+                bucket.pause(min(retry_after, registry.max_backoff))
+            else:
+                delay = random.uniform(0, min(
+                    registry.max_backoff, registry.backoff * 2 ** attempt))
+                budget = remaining()
+                if budget is not None and delay >= budget:
+                    raise DeadlineExceeded(
+                        f"Deadline exceeded before retrying {url}.")
+                time.sleep(delay)
+            attempt += 1
+            registry._count(retries=1)
+
+    def _answered_locally(
+        self,
+        method: str,
+        url: str,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any]
+    ) -> bool:
+        """
+        Whether a request would be answered from the cache.
+        """
+        if method.upper() != 'GET' or args:
+            return False
+        prepared = self.prepare_request(requests.Request(
+            method, url, params=kwargs.get('params'),
+            headers=kwargs.get('headers'), auth=kwargs.get('auth'),
+            cookies=kwargs.get('cookies')))
+        adapter = self.get_adapter(url)
+        return isinstance(adapter, CachingAdapter) and (
+            adapter.answers(prepared))
+
+    def _send(
+        self,
+        method: str,
+        url: str,
+        *args: Any,
+        **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send one attempt, hedged by the hedger, if any.
+        """
+        if self.hedger is None or method.upper() not in IDEMPOTENT_METHODS:
+            return self._attempt(method, url, *args, **kwargs)
+        host = urlsplit(url).netloc
+        attempt = functools.partial(self._attempt, method, url, *args,
+                                    **kwargs)
+
+        def hedge() -> requests.Response:
+            # Duplicates are requests like any other to the host's rate limit
+            bucket, _ = self.registry.host(host)
+            waited = bucket.acquire(remaining())
+            self.registry._count(requests=1, throttled=waited)
+            return attempt()
+        return self.hedger.call(host, carry_deadline(attempt),
+                                carry_deadline(hedge))
+
+    def _attempt(self, *args: Any, **kwargs: Any) -> requests.Response:
+        """
+        Send one request, holding a slot of the limiter, if any.
+        """
+        if self.limiter is None:
+            return super().request(*args, **kwargs)
+        try:
+            slot = self.limiter.acquire(remaining())
+        except TimeoutError:
+            raise DeadlineExceeded(
+                "Deadline exceeded waiting for a request slot.") from None
+        try:
+            response = super().request(*args, **kwargs)
+            slot.throttled = response.status_code in RETRY_STATUSES
+        except BaseException:
+            slot.failed = True
+            raise
+        finally:
+            self.limiter.release(slot)
+        return response
+
+
+def resilient_session(
+    timeout: float = 10,
+    max_connections: int = 10,
+    limiter: AdaptiveLimiter | None = None,
+    hedger: Hedger | None = None,
+    cache: HTTPCache | None = None
+) -> ResilientSession:
+    """
+    Create a session sharing the process-wide host policies.
+
+    Parameters
+    ----------
+    timeout : float, default=10
+        Default seconds to wait for a host to respond.
+    max_connections : int, default=10
+        Number of connections kept open per host.
+    limiter : AdaptiveLimiter, default=None
+        Optional adaptive limit on the requests in flight.
+    hedger : Hedger, default=None
+        Optional hedging of slow requests.
+    cache : HTTPCache, default=None
+        Optional cache of GET responses, such as :func:`http_cache`.
+
+    Returns
+    -------
+    ResilientSession
+        A new session using :func:`host_registry`.
+    """
+    return ResilientSession(timeout=timeout, max_connections=max_connections,
+                            limiter=limiter, hedger=hedger, cache=cache)
+
+
+if __name__ == "__main__":
+    # Comment out (2) to run all tests in script; (1) to run specific tests
+    # doctest.testmod(verbose=True)
+    # doctest_function(ResilientSession, globs=globals())
+
+    numpydoc_validate_module(sys.modules['__main__'])
@@ -0,0 +1,837 @@
+r"""
+Offline lookups built from the IMDb non-commercial datasets.
+
+.. warning:: The contents of this module will be moved in a future release.
+
+The datasets are published as gzipped TSV files at https://datasets.imdbws.com
+(see https://developer.imdb.com/non-commercial-datasets/). Download them once,
+build an index, and set the ``IMDB_INDEX_DIR`` environment variable to let
+:func:`datopy._media_scrape.get_imdb_id` answer without network access::
+
+    $ curl -O https://datasets.imdbws.com/title.basics.tsv.gz
+    $ python -c "from datopy._imdb_datasets import IMDbTitleIndex; \
+    >   IMDbTitleIndex.build('title.basics.tsv.gz', 'imdb_index')"
+    $ export IMDB_INDEX_DIR=imdb_index
+
+Likewise, with the ``title.ratings``, ``title.crew``, ``title.principals``,
+and ``name.basics`` datasets in the same directory, build a metadata store and
+set ``IMDB_STORE_DIR`` to let :func:`datopy._media_scrape.get_film_metadata`
+answer offline (:meth:`IMDbMetadataStore.film_metadata` enriches whole
+batches at once)::
+
+    $ python -c "from datopy._imdb_datasets import IMDbMetadataStore; \
+    >   IMDbMetadataStore.build('.', 'imdb_store')"
+    $ export IMDB_STORE_DIR=imdb_store
+"""
+
+import os
+import csv
+import sys
+import json
+import time
+import bisect
+import pathlib
+import functools
+import numpy as np
+import pandas as pd
+from typing import Iterable, NamedTuple
+
+from datopy.etl import TrigramIndex, normalize_title
+from datopy.util._columnar import load_strings, save_strings
+from datopy.util._numpydoc_validate import numpydoc_validate_module
+
+
+# Title types in order of preference when a normalized title is ambiguous
+TITLE_KINDS = [
+    'movie', 'tvSeries', 'tvMiniSeries', 'tvMovie', 'tvSpecial', 'video',
+    'short', 'tvShort', 'videoGame', 'tvEpisode', 'tvPilot',
+]
+
+
+# -- Dataset parsing helpers -------------------------------------------------
+
+
+def _read_tsv(
+    path: str | os.PathLike[str],
+    usecols: list[str],
+    chunksize: int
+) -> Iterable[pd.DataFrame]:
+    """
+    Stream an IMDb dataset file in chunks of string columns.
+    """
+    return pd.read_csv(
+        path, sep='\t', usecols=usecols, dtype=str, na_values=['\\N'],
+        keep_default_na=False, quoting=csv.QUOTE_NONE, chunksize=chunksize,
+    )
+
+
+def _tconst_to_int(tconst: pd.Series) -> np.ndarray:
+    """
+    Convert ``tt``/``nm`` identifiers to their numeric part.
+    """
+    return tconst.str[2:].astype(np.uint32).to_numpy()
+
+
+def _normalize_titles(titles: pd.Series) -> np.ndarray:
+    """
+    Apply :func:`~datopy.etl.normalize_title` once per distinct title.
+    """
+    codes, uniques = pd.factorize(titles)
+    normalized = np.array([normalize_title(title) for title in uniques],
+                          dtype=object)
+    return normalized[codes]
+
+
+class IndexStats(NamedTuple):
+    """
+    Size and build cost of an offline index.
+    """
+    n_titles: int
+    build_seconds: float
+    nbytes: int
+
+
+# -- Title index -------------------------------------------------------------
+
+
+class IMDbTitleIndex:
+    r"""
+    Map normalized titles to IMDb tt identifiers without network access.
+
+    Primary and original titles are normalized with
+    :func:`~datopy.etl.normalize_title` and stored in sorted order alongside
+    the title's id, start year, and type. All arrays are memory-mapped, so
+    loading is instant and lookups are a binary search.
+
+    Parameters
+    ----------
+    index_dir : str | os.PathLike
+        A directory created by :meth:`IMDbTitleIndex.build`.
+
+    Examples
+    --------
+    >>> import gzip, pathlib, tempfile
+    >>> from datopy._imdb_datasets import IMDbTitleIndex
+
+    Write a miniature ``title.basics.tsv.gz``
+
+    >>> tmp = pathlib.Path(tempfile.mkdtemp())
+    >>> rows = [
+    ...     "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres",
+    ...     "tt0111161\tmovie\tThe Shawshank Redemption\tThe Shawshank Redemption\t0\t1994\t\\N\t142\tDrama",
+    ...     "tt0211915\tmovie\tAmélie\tLe fabuleux destin d'Amélie Poulain\t0\t2001\t\\N\t122\tComedy,Romance",
+    ...     "tt0142032\ttvMiniSeries\tDune\tDune\t0\t2000\t2000\t265\tAdventure,Sci-Fi",
+    ...     "tt1160419\tmovie\tDune: Part One\tDune\t0\t2021\t\\N\t155\tAction,Sci-Fi",
+    ...     "tt0087182\tmovie\tDune\tDune\t0\t1984\t\\N\t137\tAction,Sci-Fi",
+    ... ]
+    >>> with gzip.open(tmp / "title.basics.tsv.gz", "wt") as file:
+    ...     _ = file.write("\n".join(rows) + "\n")
+
+    Build, then look up titles
+
+    >>> index = IMDbTitleIndex.build(tmp / "title.basics.tsv.gz",
+    ...                              tmp / "index", fuzzy=True, verbose=False)
+    >>> index.stats.n_titles
+    7
+    >>> index.lookup("the shawshank redemption")
+    'tt0111161'
+    >>> index.lookup("Amelie")
+    'tt0211915'
+    >>> index.lookup("dune")
+    'tt0087182'
+    >>> index.lookup("dune", year=2021)
+    'tt1160419'
+    >>> for candidate in index.candidates("DUNE"):
+    ...     print(candidate)
+    ('tt0087182', 1984, 'movie')
+    ('tt1160419', 2021, 'movie')
+    ('tt0142032', 2000, 'tvMiniSeries')
+    >>> index.lookup("dune", kind="tvSeries") is None
+    True
+
+    Correct misspelled titles
+
+    >>> index.lookup("ths shukshank redumption") is None
+    True
+    >>> index.lookup("ths shukshank redumption", min_score=0.5)
+    'tt0111161'
+    """
+
+    def __init__(self, index_dir: str | os.PathLike[str]):
+        index_dir = pathlib.Path(index_dir)
+        with open(index_dir / "meta.json") as file:
+            self.meta = json.load(file)
+
+        self._titles = load_strings(index_dir / "titles")
+        self._tconst = np.load(index_dir / "tconst.npy", mmap_mode='r')
+        self._year = np.load(index_dir / "year.npy", mmap_mode='r')
+        self._kind = np.load(index_dir / "kind.npy", mmap_mode='r')
+        self.kinds = self.meta['kinds']
+
+        self.matcher = None
+        if (index_dir / "trigrams").is_dir():
+            self.matcher = TrigramIndex.load(index_dir / "trigrams")
+
+    @property
+    def stats(self) -> IndexStats:
+        """
+        Number of indexed titles, build time, and on-disk size.
+        """
+        return IndexStats(self.meta['n_titles'], self.meta['build_seconds'],
+                          self.meta['nbytes'])
+
+    @classmethod
+    def build(
+        cls,
+        basics_path: str | os.PathLike[str],
+        index_dir: str | os.PathLike[str],
+        chunksize: int = 1_000_000,
+        fuzzy: bool = False,
+        verbose: bool = True
+    ) -> "IMDbTitleIndex":
+        """
+        Build an index from a local copy of ``title.basics.tsv.gz``.
+
+        Parameters
+        ----------
+        basics_path : str | os.PathLike
+            Path to the (gzipped) ``title.basics`` dataset.
+        index_dir : str | os.PathLike
+            Directory to write the index to. Created if necessary.
+        chunksize : int, default=1_000_000
+            Number of dataset rows read at a time.
+        fuzzy : bool, default=False
+            Option to also build a :class:`~datopy.etl.TrigramIndex` of the
+            distinct titles, for correcting misspelled lookups.
+        verbose : bool, default=True
+            Option to print the build time and on-disk size.
+
+        Returns
+        -------
+        IMDbTitleIndex
+            The newly built index, memory-mapped from ``index_dir``.
+        """
+        start = time.perf_counter()
+        index_dir = pathlib.Path(index_dir)
+        index_dir.mkdir(parents=True, exist_ok=True)
+
+        usecols = ['tconst', 'titleType', 'primaryTitle', 'originalTitle',
+                   'startYear']
+        frames = []
+        for chunk in _read_tsv(basics_path, usecols, chunksize):
+            # Original titles only add entries where they differ
+            originals = chunk[chunk['originalTitle'] != chunk['primaryTitle']]
+            entries = pd.concat([
+                table[['tconst', 'titleType', 'startYear', column]]
+                .rename(columns={column: 'title'})
+                for table, column in ((chunk, 'primaryTitle'),
+                                      (originals, 'originalTitle'))
+            ]).dropna(subset=['title'])
+            entries['title'] = _normalize_titles(entries['title'])
+            entries = entries[entries['title'] != '']
+            frames.append(entries.drop_duplicates(['tconst', 'title']))
+
+        entries = pd.concat(frames, ignore_index=True)
+        kinds = TITLE_KINDS + sorted(
+            set(entries['titleType'].dropna()) - set(TITLE_KINDS))
+        entries['kind'] = pd.Categorical(
+            entries['titleType'], categories=kinds).codes.astype(np.uint8)
+        entries['tconst'] = _tconst_to_int(entries['tconst'])
+        entries['year'] = pd.to_numeric(
+            entries['startYear']).fillna(0).astype(np.uint16)
+
+        # Preferred candidates come first within each run of equal titles
+        entries = entries.sort_values(['title', 'kind', 'tconst'],
+                                      ignore_index=True)
+
+        save_strings(index_dir / "titles", entries['title'])
+        if fuzzy:
+            TrigramIndex(entries['title'].unique()).save(index_dir / "trigrams")
+        np.save(index_dir / "tconst.npy", entries['tconst'].to_numpy())
+        np.save(index_dir / "year.npy", entries['year'].to_numpy())
+        np.save(index_dir / "kind.npy", entries['kind'].to_numpy())
+
+        nbytes = sum(path.stat().st_size
+                     for path in index_dir.glob("**/*.npy"))
+        build_seconds = time.perf_counter() - start
+        meta = {'kinds': kinds, 'n_titles': len(entries),
+                'build_seconds': round(build_seconds, 3), 'nbytes': nbytes,
+                'source': os.path.basename(basics_path)}
+        with open(index_dir / "meta.json", "w") as file:
+            json.dump(meta, file, indent=4)
+
+        if verbose:
+            print(f"Indexed {len(entries):,} titles in {build_seconds:.1f} s "
+                  f"({nbytes / 1e6:.1f} MB on disk).")
+
+        return cls(index_dir)
+
+    def _span(self, title: str) -> range:
+        """
+        Positions of the entries whose normalized title equals ``title``.
+        """
+        key = normalize_title(title).encode()
+        lo = bisect.bisect_left(self._titles, key)
+        hi = bisect.bisect_right(self._titles, key, lo=lo)
+        return range(lo, hi)
+
+    def candidates(self, title: str) -> list[tuple[str, int | None, str]]:
+        """
+        List every title matching ``title`` in order of preference.
+
+        Parameters
+        ----------
+        title : str
+            Title of a film or tv show (insensitive to case and accents).
+
+        Returns
+        -------
+        list[tuple[str, int | None, str]]
+            ``(tt_id, start_year, kind)`` for each match; movies first,
+            then series, then other title types, each in order of tt id.
+        """
+        return [(f"tt{self._tconst[i]:07d}", int(self._year[i]) or None,
+                 self.kinds[self._kind[i]])
+                for i in self._span(title)]
+
+    def lookup(
+        self,
+        title: str,
+        year: int | None = None,
+        kind: str | None = None,
+        min_score: float | None = None
+    ) -> str | None:
+        """
+        Find the IMDb tt identifier for a title.
+
+        Parameters
+        ----------
+        title : str
+            Title of a film or tv show (insensitive to case and accents).
+        year : int, default=None
+            Optionally require this start year.
+        kind : str, default=None
+            Optionally require this IMDb title type (e.g. ``'tvSeries'``).
+        min_score : float, default=None
+            If given and the title is not found, retry with the most similar
+            titles scoring at least ``min_score`` (requires an index built
+            with ``fuzzy=True``).
+
+        Returns
+        -------
+        str | None
+            The preferred matching tt identifier, or None if none match.
+        """
+        for i in self._span(title):
+            if year is not None and self._year[i] != year:
+                continue
+            if kind is not None and self.kinds[self._kind[i]] != kind:
+                continue
+            return f"tt{self._tconst[i]:07d}"
+
+        if min_score is not None and self.matcher is not None:
+            for similar, _ in self.matcher.search(title, min_score=min_score):
+                imdb_id = self.lookup(similar, year=year, kind=kind)
+                if imdb_id is not None:
+                    return imdb_id
+        return None
+
+
+# -- Metadata store ----------------------------------------------------------
+
+
+# Dataset files read by IMDbMetadataStore.build
+DATASET_FILES = {
+    'basics': "title.basics.tsv.gz",
+    'ratings': "title.ratings.tsv.gz",
+    'crew': "title.crew.tsv.gz",
+    'principals': "title.principals.tsv.gz",
+    'names': "name.basics.tsv.gz",
+}
+
+# Title types as spelled by Cinemagoer's 'kind' key
+CINEMAGOER_KINDS = {
+    'movie': 'movie', 'tvSeries': 'tv series',
+    'tvMiniSeries': 'tv mini series', 'tvMovie': 'tv movie',
+    'tvSpecial': 'tv special', 'video': 'video movie', 'short': 'short',
+    'tvShort': 'tv short', 'videoGame': 'video game', 'tvEpisode': 'episode',
+    'tvPilot': 'tv pilot',
+}
+
+# Columns returned by datopy._media_scrape.get_film_metadata
+FILM_COLUMNS = [
+    'title', 'imdbID', 'type', 'year', 'runtime (min)', 'rating', 'votes',
+    'genres', 'countries', 'director', 'writer', 'composer', 'cast', 'plot',
+    'synopsis', 'plot outline',
+]
+
+# Principal categories listed in the cast, in billing order
+CAST_CATEGORIES = ['actor', 'actress', 'self']
+
+
+def _first_person(people: pd.Series) -> np.ndarray:
+    """
+    Numeric id of the first ``nm`` identifier in comma-separated lists.
+    """
+    first = people.str.split(',', n=1).str[0]
+    return pd.to_numeric(first.str[2:]).fillna(0).to_numpy(np.uint32)
+
+
+def _align(
+    keys: np.ndarray,
+    ids: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Positions of ``ids`` within the sorted array ``keys``, and a found mask.
+    """
+    positions = np.searchsorted(keys, ids)
+    positions = np.minimum(positions, max(len(keys) - 1, 0))
+    found = (keys[positions] == ids) if len(keys) else np.zeros(
+        len(ids), dtype=bool)
+    return positions, found
+
+
+def _ranges(lo: np.ndarray, hi: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Expand ``[lo, hi)`` ranges to (range number, position) pairs.
+    """
+    counts = hi - lo
+    owners = np.repeat(np.arange(len(lo)), counts)
+    firsts = np.cumsum(counts) - counts
+    positions = np.arange(counts.sum()) - firsts[owners] + lo[owners]
+    return owners, positions
+
+
+class IMDbMetadataStore:
+    r"""
+    Film metadata joined from the IMDb datasets without network access.
+
+    :meth:`IMDbMetadataStore.build` ingests the ``title.basics``,
+    ``title.ratings``, ``title.crew``, ``title.principals``, and
+    ``name.basics`` datasets (the last resolves people's names) into
+    memory-mapped columns keyed by sorted numeric ids, together with an
+    :class:`IMDbTitleIndex` for resolving titles. Batches of titles are then
+    joined with binary searches over whole arrays.
+
+    The frames have the columns of
+    :func:`~datopy._media_scrape.get_film_metadata`. The datasets carry no
+    countries or plot summaries, so those columns are None, and the cast is
+    limited to the principal (top-billed) cast.
+
+    Parameters
+    ----------
+    store_dir : str | os.PathLike
+        A directory created by :meth:`IMDbMetadataStore.build`.
+
+    Examples
+    --------
+    >>> import gzip, pathlib, tempfile
+    >>> from datopy._imdb_datasets import IMDbMetadataStore
+
+    Write miniature datasets
+
+    >>> tmp = pathlib.Path(tempfile.mkdtemp())
+    >>> datasets = {
+    ...     "title.basics.tsv.gz": [
+    ...         "tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult\tstartYear\tendYear\truntimeMinutes\tgenres",
+    ...         "tt0246578\tmovie\tDonnie Darko\tDonnie Darko\t0\t2001\t\\N\t113\tDrama,Mystery,Sci-Fi,Thriller",
+    ...         "tt0142032\ttvMiniSeries\tDune\tDune\t0\t2000\t2000\t265\tAdventure,Sci-Fi",
+    ...     ],
+    ...     "title.ratings.tsv.gz": [
+    ...         "tconst\taverageRating\tnumVotes",
+    ...         "tt0246578\t8.0\t847582",
+    ...     ],
+    ...     "title.crew.tsv.gz": [
+    ...         "tconst\tdirectors\twriters",
+    ...         "tt0142032\tnm0353444\t\\N",
+    ...         "tt0246578\tnm0446819\tnm0446819",
+    ...     ],
+    ...     "title.principals.tsv.gz": [
+    ...         "tconst\tordering\tnconst\tcategory\tjob\tcharacters",
+    ...         "tt0246578\t1\tnm0350453\tactor\t\\N\t[\"Donnie Darko\"]",
+    ...         "tt0246578\t3\tnm0000379\tactress\t\\N\t\\N",
+    ...         "tt0246578\t2\tnm0651414\tactor\t\\N\t\\N",
+    ...         "tt0246578\t9\tnm0027571\tcomposer\t\\N\t\\N",
+    ...     ],
+    ...     "name.basics.tsv.gz": [
+    ...         "nconst\tprimaryName\tbirthYear",
+    ...         "nm0000379\tMaggie Gyllenhaal\t1977",
+    ...         "nm0027571\tMichael Andrews\t1967",
+    ...         "nm0350453\tJake Gyllenhaal\t1980",
+    ...         "nm0353444\tJohn Harrison\t1948",
+    ...         "nm0446819\tRichard Kelly\t1975",
+    ...         "nm0651414\tHolmes Osborne\t1947",
+    ...     ],
+    ... }
+    >>> for name, rows in datasets.items():
+    ...     with gzip.open(tmp / name, "wt") as file:
+    ...         _ = file.write("\n".join(rows) + "\n")
+
+    Build the store, then enrich a batch of titles
+
+    >>> store = IMDbMetadataStore.build(tmp, tmp / "store", verbose=False)
+    >>> store.stats.n_titles
+    2
+    >>> films = store.film_metadata(["donnie darko", "Dune", "Nope"])
+    >>> films.T[0]
+    title                                                 Donnie Darko
+    imdbID                                                     0246578
+    type                                                         movie
+    year                                                          2001
+    runtime (min)                                                  113
+    rating                                                         8.0
+    votes                                                       847582
+    genres                            Drama, Mystery, Sci-Fi, Thriller
+    countries                                                     None
+    director                                             Richard Kelly
+    writer                                               Richard Kelly
+    composer                                           Michael Andrews
+    cast             Jake Gyllenhaal, Holmes Osborne, Maggie Gyllen...
+    plot                                                          None
+    synopsis                                                      None
+    plot outline                                                  None
+    Name: 0, dtype: object
+    >>> films.loc[0, 'cast']
+    'Jake Gyllenhaal, Holmes Osborne, Maggie Gyllenhaal'
+    >>> films[['title', 'type', 'rating', 'director', 'cast']].iloc[1:]
+      title            type  rating       director  cast
+    1  Dune  tv mini series     NaN  John Harrison  None
+    2  None            None     NaN           None  None
+    """
+
+    def __init__(self, store_dir: str | os.PathLike[str]):
+        store_dir = pathlib.Path(store_dir)
+        with open(store_dir / "meta.json") as file:
+            self.meta = json.load(file)
+        self.index = IMDbTitleIndex(store_dir / "index")
+
+        def load(name):
+            return np.load(store_dir / f"{name}.npy", mmap_mode='r')
+
+        self._tconst = load("tconst")
+        self._kind = load("kind")
+        self._year = load("year")
+        self._runtime = load("runtime")
+        self._genre_code = load("genre_code")
+        self._rating = load("rating")
+        self._votes = load("votes")
+        self._director = load("director")
+        self._writer = load("writer")
+        self._composer = load("composer")
+        self._cast_tconst = load("cast_tconst")
+        self._cast_nconst = load("cast_nconst")
+        self._nconst = load("nconst")
+        self._titles = load_strings(store_dir / "title")
+        self._names = load_strings(store_dir / "name")
+        self.genres = self.meta['genres']
+        self.kinds = self.meta['kinds']
+
+    @property
+    def stats(self) -> IndexStats:
+        """
+        Number of stored titles, build time, and on-disk size.
+        """
+        return IndexStats(self.meta['n_titles'], self.meta['build_seconds'],
+                          self.meta['nbytes'])
+
+    @classmethod
+    def build(
+        cls,
+        dataset_dir: str | os.PathLike[str],
+        store_dir: str | os.PathLike[str],
+        chunksize: int = 1_000_000,
+        fuzzy: bool = False,
+        verbose: bool = True
+    ) -> "IMDbMetadataStore":
+        """
+        Build a store from local copies of the IMDb datasets.
+
+        Parameters
+        ----------
+        dataset_dir : str | os.PathLike
+            Directory holding the files listed in ``DATASET_FILES``.
+        store_dir : str | os.PathLike
+            Directory to write the store to. Created if necessary.
+        chunksize : int, default=1_000_000
+            Number of dataset rows read at a time.
+        fuzzy : bool, default=False
+            Option to let the title index correct misspelled titles
+            (see :meth:`IMDbTitleIndex.build`).
+        verbose : bool, default=True
+            Option to print the build time and on-disk size.
+
+        Returns
+        -------
+        IMDbMetadataStore
+            The newly built store, memory-mapped from ``store_dir``.
+        """
+        start = time.perf_counter()
+        dataset_dir = pathlib.Path(dataset_dir)
+        store_dir = pathlib.Path(store_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        paths = {key: dataset_dir / name for key, name in DATASET_FILES.items()}
+
+        def save(name, array):
+            np.save(store_dir / f"{name}.npy", array)
+
+        IMDbTitleIndex.build(paths['basics'], store_dir / "index",
+                             chunksize=chunksize, fuzzy=fuzzy, verbose=False)
+
+        # Title columns, aligned to the sorted tconst array
+        usecols = ['tconst', 'titleType', 'primaryTitle', 'startYear',
+                   'runtimeMinutes', 'genres']
+        basics = pd.concat(_read_tsv(paths['basics'], usecols, chunksize),
+                           ignore_index=True)
+        basics['tconst'] = _tconst_to_int(basics['tconst'])
+        basics = basics.sort_values('tconst', ignore_index=True)
+        tconst = basics['tconst'].to_numpy()
+
+        kinds = TITLE_KINDS + sorted(
+            set(basics['titleType'].dropna()) - set(TITLE_KINDS))
+        genre_codes, genres = pd.factorize(basics['genres'])
+        save("tconst", tconst)
+        save("kind", pd.Categorical(basics['titleType'], categories=kinds)
+             .codes.astype(np.uint8))
+        save("year", pd.to_numeric(basics['startYear'])
+             .fillna(0).to_numpy(np.uint16))
+        save("runtime", pd.to_numeric(basics['runtimeMinutes'])
+             .fillna(0).to_numpy(np.uint32))
+        save("genre_code", genre_codes.astype(np.int32))
+        save_strings(store_dir / "title", basics['primaryTitle'].fillna(''))
+        del basics
+
+        def per_title(path, converters, dtype):
+            """Scatter per-title dataset columns onto the tconst array."""
+            columns = {name: np.zeros(len(tconst), dtype=dtype)
+                       for name in converters}
+            usecols = ['tconst', *converters]
+            for chunk in _read_tsv(path, usecols, chunksize):
+                positions, found = _align(
+                    tconst, _tconst_to_int(chunk['tconst']))
+                for name, convert in converters.items():
+                    column = columns[name]
+                    column[positions[found]] = convert(chunk[name])[found]
+            return columns.values()
+
+        # Ratings in tenths fit one byte; 0 marks unrated titles
+        rating, votes = per_title(paths['ratings'], {
+            'averageRating': lambda values: np.rint(
+                values.astype(float).to_numpy() * 10),
+            'numVotes': lambda values: values.astype(float).to_numpy(),
+        }, np.uint32)
+        save("rating", rating.astype(np.uint8))
+        save("votes", votes)
+        director, writer = per_title(paths['crew'], {
+            'directors': _first_person, 'writers': _first_person,
+        }, np.uint32)
+        save("director", director)
+        save("writer", writer)
+
+        # Principal cast in billing order, and each title's first composer
+        usecols = ['tconst', 'ordering', 'nconst', 'category']
+        cast: list[pd.DataFrame] = []
+        composers: list[pd.DataFrame] = []
+        for chunk in _read_tsv(paths['principals'], usecols, chunksize):
+            for frame, categories in ((cast, CAST_CATEGORIES),
+                                      (composers, ['composer'])):
+                rows = chunk[chunk['category'].isin(categories)]
+                frame.append(pd.DataFrame({
+                    'tconst': _tconst_to_int(rows['tconst']),
+                    'ordering': pd.to_numeric(rows['ordering']).to_numpy(),
+                    'nconst': _tconst_to_int(rows['nconst']),
+                }))
+        cast_df: pd.DataFrame = pd.concat(cast, ignore_index=True).sort_values(
+            ['tconst', 'ordering'], ignore_index=True)
+        composer_df = pd.concat(composers, ignore_index=True).sort_values(
+            ['tconst', 'ordering']).drop_duplicates('tconst')
+        composer = np.zeros(len(tconst), dtype=np.uint32)
+        positions, found = _align(tconst, composer_df['tconst'].to_numpy())
+        composer[positions[found]] = composer_df['nconst'].to_numpy()[found]
+        save("composer", composer)
+        save("cast_tconst", cast_df['tconst'].to_numpy(np.uint32))
+        save("cast_nconst", cast_df['nconst'].to_numpy(np.uint32))
+
+        # Names of the people referenced above
+        people = np.unique(np.concatenate([
+            director, writer, composer, cast_df['nconst'].to_numpy(np.uint32),
+        ]))
+        frames = []
+        for chunk in _read_tsv(paths['names'], ['nconst', 'primaryName'],
+                               chunksize):
+            nconst = _tconst_to_int(chunk['nconst'])
+            keep = np.isin(nconst, people)
+            frames.append(pd.DataFrame({'nconst': nconst[keep],
+                                        'name': chunk['primaryName'][keep]}))
+        names = pd.concat(frames, ignore_index=True).sort_values(
+            'nconst', ignore_index=True)
+        save("nconst", names['nconst'].to_numpy(np.uint32))
+        save_strings(store_dir / "name", names['name'].fillna(''))
+
+        nbytes = sum(path.stat().st_size
+                     for path in store_dir.glob("**/*.npy"))
+        build_seconds = time.perf_counter() - start
+        meta = {'kinds': kinds, 'genres': list(genres),
+                'n_titles': len(tconst), 'n_names': len(names),
+                'build_seconds': round(build_seconds, 3), 'nbytes': nbytes}
+        with open(store_dir / "meta.json", "w") as file:
+            json.dump(meta, file, indent=4)
+
+        if verbose:
+            print(f"Stored {len(tconst):,} titles and {len(names):,} names "
+                  f"in {build_seconds:.1f} s ({nbytes / 1e6:.1f} MB on disk).")
+
+        return cls(store_dir)
+
+    def _people(self, nconst: np.ndarray) -> np.ndarray:
+        """
+        Names of people by numeric id, decoding each distinct name once.
+        """
+        uniques, inverse = np.unique(nconst, return_inverse=True)
+        positions, found = _align(self._nconst, uniques)
+        names = np.full(len(uniques), None, dtype=object)
+        names[found] = self._names.take(positions[found])
+        return names[inverse]
+
+    def film_metadata_by_id(self, imdb_ids: Iterable[str | None]) -> pd.DataFrame:
+        """
+        Join the metadata of a batch of titles by IMDb id.
+
+        Parameters
+        ----------
+        imdb_ids : Iterable[str | None]
+            IMDb ``tt`` identifiers (with or without the ``tt`` prefix).
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per id, in order, with the columns of
+            :func:`~datopy._media_scrape.get_film_metadata`. Rows of unknown
+            ids are empty.
+        """
+        ids = np.array([int(str(imdb_id).removeprefix('tt'))
+                        if imdb_id else 0 for imdb_id in imdb_ids],
+                       dtype=np.uint32)
+        n = len(ids)
+        positions, found = _align(self._tconst, ids)
+        rows = positions[found]
+
+        def column(values, dtype=object):
+            series = pd.Series([None] * n, dtype=dtype)
+            series[found] = values
+            return series
+
+        def optional(values, dtype='Int64'):
+            """Numeric column in which 0 marks a missing value."""
+            series = column(values, dtype=dtype)
+            return series.mask(series == 0)
+
+        def people(nconst):
+            names = self._people(nconst)
+            names[nconst == 0] = None
+            return column(names)
+
+        # Principal cast of each title, joined in billing order
+        lo = np.searchsorted(self._cast_tconst, ids[found], 'left')
+        hi = np.searchsorted(self._cast_tconst, ids[found], 'right')
+        owners, cast_rows = _ranges(lo, hi)
+        names = self._people(self._cast_nconst[cast_rows])
+        named = names != None  # noqa: E711
+        names, owners = names[named].tolist(), owners[named]
+        ends = np.cumsum(np.bincount(owners, minlength=len(rows)))
+        cast = [', '.join(names[end - count:end]) or None
+                for end, count in zip(ends.tolist(), np.diff(ends, prepend=0)
+                                      .tolist())]
+
+        genres = np.array([None] + [genre.replace(',', ', ')
+                                    for genre in self.genres], dtype=object)
+        kinds = np.array([CINEMAGOER_KINDS.get(kind, kind)
+                          for kind in self.kinds] + [None], dtype=object)
+        kind_codes = self._kind[rows].astype(np.int16)
+        kind_codes[kind_codes == np.iinfo(np.uint8).max] = -1
+
+        return pd.DataFrame({
+            'title': column(self._titles.take(rows)),
+            'imdbID': column([f"{imdb_id:07d}" for imdb_id in ids[found]]),
+            'type': column(kinds[kind_codes]),
+            'year': optional(self._year[rows]),
+            'runtime (min)': optional(self._runtime[rows]),
+            'rating': optional(self._rating[rows] / 10, dtype=float),
+            'votes': optional(self._votes[rows]),
+            'genres': column(genres[self._genre_code[rows] + 1]),
+            'countries': column(None),
+            'director': people(self._director[rows]),
+            'writer': people(self._writer[rows]),
+            'composer': people(self._composer[rows]),
+            'cast': column(cast),
+            'plot': column(None),
+            'synopsis': column(None),
+            'plot outline': column(None),
+        }, columns=FILM_COLUMNS)
+
+    def film_metadata(
+        self,
+        titles: Iterable[str],
+        min_score: float | None = None
+    ) -> pd.DataFrame:
+        """
+        Join the metadata of a batch of titles.
+
+        Parameters
+        ----------
+        titles : Iterable[str]
+            Titles of films or tv shows (insensitive to case and accents),
+            resolved with :meth:`IMDbTitleIndex.lookup`.
+        min_score : float, default=None
+            Option to correct misspelled titles (see
+            :meth:`IMDbTitleIndex.lookup`).
+
+        Returns
+        -------
+        pd.DataFrame
+            One row per title, in order, as for
+            :meth:`IMDbMetadataStore.film_metadata_by_id`.
+        """
+        return self.film_metadata_by_id(
+            self.index.lookup(title, min_score=min_score) for title in titles)
+
+
+@functools.lru_cache(maxsize=1)
+def default_title_index() -> IMDbTitleIndex | None:
+    """
+    Load the title index configured by the ``IMDB_INDEX_DIR`` variable.
+
+    Returns
+    -------
+    IMDbTitleIndex | None
+        The index, or None if the variable is unset or no index exists there.
+    """
+    index_dir = os.getenv("IMDB_INDEX_DIR")
+    if not index_dir or not os.path.isfile(os.path.join(index_dir,
+                                                        "meta.json")):
+        return None
+    return IMDbTitleIndex(index_dir)
+
+
+@functools.lru_cache(maxsize=1)
+def default_metadata_store() -> IMDbMetadataStore | None:
+    """
+    Load the metadata store configured by the ``IMDB_STORE_DIR`` variable.
+
+    Returns
+    -------
+    IMDbMetadataStore | None
+        The store, or None if the variable is unset or no store exists there.
+    """
+    store_dir = os.getenv("IMDB_STORE_DIR")
+    if not store_dir or not os.path.isfile(os.path.join(store_dir,
+                                                        "meta.json")):
+        return None
+    return IMDbMetadataStore(store_dir)
+
+
+if __name__ == "__main__":
+    # Comment out (2) to run all tests in script; (1) to run specific tests
+    # doctest.testmod(verbose=True)
+    # doctest_function(IMDbTitleIndex, globs=globals())
+
+    numpydoc_validate_module(sys.modules['__main__'])
@@ -0,0 +1,675 @@
+"""
+Load testing of the metadata retrieval routines against local stand-ins.
+
+.. warning:: The contents of this module will be moved in a future release.
+
+:func:`run_load_test` drives a weighted mix of retrievals
+(:func:`~datopy._media_scrape.get_imdb_id`,
+:func:`~datopy._media_scrape.get_film_metadata`,
+:func:`~datopy._examples.spotify_album_retrieve`, and
+:func:`~datopy._examples.wiki_metadata_retrieve`) from many threads for a
+fixed duration, against a :class:`StandInServer` answering for IMDb,
+Cinemagoer, Spotify, and Wikipedia with configurable latency and errors. It
+reports throughput, latency percentiles, error rates, and peak memory as
+JSON, for comparing runs::
+
+    $ python -m datopy._loadtest --concurrency 500 --duration 30 \\
+    >   --mix imdb_id=2,spotify_album=1 --output load-500.json
+
+.. rubric:: Load tests
+
+.. autosummary::
+    :toctree: generated/
+
+    run_load_test
+    StandInServer
+    StandInCinemagoer
+    OPERATIONS
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import tempfile
+import threading
+import datetime
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import spotipy
+
+from datopy._clients import ClientPool, SharedClientCredentials
+from datopy._examples import (
+    Album, Book, spotify_album_retrieve, wiki_metadata_retrieve,
+)
+from datopy._http import resilient_session
+from datopy._media_scrape import (
+    MediaWikiBackend, get_film_metadata, get_imdb_id,
+)
+from datopy.util._numpydoc_validate import numpydoc_validate_module
+
+
+# -- Stand-in server ---------------------------------------------------------
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """
+    Route requests to the stand-in APIs of the :class:`StandInServer`.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    server: Any
+
+    def do_GET(self) -> None:
+        self.respond()
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self.respond()
+
+    def respond(self) -> None:
+        stand_in: StandInServer = self.server.stand_in
+        url = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        status, body, content_type = stand_in.answer(
+            self.command, url.path, query)
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # The client timed out and hung up
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # Accept bursts of hundreds of concurrent connections
+    request_queue_size = 1024
+
+
+class StandInServer:
+    """
+    Local stand-in for the IMDb, Cinemagoer, Spotify, and MediaWiki APIs.
+
+    The catalogue holds ``n_works`` works of each kind: the film
+    ``'film {i}'`` (IMDb identifier ``tt{i}``), the album ``'album {i}'`` by
+    ``'artist {i}'`` with 12 tracks, and the book ``'Novel {i}'``. Each
+    response is delayed by ``latency`` seconds (exponentially distributed
+    about it, if ``jitter``), and a random ``error_rate`` of requests fail
+    with 503.
+
+    Parameters
+    ----------
+    n_works : int, default=1000
+        Number of works of each kind.
+    latency : float, default=0.01
+        Mean seconds before responding.
+    error_rate : float, default=0.0
+        Fraction of requests answered with 503.
+    jitter : bool, default=True
+        Whether to draw latencies from an exponential distribution.
+    seed : int, default=0
+        Seed of the random latencies and errors.
+
+    Examples
+    --------
+    >>> import requests
+    >>> from datopy._loadtest import StandInServer
+
+    >>> with StandInServer(n_works=10, latency=0) as server:
+    ...     response = requests.get(f"{server.url}/cinemagoer/movie/0000003")
+    >>> response.json()['title'], server.requests
+    ('film 3', 1)
+    """
+
+    def __init__(
+        self,
+        n_works: int = 1000,
+        latency: float = 0.01,
+        error_rate: float = 0.0,
+        jitter: bool = True,
+        seed: int = 0
+    ) -> None:
+        self.n_works = n_works
+        self.latency = latency
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.url = ''
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._routes: list[tuple[str, Callable[..., Any]]] = [
+            (r"/find", self._imdb_search),
+            (r"/cinemagoer/search", self._cinemagoer_search),
+            (r"/cinemagoer/movie/(\d+)", self._cinemagoer_movie),
+            (r"/api/token", self._token),
+            (r"/v1/search", self._spotify_search),
+            (r"/v1/albums", self._albums),
+            (r"/v1/albums/a(\d+)/tracks", self._track_page),
+            (r"/v1/albums/a(\d+)", self._album),
+            (r"/v1/audio-features", self._audio_features),
+            (r"/v1/tracks", self._tracks),
+            (r"/w/api.php", self._wiki_pages),
+        ]
+
+    @property
+    def requests(self) -> int:
+        """
+        Number of requests received.
+        """
+        with self._lock:
+            return self._requests
+
+    def __enter__(self) -> 'StandInServer':
+        self._httpd = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.stand_in = self  # type: ignore [attr-defined]
+        threading.Thread(target=self._httpd.serve_forever,
+                         daemon=True).start()
+        self.url = f"http://127.0.0.1:{self._httpd.server_port}"
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def answer(
+        self,
+        method: str,
+        path: str,
+        query: dict[str, str]
+    ) -> tuple[int, bytes, str]:
+        """
+        Return the status, body, and content type answering a request.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        path : str
+            The path requested.
+        query : dict[str, str]
+            The query parameters.
+
+        Returns
+        -------
+        tuple[int, bytes, str]
+            The response.
+        """
+        with self._lock:
+            self._requests += 1
+            fail = self._rng.random() < self.error_rate
+            delay = (self._rng.expovariate(1 / self.latency)
+                     if self.jitter and self.latency else self.latency)
+        time.sleep(delay)
+        if fail:
+            return 503, b"unavailable", "text/plain"
+
+        for pattern, route in self._routes:
+            match = re.fullmatch(pattern, path.rstrip('/'))
+            if match:
+                payload = route(query, *map(int, match.groups()))
+                if isinstance(payload, str):
+                    return 200, payload.encode(), "text/html"
+                if payload is None:
+                    return 404, b'{"error": "not found"}', "application/json"
+                return 200, json.dumps(payload).encode(), "application/json"
+        return 404, b"not found", "text/plain"
+
+    def _work(self, title: str, kind: str) -> int | None:
+        """
+        Return the index of a work of the catalogue by its title.
+        """
+        match = re.fullmatch(rf"{kind} (\d+)", title.strip().lower())
+        if match and int(match.group(1)) < self.n_works:
+            return int(match.group(1))
+        return None
+
+    # IMDb and Cinemagoer
+
+    def _imdb_search(self, query: dict[str, str]) -> str:
+        i = self._work(query.get('q', ''), 'film')
+        links = ('' if i is None else
+                 f'<li><a href="/title/tt{i:07d}/?ref_=fn_al_tt_1">'
+                 f'film {i}</a></li>')
+        return ('<html><body><a href="/chart/top">Top 250</a>'
+                f'<ul class="find-results">{links}</ul></body></html>')
+
+    def _cinemagoer_search(
+        self,
+        query: dict[str, str]
+    ) -> list[dict[str, str]]:
+        i = self._work(query.get('q', ''), 'film')
+        return [] if i is None else [{'movieID': f"{i:07d}"}]
+
+    def _cinemagoer_movie(
+        self,
+        query: dict[str, str],
+        i: int
+    ) -> dict[str, Any] | None:
+        if i >= self.n_works:
+            return None
+        return {
+            'title': f"film {i}", 'imdbID': f"{i:07d}", 'kind': 'movie',
+            'year': 1950 + i % 70, 'runtime': [str(80 + i % 60)],
+            'rating': round(5 + i % 50 / 10, 1), 'votes': 1000 + i,
+            'genres': ['Drama', 'Sci-Fi'][:1 + i % 2],
+            'countries': ['United States'],
+            'director': [{'name': f"director {i}"}],
+            'writer': [{'name': f"writer {i}"}],
+            'composer': [{'name': f"composer {i}"}],
+            'cast': [{'name': f"actor {i}.{k}"} for k in range(5)],
+            'plot': [f"The plot of film {i}."],
+            'synopsis': [f"The synopsis of film {i}."],
+            'plot outline': f"Film {i} in brief.",
+        }
+
+    # Spotify
+
+    def _token(self, query: dict[str, str]) -> dict[str, Any]:
+        return {'access_token': "stand-in-token", 'token_type': "Bearer",
+                'expires_in': 3600}
+
+    def _spotify_search(
+        self,
+        query: dict[str, str]
+    ) -> dict[str, Any]:
+        match = re.fullmatch(r"artist:artist (\d+) album:album (\d+)",
+                             query.get('q', ''))
+        items = []
+        if match and match.group(1) == match.group(2) and (
+                int(match.group(1)) < self.n_works):
+            i = int(match.group(1))
+            items.append({'id': f"a{i}", 'name': f"album {i}"})
+        return {'albums': {'total': len(items), 'items': items}}
+
+    def _album(
+        self,
+        query: dict[str, str],
+        i: int
+    ) -> dict[str, Any]:
+        return {'id': f"a{i}", 'name': f"album {i}",
+                'artists': [{'name': f"artist {i}"}], 'total_tracks': 12,
+                'tracks': self._track_page({}, i)}
+
+    def _albums(self, query: dict[str, str]) -> dict[str, Any]:
+        return {'albums': [self._album(query, int(album_id[1:]))
+                           for album_id in query['ids'].split(',')]}
+
+    def _track_page(
+        self,
+        query: dict[str, str],
+        i: int
+    ) -> dict[str, Any]:
+        offset = int(query.get('offset', 0))
+        limit = int(query.get('limit', 50))
+        tracks = [f"t{i}x{k}" for k in range(12)][offset:offset + limit]
+        return {'items': [{'id': track, 'name': f"track {track}"}
+                          for track in tracks],
+                'next': None}
+
+    def _audio_features(
+        self,
+        query: dict[str, str]
+    ) -> dict[str, Any]:
+        return {'audio_features': [
+            {'id': track, 'danceability': len(track) / 100,
+             'duration_ms': 1000 * len(track)}
+            for track in query['ids'].split(',')]}
+
+    def _tracks(self, query: dict[str, str]) -> dict[str, Any]:
+        return {'tracks': [{'id': track, 'popularity': len(track)}
+                           for track in query['ids'].split(',')]}
+
+    # MediaWiki
+
+    def _wiki_pages(self, query: dict[str, str]) -> dict[str, Any]:
+        pages = []
+        for title in query.get('titles', '').split('|'):
+            i = self._work(title, 'novel')
+            if i is None:
+                pages.append({'title': title, 'missing': True})
+                continue
+            content = (f"{{{{Infobox book\n| name = Novel {i}\n"
+                       f"| author = [[Author {i}]]\n| pages = {100 + i}\n}}}}"
+                       f"\nNovel {i} is a novel.")
+            pages.append({'title': f"Novel {i}", 'revisions': [
+                {'slots': {'main': {'content': content}}}]})
+        return {'batchcomplete': True, 'query': {'pages': pages}}
+
+
+class StandInCinemagoer:
+    """
+    A client of the :class:`StandInServer`'s films, in place of
+    :class:`~imdb.Cinemagoer`.
+
+    Parameters
+    ----------
+    url : str
+        The root URL of the stand-in server.
+    """
+
+    def __init__(self, url: str) -> None:
+        self.url = url
+        self.session = resilient_session()
+
+    def search_movie(self, title: str) -> list[SimpleNamespace]:
+        """
+        Search for films by title.
+
+        Parameters
+        ----------
+        title : str
+            The title.
+
+        Returns
+        -------
+        list[SimpleNamespace]
+            The matches, with their ``movieID``.
+        """
+        response = self.session.get(f"{self.url}/cinemagoer/search",
+                                    params={'q': title})
+        response.raise_for_status()
+        return [SimpleNamespace(**match) for match in response.json()]
+
+    def get_movie(self, movie_id: str) -> dict[str, Any]:
+        """
+        Retrieve a film's metadata.
+
+        Parameters
+        ----------
+        movie_id : str
+            The film's IMDb identifier, without its ``tt`` prefix.
+
+        Returns
+        -------
+        dict[str, Any]
+            The metadata, keyed as by Cinemagoer.
+        """
+        response = self.session.get(f"{self.url}/cinemagoer/movie/{movie_id}")
+        response.raise_for_status()
+        return dict(response.json())
+
+
+# -- Operations --------------------------------------------------------------
+
+
+class _Clients:
+    """
+    The clients of a load test, configured for the stand-in server.
+    """
+
+    def __init__(self, url: str, cache_dir: str, concurrency: int) -> None:
+        self.url = url
+        self.pool: ClientPool[Any] = ClientPool(
+            lambda: StandInCinemagoer(url), size=min(concurrency, 32))
+        credentials = SharedClientCredentials(
+            os.path.join(cache_dir, "spotify-token"),
+            token_url=f"{url}/api/token",
+            client_id="load-test", client_secret="load-test")
+        self.spotify = spotipy.Spotify(
+            auth_manager=credentials, retries=0,
+            requests_session=resilient_session(max_connections=concurrency))
+        self.spotify.prefix = f"{url}/v1/"
+        self.wiki = MediaWikiBackend(f"{url}/w/api.php")
+
+
+def _imdb_id(clients: _Clients, i: int) -> None:
+    imdb_id = get_imdb_id(f"film {i}", base_url=clients.url)
+    if not (imdb_id or '').startswith('tt'):
+        raise LookupError(imdb_id)
+
+
+def _film_metadata(clients: _Clients, i: int) -> None:
+    film_df = get_film_metadata(f"film {i}", pool=clients.pool)
+    if film_df['imdbID'].isna().any():
+        raise LookupError(f"film {i} not found.")
+
+
+def _spotify_album(clients: _Clients, i: int) -> None:
+    spotify_album_retrieve(Album(f"album {i}", f"artist {i}"),
+                           clients.spotify)
+
+
+def _wiki_metadata(clients: _Clients, i: int) -> None:
+    wiki_metadata_retrieve(Book(f"Novel {i}"), backend=clients.wiki)
+
+
+#: Retrievals driven by load tests, by name. Each retrieves the ``i``-th
+#: work of the stand-in catalogue, raising if it fails.
+OPERATIONS: dict[str, Callable[[_Clients, int], None]] = {
+    'imdb_id': _imdb_id,
+    'film_metadata': _film_metadata,
+    'spotify_album': _spotify_album,
+    'wiki_metadata': _wiki_metadata,
+}
+
+
+# -- Load tests --------------------------------------------------------------
+
+
+def _peak_rss_mb() -> float | None:
+    """
+    Return the peak resident set size of the process, in megabytes.
+    """
+    if sys.platform == "win32":
+        return None
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, kilobytes elsewhere
+    return round(peak / 2**20 if sys.platform == "darwin" else peak / 2**10,
+                 1)
+
+
+def _summarize(
+    latencies: list[float],
+    errors: Counter[str],
+    elapsed: float
+) -> dict[str, Any]:
+    """
+    Summarize the calls of one or all operations.
+    """
+    calls = len(latencies)
+    n_errors = sum(errors.values())
+    percentiles = ([round(float(p) * 1000, 2)
+                    for p in np.percentile(latencies, [50, 90, 99])]
+                   if latencies else [None] * 3)
+    return {
+        'calls': calls,
+        'throughput_per_s': round(calls / elapsed, 2),
+        'errors': n_errors,
+        'error_rate': round(n_errors / calls, 4) if calls else None,
+        'error_types': dict(errors),
+        'latency_ms': {
+            'p50': percentiles[0], 'p90': percentiles[1],
+            'p99': percentiles[2],
+            'mean': (round(1000 * float(np.mean(latencies)), 2)
+                     if latencies else None),
+            'max': round(1000 * max(latencies), 2) if latencies else None,
+        },
+    }
+
+
+def run_load_test(
+    concurrency: int = 50,
+    duration: float = 10.0,
+    mix: dict[str, float] | None = None,
+    n_works: int = 1000,
+    latency: float = 0.01,
+    error_rate: float = 0.0,
+    seed: int = 0,
+    output: str | None = None
+) -> dict[str, Any]:
+    """
+    Drive a mix of retrievals against a stand-in server and report on them.
+
+    Each of ``concurrency`` threads repeatedly draws an operation of the mix
+    and a work of the catalogue at random and retrieves it, until
+    ``duration`` seconds have passed.
+
+    Parameters
+    ----------
+    concurrency : int, default=50
+        Number of concurrent retrievals.
+    duration : float, default=10.0
+        Seconds to keep starting retrievals.
+    mix : dict[str, float], default=None
+        Relative weights of the :data:`OPERATIONS` to draw. Defaults to all
+        of them equally.
+    n_works : int, default=1000
+        Number of works of each kind in the stand-in catalogue.
+    latency : float, default=0.01
+        Mean seconds the stand-in takes to respond.
+    error_rate : float, default=0.0
+        Fraction of requests the stand-in fails with 503.
+    seed : int, default=0
+        Seed of the draws and of the stand-in's latencies and errors.
+    output : str, default=None
+        Optional path of a JSON file to write the report to.
+
+    Returns
+    -------
+    dict[str, Any]
+        The report: the settings, calls, throughput (calls per second),
+        errors and error rate, latency percentiles (milliseconds) overall
+        and per operation, requests received by the stand-in, and peak
+        resident memory (megabytes).
+
+    Raises
+    ------
+    ValueError
+        If the mix names an unknown operation.
+
+    Examples
+    --------
+    >>> from datopy._loadtest import run_load_test
+
+    >>> report = run_load_test(concurrency=4, duration=0.5, n_works=20)
+    >>> sorted(report['operations'])
+    ['film_metadata', 'imdb_id', 'spotify_album', 'wiki_metadata']
+    >>> report['calls'] > 0, report['errors']
+    (True, 0)
+    """
+    mix = mix or dict.fromkeys(OPERATIONS, 1.0)
+    unknown = set(mix) - set(OPERATIONS)
+    if unknown:
+        raise ValueError(f"Unknown operations {sorted(unknown)}; choose "
+                         f"from {sorted(OPERATIONS)}.")
+    names, weights = list(mix), list(mix.values())
+
+    latencies: dict[str, list[float]] = {name: [] for name in names}
+    errors: dict[str, Counter[str]] = {name: Counter() for name in names}
+    lock = threading.Lock()
+    rss_before = _peak_rss_mb()
+
+    with StandInServer(n_works, latency, error_rate, seed=seed) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        clients = _Clients(server.url, cache_dir, concurrency)
+
+        def worker(index: int) -> None:
+            rng = random.Random(seed * 10_000 + index)
+            while time.monotonic() < end:
+                name = rng.choices(names, weights)[0]
+                start = time.monotonic()
+                try:
+                    OPERATIONS[name](clients, rng.randrange(n_works))
+                    error = None
+                except Exception as err:
+                    error = type(err).__name__
+                elapsed = time.monotonic() - start
+                with lock:
+                    latencies[name].append(elapsed)
+                    if error is not None:
+                        errors[name][error] += 1
+
+        started = datetime.datetime.now(datetime.timezone.utc)
+        start = time.monotonic()
+        end = start + duration
+        with ThreadPoolExecutor(concurrency) as executor:
+            for future in [executor.submit(worker, index)
+                           for index in range(concurrency)]:
+                future.result()
+        elapsed = time.monotonic() - start
+        server_requests = server.requests
+
+    report = {
+        'settings': {
+            'concurrency': concurrency, 'duration': duration, 'mix': mix,
+            'n_works': n_works, 'latency': latency,
+            'error_rate': error_rate, 'seed': seed,
+        },
+        'started': started.isoformat(timespec='seconds'),
+        'elapsed_s': round(elapsed, 3),
+        **_summarize([value for name in names for value in latencies[name]],
+                     sum(errors.values(), Counter()), elapsed),
+        'operations': {name: _summarize(latencies[name], errors[name],
+                                        elapsed)
+                       for name in names},
+        'server_requests': server_requests,
+        'peak_rss_mb': _peak_rss_mb(),
+        'peak_rss_before_mb': rss_before,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+    }
+    if output is not None:
+        with open(output, 'w') as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+def main(argv: list[str] | None = None) -> None:
+    """
+    Run a load test from the command line.
+
+    Parameters
+    ----------
+    argv : list[str], default=None
+        The arguments. Defaults to the script's.
+    """
+    parser = argparse.ArgumentParser(
+        description="Load test the retrieval routines against stand-ins.")
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--mix', default=','.join(OPERATIONS),
+                        help="operations, with optional weights, e.g. "
+                             "'imdb_id=2,spotify_album=1'")
+    parser.add_argument('--works', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0.01)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default="load-test.json")
+    args = parser.parse_args(argv)
+
+    mix = {}
+    for item in args.mix.split(','):
+        name, _, weight = item.partition('=')
+        mix[name.strip()] = float(weight or 1)
+    report = run_load_test(args.concurrency, args.duration, mix, args.works,
+                           args.latency, args.error_rate, args.seed,
+                           args.output)
+    print(f"{report['calls']} calls at {report['throughput_per_s']}/s, "
+          f"p50 {report['latency_ms']['p50']:.1f} ms, "
+          f"p99 {report['latency_ms']['p99']:.1f} ms, "
+          f"{report['errors']} errors; written to {args.output}")
+
+
+if __name__ == "__main__":
+    # Validate the docstrings with --validate; otherwise run a load test
+    if '--validate' in sys.argv:
+        numpydoc_validate_module(sys.modules['__main__'])
+    else:
+        main()
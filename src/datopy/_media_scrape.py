@@ -10,26 +10,41 @@ Included routines cover:
 - Related topics (via Wikipedia)
 """
 
+import os
 import re
 import sys
 import json
 import pprint
 import doctest
+import functools
 import requests
 import textwrap
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ThreadPoolExecutor, wait,
+)
 import pandas as pd
-from typing import List
+from typing import Any, Iterable, Iterator, NamedTuple, Protocol
 from jsonschema import validate
 from pydantic import BaseModel, ValidationError
 
 import imdb
 import wptools
 import spotipy
-from imdb import Cinemagoer
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
 from spotipy.oauth2 import SpotifyClientCredentials
 
+from datopy.etl import normalize_title
 from datopy.inspection import display
+from datopy._cache import negative_cache, query_key, single_flight
+from datopy._clients import ClientPool, cinemagoer_pool
+from datopy._http import (
+    AdaptiveLimiter, DeadlineExceeded, Hedger, carry_deadline,
+    default_hedger, expiry, http_cache, resilient_session,
+)
+from datopy._imdb_datasets import (
+    IMDbMetadataStore, IMDbTitleIndex, default_metadata_store,
+    default_title_index,
+)
 from datopy.workflow import doctest_function
 from datopy.util._numpydoc_validate import numpydoc_validate_module
 
@@ -46,6 +61,271 @@ from datopy.util._numpydoc_validate import numpydoc_validate_module
 # pprint.pp(wiki_info)
 # wiki_info['currency']
 
+WIKI_API_URL = "https://en.wikipedia.org/w/api.php"
+
+
+class WikiPage(NamedTuple):
+    """
+    The outcome of looking up one title on Wikipedia.
+    """
+    title: str
+    page_title: str | None
+    redirected_from: str | None
+    missing: bool
+    infobox: dict[str, Any] | None
+
+
+class WikiBackend(Protocol):
+    """
+    Interface of the Wikipedia backends used by :func:`get_wiki_infoboxes`.
+    """
+
+    def fetch(self, titles: Iterable[str]) -> dict[str, WikiPage]:
+        """
+        Look up the infoboxes of the supplied titles.
+        """
+        ...
+
+
+class MediaWikiBackend:
+    r"""
+    Retrieve infoboxes in batches from the MediaWiki API.
+
+    Each API call requests the current revision of up to ``batch_size``
+    titles, following redirects, and the infoboxes are parsed locally from
+    the wikitext into the dictionaries :mod:`wptools` produces.
+
+    Parameters
+    ----------
+    api_url : str, default=WIKI_API_URL
+        The ``api.php`` endpoint of the wiki (e.g. a local stand-in).
+    batch_size : int, default=50
+        Titles per API call (50 is the API's limit for most clients).
+    timeout : float, default=10
+        Seconds to wait for each API call.
+
+    Examples
+    --------
+    >>> from datopy._media_scrape import _parse_infobox
+    >>> wikitext = '''
+    ... {{Short description|1960 novel by Harper Lee}}
+    ... {{Infobox book <!-- See [[Wikipedia:WikiProject Novels]] -->
+    ... | name    = To Kill a Mockingbird
+    ... | author  = [[Harper Lee]]
+    ... | genre   = [[Southern Gothic]]<ref>{{cite web|url=x}}</ref>
+    ... | pages   = 281
+    ... | isbn    =
+    ... }}
+    ... '''
+    >>> for key, value in _parse_infobox(wikitext).items():
+    ...     print(f"{key}: {value}")
+    infobox: Infobox book
+    name: To Kill a Mockingbird
+    author: [[Harper Lee]]
+    genre: [[Southern Gothic]]
+    pages: 281
+    """
+
+    def __init__(
+        self,
+        api_url: str = WIKI_API_URL,
+        batch_size: int = 50,
+        timeout: float = 10
+    ):
+        self.api_url = api_url
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.session = resilient_session(timeout=timeout)
+        self.session.headers.update(
+            {'User-Agent': "datopy (https://github.com/bainmatt/datopy)"})
+
+    def _query(self, titles: list[str]) -> dict[str, Any]:
+        """
+        Request the current wikitext of up to ``batch_size`` titles.
+        """
+        response = self.session.get(self.api_url, params={
+            'action': 'query', 'format': 'json', 'formatversion': 2,
+            'prop': 'revisions', 'rvprop': 'content', 'rvslots': 'main',
+            'redirects': 1, 'titles': '|'.join(titles),
+        }, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()['query']
+
+    def fetch(self, titles: Iterable[str]) -> dict[str, WikiPage]:
+        """
+        Look up the infoboxes of the supplied titles.
+
+        Parameters
+        ----------
+        titles : Iterable[str]
+            Page titles (redirects are followed).
+
+        Returns
+        -------
+        dict[str, WikiPage]
+            The outcome for each distinct title.
+        """
+        pages = {}
+        titles = list(dict.fromkeys(titles))
+        for start in range(0, len(titles), self.batch_size):
+            batch = titles[start:start + self.batch_size]
+            query = self._query(batch)
+            normalized = {item['from']: item['to']
+                          for item in query.get('normalized', [])}
+            redirects = {item['from']: item['to']
+                         for item in query.get('redirects', [])}
+            results = {page['title']: page for page in query.get('pages', [])}
+
+            for title in batch:
+                name = normalized.get(title, title)
+                target = redirects.get(name, name)
+                page = results.get(target, {'missing': True})
+                missing = bool(page.get('missing') or page.get('invalid'))
+                wikitext = (None if missing else page['revisions'][0]
+                            ['slots']['main']['content'])
+                pages[title] = WikiPage(
+                    title=title,
+                    page_title=None if missing else page['title'],
+                    redirected_from=name if name in redirects else None,
+                    missing=missing,
+                    infobox=None if missing else _parse_infobox(wikitext),
+                )
+        return pages
+
+
+class WptoolsBackend:
+    """
+    Retrieve infoboxes one page at a time with :mod:`wptools`.
+    """
+
+    def fetch(self, titles: Iterable[str]) -> dict[str, WikiPage]:
+        """
+        Look up the infoboxes of the supplied titles.
+
+        Parameters
+        ----------
+        titles : Iterable[str]
+            Page titles.
+
+        Returns
+        -------
+        dict[str, WikiPage]
+            The outcome for each distinct title.
+        """
+        pages = {}
+        for title in dict.fromkeys(titles):
+            try:
+                data = wptools.page(title, silent=True).get_parse().data
+            except LookupError:
+                pages[title] = WikiPage(title, None, None, True, None)
+                continue
+            pages[title] = WikiPage(title, data.get('title'), None, False,
+                                    data.get('infobox'))
+        return pages
+
+
+@functools.lru_cache(maxsize=1)
+def wiki_backend() -> WikiBackend:
+    """
+    Return the shared Wikipedia backend.
+
+    Returns
+    -------
+    WikiBackend
+        A :class:`MediaWikiBackend` for the ``api.php`` endpoint in the
+        ``WIKI_API_URL`` environment variable, or English Wikipedia.
+    """
+    return MediaWikiBackend(os.getenv("WIKI_API_URL", WIKI_API_URL))
+
+
+def get_wiki_infoboxes(
+    titles: Iterable[str],
+    backend: WikiBackend | None = None
+) -> dict[str, WikiPage]:
+    """
+    Retrieve the Wikipedia infoboxes of many titles.
+
+    Parameters
+    ----------
+    titles : Iterable[str]
+        Page titles (redirects are followed).
+    backend : WikiBackend, default=None
+        The backend to query. Defaults to :func:`wiki_backend`.
+
+    Returns
+    -------
+    dict[str, WikiPage]
+        For each distinct title, the page found (if any), the title it was
+        redirected from, whether it is missing, and its infobox (None if the
+        page has none).
+    """
+    return (backend or wiki_backend()).fetch(titles)
+
+
+# Pieces of wikitext that never belong to infobox values
+_WIKI_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_WIKI_REF = re.compile(r"<ref[^>/]*/>|<ref[^>]*>.*?</ref>",
+                       re.DOTALL | re.IGNORECASE)
+
+
+def _split_template(body: str) -> list[str]:
+    """
+    Split a template's body on the pipes outside nested templates and links.
+    """
+    parts, depth, start = [], 0, 0
+    i = 0
+    while i < len(body):
+        pair = body[i:i + 2]
+        if pair in ("{{", "[["):
+            depth += 1
+            i += 2
+        elif pair in ("}}", "]]"):
+            depth -= 1
+            i += 2
+        else:
+            if body[i] == "|" and depth == 0:
+                parts.append(body[start:i])
+                start = i + 1
+            i += 1
+    parts.append(body[start:])
+    return parts
+
+
+def _templates(wikitext: str) -> Iterator[str]:
+    """
+    Yield the body of every template, outermost first, in document order.
+    """
+    stack = []
+    spans = []
+    for match in re.finditer(r"\{\{|\}\}", wikitext):
+        if match.group() == "{{":
+            stack.append(match.end())
+        elif stack:
+            spans.append((stack.pop(), match.start()))
+    for start, end in sorted(spans):
+        yield wikitext[start:end]
+
+
+def _parse_infobox(wikitext: str, boxterm: str = "box") -> dict[str, Any] | None:
+    """
+    Parse the first template whose name contains ``boxterm`` into a dict of
+    named parameters, as :func:`wptools.utils.get_infobox` does.
+    """
+    wikitext = _WIKI_COMMENT.sub("", wikitext)
+    for body in _templates(wikitext):
+        title, *parts = _split_template(body)
+        if boxterm not in title:
+            continue
+        infobox = {'infobox': title.strip()}
+        for part in parts:
+            name, equals, value = part.partition("=")
+            value = _WIKI_REF.sub("", value).strip()
+            if equals and name.strip() and value:
+                infobox[name.strip()] = value
+        if len(infobox) > 1:
+            return infobox
+    return None
+
 
 # -- Spotify -----------------------------------------------------------------
 
@@ -56,15 +336,177 @@ from datopy.util._numpydoc_validate import numpydoc_validate_module
 
 # TODO: get_imdb
 
+IMDB_URL = "https://www.imdb.com"
+
+# Browser-like headers sent with requests to IMDb
+IMDB_HEADERS = {
+    'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
+                   'AppleWebKit/537.36 (KHTML, like Gecko) '
+                   'Chrome/91.0.4472.124 Safari/537.36')
+}
+
+
+def imdb_session(
+    max_connections: int = 10,
+    limiter: AdaptiveLimiter | None = None,
+    hedger: Hedger | None = None
+) -> requests.Session:
+    """
+    Create a keep-alive session for IMDb with a pool of connections.
+
+    Requests are rate limited, retried, and circuit broken per host (see
+    :mod:`datopy._http`), and pages are kept in the shared
+    :func:`~datopy._http.http_cache`, if enabled, to be revalidated rather
+    than downloaded again.
+
+    Parameters
+    ----------
+    max_connections : int, default=10
+        Number of connections kept open per host.
+    limiter : AdaptiveLimiter, default=None
+        Optional adaptive limit on the requests in flight.
+    hedger : Hedger, default=None
+        Optional hedging of slow requests. Defaults to the shared
+        :func:`~datopy._http.default_hedger`, if hedging is enabled.
+
+    Returns
+    -------
+    requests.Session
+        A session sending :data:`IMDB_HEADERS`.
+    """
+    session = resilient_session(max_connections=max_connections,
+                                limiter=limiter,
+                                hedger=hedger or default_hedger(),
+                                cache=http_cache())
+    session.headers.update(IMDB_HEADERS)
+    return session
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_imdb_session() -> requests.Session:
+    """
+    Return the session shared by single IMDb searches.
+    """
+    return imdb_session()
+
+
+def _search_imdb_id(
+    session: requests.Session,
+    movie_title: str,
+    timeout: float,
+    base_url: str
+) -> str | None:
+    """
+    Return the first tt identifier linked from IMDb's search results.
+
+    Searches are coalesced and remembered as misses by normalized title, so
+    the normalized title is searched: every caller sharing a search gets the
+    answer to its own query.
+    """
+    search_response = session.get(
+        f"{base_url}/find", params={'q': normalize_title(movie_title)},
+        headers=IMDB_HEADERS, timeout=timeout)
+    search_response.raise_for_status()
+    return _first_title_id(search_response.content)
+
+
+# Search and review pages run to hundreds of kilobytes, of which we read a
+# link or a few divs. Rather than building the whole tree, scan for the first
+# title link and parse only the review divs (with lxml, if installed).
+
+try:
+    import lxml  # noqa: F401
+    _HTML_PARSER = 'lxml'
+except ImportError:
+    _HTML_PARSER = 'html.parser'
+
+# An anchor whose href contains a title page path, e.g. /title/tt0111161/
+_TITLE_LINK = re.compile(
+    rb"""<a\s(?:[^>]*?\s)?href\s*=\s*["']?[^"'\s>]*?/title/(tt\d+)""",
+    re.IGNORECASE)
+
+_REVIEW_CLASS = 'text show-more__control'
+
+# Reviews, and the holder of the key to the next page of reviews
+_REVIEW_PAGE = SoupStrainer('div', class_=[_REVIEW_CLASS, 'load-more-data'])
 
-def get_imdb_id(movie_title: str) -> str | None:
+
+def _first_title_id(html: bytes) -> str | None:
+    """
+    Return the tt identifier of the first title link in a page, stopping
+    the scan at the first match.
+    """
+    match = _TITLE_LINK.search(html)
+    return match.group(1).decode() if match else None
+
+
+def _parse_review_page(html: str | bytes) -> tuple[list[str], str | None]:
+    """
+    Return the text of the reviews in a page and the next page's key,
+    building only the divs holding them.
+    """
+    soup = BeautifulSoup(html, _HTML_PARSER, parse_only=_REVIEW_PAGE)
+    reviews = [review.text.strip()
+               for review in soup.find_all('div', class_=_REVIEW_CLASS)]
+    load_more = soup.find('div', class_='load-more-data',
+                          attrs={'data-key': True})
+    return reviews, (str(load_more['data-key']) if load_more else None)
+
+
+def _fetch_review_page(
+    session: requests.Session,
+    movie_id: str,
+    key: str | None,
+    timeout: float,
+    base_url: str
+) -> tuple[list[str], str | None]:
+    """
+    Fetch and parse the first page of a title's reviews, or the page ``key``.
+    """
+    if key is None:
+        url, params = f"{base_url}/title/{movie_id}/reviews", None
+    else:
+        url = f"{base_url}/title/{movie_id}/reviews/_ajax"
+        params = {'paginationKey': key}
+    response = session.get(url, params=params, timeout=timeout)
+    response.raise_for_status()
+    return _parse_review_page(response.content)
+
+
+def get_imdb_id(
+    movie_title: str,
+    index: IMDbTitleIndex | None = None,
+    min_score: float | None = None,
+    timeout: float = 10,
+    base_url: str = IMDB_URL
+) -> str | None:
     """
     Retrieve the unique IMDb identifier associated with a film or tv show.
 
+    A local title index is consulted first; IMDb's online search is only
+    used for titles the index does not contain exactly. Titles the search
+    finds no match for may then be corrected to a similar indexed title
+    (see ``min_score``). Titles the search found no
+    match for are remembered for a while (see
+    :func:`~datopy._cache.negative_cache`) and not searched again, and
+    concurrent searches for the same title share one request (see
+    :func:`~datopy._cache.single_flight`).
+
     Parameters
     ----------
     movie_title : str
         Title of film or tv show (sensitive to spelling but not case).
+    index : IMDbTitleIndex, default=None
+        An offline title index (see :mod:`datopy._imdb_datasets`).
+        Defaults to the index at ``IMDB_INDEX_DIR``, if one is configured.
+    min_score : float, default=None
+        Minimum similarity for correcting a title that IMDb's search found
+        no match for with the index's fuzzy matcher, if it has one. None
+        disables correction, so that only exact matches resolve locally.
+    timeout : float, default=10
+        Seconds to wait for IMDb to respond.
+    base_url : str, default=IMDB_URL
+        Root URL of the IMDb site to search.
 
     Returns
     -------
@@ -90,49 +532,238 @@ def get_imdb_id(movie_title: str) -> str | None:
         "No IMDb Identifier found for 'ths shukshank redumption'."
     """
 
-    base_url = "https://www.imdb.com"
-    search_url = f"{base_url}/find?q={movie_title}"
-    headers = {
-        'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                       'AppleWebKit/537.36 (KHTML, like Gecko) '
-                       'Chrome/91.0.4472.124 Safari/537.36')
-    }
+    index = index or default_title_index()
+    if index is not None:
+        imdb_id = index.lookup(movie_title)
+        if imdb_id is not None:
+            return imdb_id
 
-    try:
-        search_response = requests.get(search_url, headers=headers)
-        search_response.raise_for_status()
-    except requests.exceptions.HTTPError as err:
-        print(f"HTTP error occurred: {err}")
+    misses = negative_cache()
+    if misses.contains('imdb_id', movie_title, base_url):
+        imdb_id = None
+    else:
+        try:
+            imdb_id = single_flight().do(
+                ('imdb_id', query_key(movie_title), base_url),
+                _search_imdb_id, _shared_imdb_session(), movie_title,
+                timeout, base_url)
+        except requests.exceptions.RequestException as err:
+            print(f"HTTP error occurred: {err}")
+            return None
+        if imdb_id is None:
+            misses.add('imdb_id', movie_title, base_url)
+
+    if imdb_id is None:
+        imdb_id = _correct_imdb_id(index, movie_title, min_score)
+    if imdb_id is None:
+        return f"No IMDb Identifier found for '{movie_title}'."
+    return imdb_id
+
+
+def _correct_imdb_id(
+    index: IMDbTitleIndex | None,
+    title: str,
+    min_score: float | None
+) -> str | None:
+    """
+    Look up the most similar indexed title, for a title IMDb's search found
+    no match for, if correction is enabled.
+    """
+    if index is None or min_score is None:
         return None
+    return index.lookup(title, min_score=min_score)
 
-    soup = BeautifulSoup(search_response.content, 'html.parser')
-    result_links = soup.find_all('a', href=True)
 
-    for link in result_links:
-        # Return first link containing ttid
-        if '/title/tt' in link['href']:
-            imdb_id = link['href'].split('/title/')[1].split('/')[0]
-            return imdb_id
+def get_imdb_ids(
+    movie_titles: Iterable[str],
+    **kwargs
+) -> dict[str, str | None]:
+    """
+    Retrieve the IMDb identifiers of many films or tv shows concurrently.
 
-    # If no links contain ttid
-    return f"No IMDb Identifier found for '{movie_title}'."
+    Parameters
+    ----------
+    movie_titles : Iterable[str]
+        Titles of films or tv shows (sensitive to spelling but not case).
+    **kwargs
+        Options passed to :func:`iter_imdb_ids`.
+
+    Returns
+    -------
+    dict[str, str | None]
+        Each distinct title mapped to its IMDb tt identifier, or to None if
+        none was found or the search failed.
+
+    Raises
+    ------
+    DeadlineExceeded
+        If the searches exceed their ``deadline``. Its ``timed_out`` lists
+        the titles not searched in time, and ``completed`` maps the others.
+
+    Examples
+    --------
+    .. code-block:: python doctest
+    .. doctest::
+        :skipif: skip_slow
 
+        >>> from datopy._media_scrape import get_imdb_ids
+        >>> titles = ["the shawshank redemption", "finding nemo"]
+        >>> get_imdb_ids(titles, max_workers=2)  # doctest: +SKIP
+        {'the shawshank redemption': 'tt0111161', 'finding nemo': 'tt0266543'}
+    """
+    imdb_ids: dict[str, str | None] = {}
+    try:
+        for title, imdb_id in iter_imdb_ids(movie_titles, **kwargs):
+            imdb_ids[title] = imdb_id
+    except DeadlineExceeded as err:
+        err.completed = imdb_ids
+        raise
+    return imdb_ids
+
+
+def iter_imdb_ids(
+    movie_titles: Iterable[str],
+    max_workers: int = 8,
+    index: IMDbTitleIndex | None = None,
+    min_score: float | None = None,
+    timeout: float = 10,
+    base_url: str = IMDB_URL,
+    limiter: AdaptiveLimiter | None = None,
+    deadline: float | None = None
+) -> Iterator[tuple[str, str | None]]:
+    """
+    Yield ``(title, tt_id)`` pairs as concurrent IMDb searches complete.
+
+    Titles found in the local title index, or recently found to have no
+    match (see :func:`~datopy._cache.negative_cache`), are yielded first.
+    The rest are searched by at most ``max_workers`` threads sharing one keep-alive
+    session; only a bounded window of searches is queued at a time, and
+    closing the iterator cancels those not yet started.
 
-def get_imdb_reviews(movie_id: str, num_reviews: int = 5) -> List[str] | None:
+    Parameters
+    ----------
+    movie_titles : Iterable[str]
+        Titles of films or tv shows. Repeated titles are searched once.
+    max_workers : int, default=8
+        Maximum number of concurrent searches (and pooled connections).
+    index : IMDbTitleIndex, default=None
+        An offline title index, as for :func:`get_imdb_id`.
+    min_score : float, default=None
+        Minimum similarity for correcting a title IMDb's search found no
+        match for with the index, as for :func:`get_imdb_id`.
+    timeout : float, default=10
+        Seconds to wait for IMDb to respond to each search.
+    base_url : str, default=IMDB_URL
+        Root URL of the IMDb site to search.
+    limiter : AdaptiveLimiter, default=None
+        Optional limit on the searches in flight, raised while IMDb responds
+        promptly and lowered when it throttles or slows down. ``max_workers``
+        caps it.
+    deadline : float, default=None
+        Seconds within which every search must complete, capped by any
+        enclosing :func:`~datopy._http.deadline`. Searches still running are
+        cut short when it expires.
+
+    Yields
+    ------
+    tuple[str, str | None]
+        A title and its IMDb tt identifier, or None if none was found or the
+        search failed.
+
+    Raises
+    ------
+    DeadlineExceeded
+        After the searches completed in time are yielded, if the deadline
+        expired. Its ``timed_out`` lists the titles not searched in time.
+    """
+    titles = iter(dict.fromkeys(movie_titles))
+    index = index or default_title_index()
+    misses = negative_cache()
+    expires = expiry(deadline)
+    timed_out = []
+
+    def search(title):
+        try:
+            imdb_id = single_flight().do(
+                ('imdb_id', query_key(title), base_url), _search_imdb_id,
+                session, title, timeout, base_url)
+        except requests.exceptions.RequestException:
+            return title, None
+        if imdb_id is None:
+            misses.add('imdb_id', title, base_url)
+            imdb_id = _correct_imdb_id(index, title, min_score)
+        return title, imdb_id
+
+    # Worker threads do not inherit the caller's deadline
+    search = carry_deadline(search, expires)
+
+    with imdb_session(max_workers, limiter) as session, \
+            ThreadPoolExecutor(max_workers) as executor:
+        pending: dict[Future, str] = {}
+        try:
+            while True:
+                # Keep the workers busy without queueing every title
+                for title in titles:
+                    imdb_id = (index.lookup(title)
+                               if index is not None else None)
+                    if imdb_id is not None:
+                        yield title, imdb_id
+                        continue
+                    if misses.contains('imdb_id', title, base_url):
+                        yield title, _correct_imdb_id(index, title,
+                                                      min_score)
+                        continue
+                    pending[executor.submit(search, title)] = title
+                    if len(pending) >= 2 * max_workers:
+                        break
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    title = pending.pop(future)
+                    try:
+                        yield future.result()
+                    except DeadlineExceeded:
+                        timed_out.append(title)
+        finally:
+            for future in pending:
+                future.cancel()
+
+    if timed_out:
+        raise DeadlineExceeded(
+            f"{len(timed_out)} IMDb searches exceeded the deadline.",
+            timed_out=timed_out)
+
+
+def get_imdb_reviews(
+    movie_id: str,
+    num_reviews: int | None = 5,
+    timeout: float = 10,
+    base_url: str = IMDB_URL
+) -> Iterator[str]:
     r"""
-    _summary_.
+    Stream a title's reviews, following IMDb's pagination.
+
+    Reviews are yielded as each page is parsed. The next page is fetched in
+    the background while the current one is consumed, and nothing more is
+    fetched once ``num_reviews`` is reached or the generator is closed, so
+    memory is bounded by two pages whatever the number of reviews.
 
     Parameters
     ----------
     movie_id : str
         The unique IMDb tt identifier supplied by `get_imdb_id`.
-    num_reviews : int, default=5
-        Number of reviews to retrieve.
-
-    Returns
-    -------
-    List[str]
-        The retrieved reviews.
+    num_reviews : int | None, default=5
+        Number of reviews to retrieve. None retrieves every review.
+    timeout : float, default=10
+        Seconds to wait for IMDb to respond to each page request.
+    base_url : str, default=IMDB_URL
+        Root URL of the IMDb site.
+
+    Yields
+    ------
+    str
+        The text of each review, in IMDb's order.
 
     Examples
     --------
@@ -156,31 +787,44 @@ def get_imdb_reviews(movie_id: str, num_reviews: int = 5) -> List[str] | None:
         <BLANKLINE>
     """
 
-    base_url = f"https://www.imdb.com/title/{movie_id}/reviews"
-    headers = {
-        'User-Agent': ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) '
-                       'AppleWebKit/537.36 (KHTML, like Gecko) '
-                       'Chrome/91.0.4472.124 Safari/537.36')
-    }
-    response = requests.get(base_url, headers=headers)
+    remaining = float('inf') if num_reviews is None else num_reviews
+    session = imdb_session(1)
+    executor = ThreadPoolExecutor(1)
 
-    if response.status_code == 200:
-        soup = BeautifulSoup(response.text, 'html.parser')
-        review_containers = soup.find_all('div',
-                                          class_='text show-more__control')
+    def fetch(key):
+        return executor.submit(carry_deadline(_fetch_review_page), session,
+                               movie_id, key, timeout, base_url)
 
-        reviews = []
-        for review_container in review_containers[:num_reviews]:
-            review_text = review_container.text.strip()
-            reviews.append(review_text)
-
-        return reviews
-    else:
-        print(f"Failed to retrieve reviews. Status code: {response.status_code}")
-        return None
-
-
-def get_film_metadata(movie_title: str) -> pd.DataFrame:
+    page: Future | None = fetch(None) if remaining > 0 else None
+    try:
+        while page is not None:
+            try:
+                reviews, key = page.result()
+            except requests.exceptions.RequestException as err:
+                print(f"Failed to retrieve reviews. {err}")
+                return
+
+            reviews = reviews[:int(min(remaining, len(reviews)))]
+            remaining -= len(reviews)
+
+            # Prefetch the next page while this one is consumed
+            more = reviews and key is not None and remaining > 0
+            page = fetch(key) if more else None
+            yield from reviews
+    finally:
+        # Drop any prefetched page without waiting for it
+        if page is not None:
+            page.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        session.close()
+
+
+def get_film_metadata(
+    movie_title: str,
+    store: IMDbMetadataStore | None = None,
+    min_score: float | None = None,
+    pool: ClientPool[imdb.Cinemagoer] | None = None
+) -> pd.DataFrame:
     r"""
     _summary_.
 
@@ -188,6 +832,17 @@ def get_film_metadata(movie_title: str) -> pd.DataFrame:
     ----------
     movie_title : str
         Title of a film or tv show (sensitive to spelling but not case).
+    store : IMDbMetadataStore, default=None
+        An offline metadata store (see :mod:`datopy._imdb_datasets`),
+        consulted before IMDb's online search. Defaults to the store at
+        ``IMDB_STORE_DIR``, if one is configured.
+    min_score : float, default=None
+        Minimum similarity for correcting a title that IMDb's search found
+        no match for with the store's fuzzy matcher, if it has one. None
+        disables correction, so that only exact matches resolve locally.
+    pool : ClientPool[Cinemagoer], default=None
+        The pool of IMDb clients to search with. Defaults to the shared
+        :func:`~datopy._clients.cinemagoer_pool`.
 
     Returns
     -------
@@ -230,16 +885,21 @@ def get_film_metadata(movie_title: str) -> pd.DataFrame:
                     'composers', 'cast', 'rating', 'votes',
                     'plot outline', 'plot', 'synopsis']
 
-    # Create an IMDb object
-    ia = Cinemagoer()
+    # Prefer the offline store; search IMDb for titles it doesn't have
+    store = store or default_metadata_store()
+    if store is not None:
+        film_df = store.film_metadata([movie_title])
+        if film_df['imdbID'].notna().all():
+            return film_df
 
-    # Search for the movie by title
-    movies = ia.search_movie(movie_title)
+    # Borrow a shared IMDb client and search for the movie by title
+    with (pool or cinemagoer_pool()).client() as ia:
+        movies = ia.search_movie(movie_title)
+        if movies:
+            # Get the first movie (assumed to be the correct one)
+            movie = ia.get_movie(movies[0].movieID)
 
     if movies:
-        # Get the first movie (assumed to be the correct one)
-        movie = ia.get_movie(movies[0].movieID)
-
         # Extract movie attributes
         # TODO Identify and consider generalizability of extraction patterns
         movie_data = {
@@ -280,12 +940,18 @@ def get_film_metadata(movie_title: str) -> pd.DataFrame:
         # Create a DataFrame
         film_df = pd.DataFrame([movie_data])
         return film_df
-    else:
-        print(f"{movie_title} not found.")
-        film_df = pd.DataFrame(
-            [{movie_field: None for movie_field in movie_fields}]
-        )
-        return film_df
+
+    # Correct a misspelled title to the most similar one in the store
+    if store is not None and min_score is not None:
+        film_df = store.film_metadata([movie_title], min_score=min_score)
+        if film_df['imdbID'].notna().all():
+            return film_df
+
+    print(f"{movie_title} not found.")
+    film_df = pd.DataFrame(
+        [{movie_field: None for movie_field in movie_fields}]
+    )
+    return film_df
 
 
 if __name__ == "__main__":
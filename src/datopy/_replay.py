@@ -0,0 +1,468 @@
+"""
+Record and replay of HTTP traffic, for testing and benchmarking the scraping
+routines offline.
+
+.. warning:: The contents of this module will be moved in a future release.
+
+A :class:`Cassette` is an archive of the responses to the requests made
+while it was recording. Within :func:`use_cassette`, every transport used by
+the scrapers is intercepted: :mod:`requests` (and so the resilient sessions,
+the MediaWiki backend, and the Spotify client), :mod:`urllib` openers (used
+by Cinemagoer), and :mod:`wptools`' curl requests. Recorded responses are
+then served back deterministically, without network access, after an
+optional injected latency.
+
+.. rubric:: Record and replay
+
+.. autosummary::
+    :toctree: generated/
+
+    use_cassette
+    Cassette
+    UnrecordedRequest
+"""
+
+import io
+import os
+import sys
+import gzip
+import json
+import time
+import base64
+import hashlib
+import threading
+import contextlib
+import http.client
+import urllib.error
+import urllib.request
+import urllib.response
+from typing import Any, Callable, Iterator, Literal, NamedTuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+from wptools.request import WPToolsRequest
+
+from datopy.util._numpydoc_validate import numpydoc_validate_module
+
+
+Mode = Literal['record', 'replay', 'auto']
+
+# Describe the recorded body, which is stored decoded
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding'}
+
+
+class UnrecordedRequest(requests.exceptions.ConnectionError):
+    """
+    Raised when replaying a request the cassette has no response to.
+    """
+
+
+class CassetteStats(NamedTuple):
+    """
+    Usage counters of a :class:`Cassette`.
+    """
+    recorded: int
+    replayed: int
+
+
+def _key(method: str, url: str, body: bytes | str | None) -> str:
+    """
+    Identify a request by its method, URL (with sorted query parameters),
+    and a digest of its body.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    key = f"{method.upper()} {urlunsplit(parts._replace(query=query))}"
+    if body:
+        if isinstance(body, str):
+            body = body.encode()
+        key += f" {hashlib.sha256(body).hexdigest()[:16]}"
+    return key
+
+
+def _open(path: str, mode: str, gzipped: bool) -> Any:
+    if gzipped:
+        return gzip.open(path, mode, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+def _encode(content: bytes) -> dict[str, str]:
+    try:
+        return {'body': content.decode('utf-8'), 'encoding': 'utf-8'}
+    except UnicodeDecodeError:
+        return {'body': base64.b64encode(content).decode('ascii'),
+                'encoding': 'base64'}
+
+
+def _decode(record: dict[str, Any]) -> bytes:
+    if record['encoding'] == 'base64':
+        return base64.b64decode(record['body'])
+    return str(record['body']).encode('utf-8')
+
+
+def _record(
+    status: int,
+    reason: str,
+    url: str,
+    headers: dict[str, str],
+    content: bytes,
+    elapsed: float
+) -> dict[str, Any]:
+    """
+    Describe a response in a cassette.
+    """
+    return {
+        'status': status, 'reason': reason, 'url': url,
+        'headers': {name: value for name, value in headers.items()
+                    if name.lower() not in _DROPPED_HEADERS},
+        'elapsed': round(elapsed, 4),
+        **_encode(content),
+    }
+
+
+class Cassette:
+    """
+    Thread-safe archive of recorded HTTP responses.
+
+    Requests are matched by method, URL (regardless of the order of query
+    parameters), and body. A request recorded several times is answered
+    with its responses in the recorded order, the last one repeating.
+
+    Parameters
+    ----------
+    path : str
+        The archive, a JSON file, gzipped if named ``*.gz``.
+    mode : {'replay', 'record', 'auto'}, default='replay'
+        ``'replay'`` only serves recorded responses, ``'record'`` sends
+        every request and records its response afresh, and ``'auto'``
+        replays recorded requests and records the others.
+    latency : float | 'recorded', default=0.0
+        Seconds to wait before serving each replayed response, or
+        ``'recorded'`` to wait as long as the recorded request took.
+
+    Examples
+    --------
+    >>> import os, tempfile
+    >>> import requests
+    >>> from datopy._replay import Cassette, use_cassette
+
+    >>> path = os.path.join(tempfile.mkdtemp(), 'example.json.gz')
+    >>> cassette = Cassette(path, mode='record')
+    >>> cassette.add('GET', 'https://example.org/?b=2&a=1', b'hello')
+    >>> cassette.save()
+
+    >>> with use_cassette(path, latency=0.01) as replay:
+    ...     requests.get('https://example.org/', params={'a': 1, 'b': 2}).text
+    'hello'
+    >>> replay.stats
+    CassetteStats(recorded=0, replayed=1)
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: Mode = 'replay',
+        latency: float | Literal['recorded'] = 0.0
+    ) -> None:
+        if mode not in ('record', 'replay', 'auto'):
+            raise ValueError(f"Unknown cassette mode {mode!r}.")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self._lock = threading.Lock()
+        self._interactions: dict[str, list[dict[str, Any]]] = {}
+        self._played: dict[str, int] = {}
+        self._recorded = 0
+        self._replayed = 0
+        if mode != 'record' and os.path.exists(path):
+            with _open(path, 'rt', path.endswith('.gz')) as file:
+                self._interactions = json.load(file)['interactions']
+        elif mode == 'replay':
+            raise FileNotFoundError(f"No cassette at {path}.")
+
+    @property
+    def stats(self) -> CassetteStats:
+        """
+        Responses recorded and replayed since the cassette was loaded.
+        """
+        with self._lock:
+            return CassetteStats(self._recorded, self._replayed)
+
+    def add(
+        self,
+        method: str,
+        url: str,
+        content: bytes,
+        status: int = 200,
+        headers: dict[str, str] | None = None,
+        body: bytes | str | None = None
+    ) -> None:
+        """
+        Record a response by hand.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        url : str
+            The URL of the request.
+        content : bytes
+            The body of the response.
+        status : int, default=200
+            The status of the response.
+        headers : dict[str, str], default=None
+            The headers of the response.
+        body : bytes | str, default=None
+            The body of the request.
+        """
+        record = _record(status, http.client.responses.get(status, ''), url,
+                         headers or {}, content, 0.0)
+        with self._lock:
+            self._interactions.setdefault(
+                _key(method, url, body), []).append(record)
+
+    def respond(
+        self,
+        method: str,
+        url: str,
+        body: bytes | str | None,
+        send: Callable[[], dict[str, Any]]
+    ) -> dict[str, Any]:
+        """
+        Answer a request from the cassette, or send and record it.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method.
+        url : str
+            The URL.
+        body : bytes | str | None
+            The body of the request.
+        send : Callable
+            Sends the request, returning its response as recorded.
+
+        Returns
+        -------
+        dict[str, Any]
+            The recorded response.
+
+        Raises
+        ------
+        UnrecordedRequest
+            If replaying a request that was not recorded.
+        """
+        key = _key(method, url, body)
+        with self._lock:
+            records = self._interactions.get(key)
+            replay = self.mode == 'replay' or (
+                self.mode == 'auto' and records is not None)
+            if replay:
+                if not records:
+                    raise UnrecordedRequest(
+                        f"No recorded response to {method} {url}.")
+                played = self._played.get(key, 0)
+                self._played[key] = played + 1
+                self._replayed += 1
+                record = records[min(played, len(records) - 1)]
+
+        if replay:
+            time.sleep(record['elapsed'] if self.latency == 'recorded'
+                       else self.latency)
+            return record
+
+        record = send()
+        with self._lock:
+            self._interactions.setdefault(key, []).append(record)
+            self._recorded += 1
+        return record
+
+    def save(self) -> None:
+        """
+        Write the cassette to its archive.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                    exist_ok=True)
+        with self._lock:
+            archive = {'version': 1, 'interactions': self._interactions}
+            with _open(f"{self.path}.tmp", 'wt',
+                       self.path.endswith('.gz')) as file:
+                json.dump(archive, file, indent=1, sort_keys=True)
+        os.replace(f"{self.path}.tmp", self.path)
+
+
+# -- Transports --------------------------------------------------------------
+
+
+def _patch_requests(cassette: Cassette) -> Callable[[], None]:
+    """
+    Answer requests sent by every :class:`requests.adapters.HTTPAdapter`.
+    """
+    original = HTTPAdapter.send
+
+    def send(
+        adapter: HTTPAdapter,
+        request: requests.PreparedRequest,
+        *args: Any,
+        **kwargs: Any
+    ) -> requests.Response:
+        def real() -> dict[str, Any]:
+            response = original(adapter, request, *args, **kwargs)
+            return _record(response.status_code, response.reason or '',
+                           response.url, dict(response.headers),
+                           response.content, response.elapsed.total_seconds())
+
+        record = cassette.respond(str(request.method), str(request.url),
+                                  request.body, real)
+        content = _decode(record)
+        raw = urllib3.HTTPResponse(
+            body=io.BytesIO(content),
+            headers={**record['headers'],
+                     'Content-Length': str(len(content))},
+            status=record['status'], reason=record['reason'],
+            preload_content=False, decode_content=False)
+        return adapter.build_response(request, raw)
+
+    HTTPAdapter.send = send  # type: ignore [method-assign, assignment]
+
+    def restore() -> None:
+        HTTPAdapter.send = original  # type: ignore [method-assign]
+    return restore
+
+
+def _patch_urllib(cassette: Cassette) -> Callable[[], None]:
+    """
+    Answer requests opened by every :class:`urllib.request.OpenerDirector`.
+    """
+    original = urllib.request.OpenerDirector.open
+
+    def open_(
+        opener: urllib.request.OpenerDirector,
+        fullurl: str | urllib.request.Request,
+        data: bytes | None = None,
+        *args: Any,
+        **kwargs: Any
+    ) -> Any:
+        request = (fullurl if isinstance(fullurl, urllib.request.Request)
+                   else urllib.request.Request(fullurl, data))
+        if data is not None:
+            request.data = data
+
+        def real() -> dict[str, Any]:
+            start = time.monotonic()
+            try:
+                response = original(opener, fullurl, data, *args, **kwargs)
+            except urllib.error.HTTPError as err:
+                response = err
+            with response:
+                content = response.read()
+            return _record(response.getcode(),
+                           str(getattr(response, 'reason', '')),
+                           response.geturl(), dict(response.headers.items()),
+                           content, time.monotonic() - start)
+
+        record = cassette.respond(request.get_method(), request.full_url,
+                                  request.data, real)  # type: ignore [arg-type]
+        headers = http.client.HTTPMessage()
+        for name, value in record['headers'].items():
+            headers[name] = value
+        body = io.BytesIO(_decode(record))
+        if record['status'] >= 400:
+            raise urllib.error.HTTPError(record['url'], record['status'],
+                                         record['reason'], headers, body)
+        return urllib.response.addinfourl(body, headers, record['url'],
+                                          record['status'])
+
+    urllib.request.OpenerDirector.open = open_  # type: ignore
+    return lambda: setattr(urllib.request.OpenerDirector, 'open', original)
+
+
+def _patch_wptools(cassette: Cassette) -> Callable[[], None]:
+    """
+    Answer requests sent by every :class:`wptools.request.WPToolsRequest`.
+    """
+    original = WPToolsRequest.get
+
+    def get(request: WPToolsRequest, url: str, status: str) -> bytes:
+        sent = False
+
+        def real() -> dict[str, Any]:
+            nonlocal sent
+            sent = True
+            start = time.monotonic()
+            content = original(request, url, status)
+            info = request.info or {}
+            headers = ({'Content-Type': info['content-type']}
+                       if info.get('content-type') else {})
+            return _record(info.get('status', 200), '', url, headers,
+                           content, time.monotonic() - start)
+
+        record = cassette.respond('GET', url, None, real)
+        if not (sent or request.silent):
+            print(status, file=sys.stderr)
+        content = _decode(record)
+        request.info = {
+            'url': url, 'content-type': record['headers'].get('Content-Type'),
+            'status': record['status'], 'bytes': len(content),
+            'seconds': f"{record['elapsed']:5.3f}",
+        }
+        return content
+
+    WPToolsRequest.get = get  # type: ignore [method-assign]
+
+    def restore() -> None:
+        WPToolsRequest.get = original  # type: ignore [method-assign]
+    return restore
+
+
+@contextlib.contextmanager
+def use_cassette(
+    cassette: str | Cassette,
+    mode: Mode = 'replay',
+    latency: float | Literal['recorded'] = 0.0
+) -> Iterator[Cassette]:
+    """
+    Record or replay all HTTP traffic in a ``with`` block.
+
+    Requests from every thread are intercepted. Responses recorded in the
+    block are saved to the cassette's archive when the block exits. Within
+    a nested block, the inner cassette answers first, and requests it
+    records pass through the outer one.
+
+    Parameters
+    ----------
+    cassette : str | Cassette
+        The cassette, or the path of its archive.
+    mode : {'replay', 'record', 'auto'}, default='replay'
+        How to treat requests, if given a path (see :class:`Cassette`).
+    latency : float | 'recorded', default=0.0
+        Seconds to wait before serving each replayed response, if given a
+        path (see :class:`Cassette`).
+
+    Yields
+    ------
+    Cassette
+        The cassette in use.
+    """
+    if isinstance(cassette, str):
+        cassette = Cassette(cassette, mode, latency)
+    restores = []
+    try:
+        for patch in (_patch_requests, _patch_urllib, _patch_wptools):
+            restores.append(patch(cassette))
+        yield cassette
+    finally:
+        for restore in reversed(restores):
+            restore()
+        if cassette.stats.recorded:
+            cassette.save()
+
+
+if __name__ == "__main__":
+    # Comment out (2) to run all tests in script; (1) to run specific tests
+    # doctest.testmod(verbose=True)
+    # doctest_function(Cassette, globs=globals())
+
+    numpydoc_validate_module(sys.modules['__main__'])
@@ -24,6 +24,17 @@ Basic data processing and transformation of raw data.
     :nosignatures:
 
     omit_string_patterns
+    normalize_to_type
+    normalize_title
+
+.. rubric:: Match
+
+Approximate matching of titles and other short strings.
+
+.. autosummary::
+    :nosignatures:
+
+    TrigramIndex
 
 .. rubric:: Load
 
@@ -38,13 +49,23 @@ API
 ~~~
 """
 
+import os
 import re
 import sys
 import pprint
 import doctest
+import pathlib
+import unicodedata
+import numpy as np
+import pandas as pd
+from collections.abc import Sequence
+from typing import Any, Iterable, NamedTuple
+
 import wptools
 
+from datopy.modeling import CustomTypes
 from datopy.workflow import doctest_function
+from datopy.util._columnar import load_strings, save_strings
 from datopy.util._numpydoc_validate import numpydoc_validate_module
 
 
@@ -54,6 +75,164 @@ from datopy.util._numpydoc_validate import numpydoc_validate_module
 # -- Transform ---------------------------------------------------------------
 
 
+# Characters with no decomposition to an ASCII base letter
+_TRANSLITERATIONS = str.maketrans({
+    'ß': 'ss', 'æ': 'ae', 'œ': 'oe', 'ø': 'o', 'ł': 'l', 'đ': 'd',
+    'ð': 'd', 'þ': 'th', 'ı': 'i', 'ħ': 'h',
+})
+
+# Combining marks left behind by NFKD decomposition
+_MARK_RANGES = [(0x0300, 0x036F), (0x1AB0, 0x1AFF), (0x1DC0, 0x1DFF),
+                (0x20D0, 0x20FF), (0xFE20, 0xFE2F)]
+_STRIP_MARKS = str.maketrans(
+    {chr(code): None for lo, hi in _MARK_RANGES for code in range(lo, hi + 1)}
+)
+
+_SEPARATORS = re.compile(r'[-_/\\|\s]+')
+_CHAR_CLASS = re.compile(r'^\^\[(.+)\][+*]\$$')
+_COMMAS = re.compile(r'\s*(?:,\s*)+')
+_SPACES = re.compile(r' {2,}')
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def _fold_accents(value: str) -> str:
+    """
+    Lowercase a string and reduce accented letters to their base letters.
+    """
+    value = value.lower()
+    if value.isascii():
+        return value
+    value = value.translate(_TRANSLITERATIONS)
+    return unicodedata.normalize('NFKD', value).translate(_STRIP_MARKS)
+
+
+def normalize_title(title: str) -> str:
+    """
+    Reduce a title to a canonical key for exact or approximate matching.
+
+    Parameters
+    ----------
+    title : str
+        A film, album, or book title as typed or scraped.
+
+    Returns
+    -------
+    str
+        The lowercased, accent-free title with punctuation replaced by
+        single spaces.
+
+    Examples
+    --------
+    >>> from datopy.etl import normalize_title
+
+    >>> normalize_title("Amélie (2001)")
+    'amelie 2001'
+    >>> normalize_title("  The Shawshank   Redemption ")
+    'the shawshank redemption'
+    >>> normalize_title("WALL·E")
+    'wall e'
+    """
+    return _NON_WORD.sub(' ', _fold_accents(title)).strip()
+
+
+class Normalization(NamedTuple):
+    """
+    Normalized strings and a mask of the entries that were modified.
+    """
+    values: pd.Series
+    changed: pd.Series
+
+
+def normalize_to_type(
+    values: pd.Series,
+    target: Any = CustomTypes.CSVstr,
+    sep: str = ', '
+) -> Normalization:
+    """
+    Coerce scraped strings to satisfy a :class:`~datopy.modeling.CustomTypes` pattern.
+
+    Each distinct value is lowercased, transliterated to plain ASCII
+    letters, stripped of characters the target pattern does not allow,
+    and has whitespace around commas collapsed.
+
+    Parameters
+    ----------
+    values : pd.Series
+        The raw strings. Missing values are passed through.
+    target : Any, default=CustomTypes.CSVstr
+        A pattern-constrained type from :class:`~datopy.modeling.CustomTypes`
+        (or any type annotated with a ``^[...]+$`` pattern).
+    sep : str, default=', '
+        The separator placed between comma-separated items.
+
+    Returns
+    -------
+    Normalization
+        The normalized ``values`` and a boolean ``changed`` mask.
+        Entries left empty after normalization become ``None``.
+
+    Raises
+    ------
+    ValueError
+        If the target pattern is not a single character class.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from datopy.etl import normalize_to_type
+    >>> from datopy.modeling import CustomTypes
+
+    >>> raw = pd.Series(['Drama, Mystery, Sci-Fi', 'Penélope Cruz ,Javier Bardem',
+    ...                  'drama', None, '???'])
+    >>> result = normalize_to_type(raw, CustomTypes.CSVstr)
+    >>> result.values.tolist()
+    ['drama, mystery, sci fi', 'penelope cruz, javier bardem', 'drama', None, None]
+    >>> int(result.changed.sum())
+    3
+
+    >>> normalize_to_type(pd.Series(['Kid A (2000)!']),
+    ...                   CustomTypes.CSVnumstr).values[0]
+    'kid a 2000!'
+    """
+    pattern = None
+    for item in getattr(target, '__metadata__', ()):
+        for constraint in getattr(item, 'metadata', [item]):
+            pattern = getattr(constraint, 'pattern', None) or pattern
+
+    char_class = _CHAR_CLASS.match(pattern or '')
+    if char_class is None:
+        raise ValueError(
+            f"Expected a '^[...]+$' pattern, got {pattern!r} for {target}.")
+    disallowed = re.compile(f"[^{char_class.group(1)}]")
+
+    def normalize(value: str) -> str | None:
+        value = _SEPARATORS.sub(' ', _fold_accents(value))
+        value = disallowed.sub('', value)
+        value = _SPACES.sub(' ', _COMMAS.sub(sep, value)).strip(' ,')
+        return value or None
+
+    # Normalize each distinct string once and broadcast it back by its code
+    codes, uniques = pd.factorize(values)
+    if not len(uniques):
+        # Nothing to normalize (and no results to index into)
+        return Normalization(
+            pd.Series(None, index=values.index, dtype=object,
+                      name=values.name),
+            pd.Series(False, index=values.index, dtype=bool))
+    normalized = pd.Series(
+        [normalize(value) if isinstance(value, str) else value
+         for value in uniques], dtype=object)
+    result = pd.Series(normalized.to_numpy()[codes], index=values.index,
+                       dtype=object, name=values.name)
+    result[codes < 0] = None
+
+    changed = pd.Series(
+        (normalized != pd.Series(uniques, dtype=object)).to_numpy()[codes],
+        index=values.index)
+    changed[codes < 0] = False
+    return Normalization(result, changed)
+
+
 def omit_string_patterns(input_string: str, patterns: list[str]) -> str:
     r"""
     Prune multiple character patterns from a string.
@@ -85,6 +264,200 @@ def omit_string_patterns(input_string: str, patterns: list[str]) -> str:
     return re.sub(pattern, '', input_string)
 
 
+# -- Match -------------------------------------------------------------------
+
+
+def _trigrams(titles: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Encode the distinct character trigrams of each (normalized) title.
+
+    Titles are padded with two leading spaces and one trailing space so that
+    word boundaries contribute trigrams. Each trigram is packed into a single
+    ``uint64`` from the 21-bit code points of its characters.
+
+    Returns the sorted trigram keys and the index of the title each belongs
+    to, with duplicates within a title removed.
+    """
+    padded = [f"  {title} " for title in titles]
+    lengths = np.fromiter(map(len, padded), dtype=np.int64, count=len(padded))
+    codes = np.frombuffer(''.join(padded).encode('utf-32-le'),
+                          dtype=np.uint32).astype(np.uint64)
+    owner = np.repeat(np.arange(len(titles), dtype=np.uint32), lengths)
+
+    # Keep trigrams that start and end within the same title
+    valid = np.flatnonzero(owner[:-2] == owner[2:])
+    keys = (codes[valid] << 42) | (codes[valid + 1] << 21) | codes[valid + 2]
+    owner = owner[valid]
+
+    order = np.lexsort((owner, keys))
+    keys, owner = keys[order], owner[order]
+    distinct = np.ones(len(keys), dtype=bool)
+    distinct[1:] = (keys[1:] != keys[:-1]) | (owner[1:] != owner[:-1])
+    return keys[distinct], owner[distinct]
+
+
+class TrigramIndex:
+    """
+    Approximate string matching with character trigram postings.
+
+    Titles are normalized with :func:`normalize_title` and scored against a
+    query by the Dice coefficient of their trigram sets. For each distinct
+    trigram the index stores a sorted posting list of the titles containing
+    it, so a query only touches the postings of its own trigrams.
+
+    Parameters
+    ----------
+    titles : Iterable[str]
+        The catalog of titles to be searched. Duplicates (after
+        normalization) are indexed once.
+
+    Notes
+    -----
+    The most common trigrams of a query (e.g. those of "the") are only used
+    to score candidates, never to generate them. A title scoring at least
+    ``min_score`` must share one of the remaining trigrams, so no match is
+    lost by skipping their (long) posting lists.
+
+    Examples
+    --------
+    >>> from datopy.etl import TrigramIndex
+
+    >>> titles = ["The Shawshank Redemption", "The Godfather",
+    ...           "The Dark Knight", "Shakespeare in Love", "Redemption"]
+    >>> index = TrigramIndex(titles)
+    >>> for title, score in index.search("ths shukshank redumption", k=2):
+    ...     print(f"{title}: {score:.2f}")
+    the shawshank redemption: 0.61
+    redemption: 0.39
+    >>> [title for title, _ in index.search("the godfathr", min_score=0.5)]
+    ['the godfather']
+    >>> index.search("zzz")
+    []
+    """
+
+    def __init__(self, titles: Iterable[str] = ()):
+        unique = sorted({normalize_title(title) for title in titles} - {''})
+        keys, owner = _trigrams(unique)
+        # One entry per distinct trigram, pointing into the postings
+        self.keys, starts = np.unique(keys, return_index=True)
+        self.starts = np.append(starts, len(keys)).astype(np.int64)
+        self.postings = owner
+        self.sizes = np.bincount(owner, minlength=len(unique)).astype(np.uint16)
+        self.titles: Sequence[Any] = unique
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Save the index to a directory of memory-mappable arrays.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            The directory to save to. Created if necessary.
+        """
+        path = pathlib.Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        save_strings(path / "titles", map(self._title, range(len(self))))
+        for name in ('keys', 'starts', 'postings', 'sizes'):
+            np.save(path / f"{name}.npy", getattr(self, name))
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str]) -> "TrigramIndex":
+        """
+        Load an index saved with :meth:`TrigramIndex.save`.
+
+        Parameters
+        ----------
+        path : str | os.PathLike
+            The directory the index was saved to.
+
+        Returns
+        -------
+        TrigramIndex
+            The index, with postings memory-mapped from disk.
+        """
+        path = pathlib.Path(path)
+        index = cls.__new__(cls)
+        for name in ('keys', 'starts', 'postings', 'sizes'):
+            setattr(index, name, np.load(path / f"{name}.npy", mmap_mode='r'))
+        index.titles = load_strings(path / "titles")
+        return index
+
+    def search(
+        self,
+        query: str,
+        k: int = 5,
+        min_score: float = 0.3
+    ) -> list[tuple[str, float]]:
+        """
+        Find the titles most similar to a (possibly misspelled) query.
+
+        Parameters
+        ----------
+        query : str
+            The title to look up.
+        k : int, default=5
+            Maximum number of candidates to return.
+        min_score : float, default=0.3
+            Minimum Dice similarity (between 0 and 1) of returned titles.
+
+        Returns
+        -------
+        list[tuple[str, float]]
+            Up to ``k`` ``(normalized_title, score)`` pairs, best first.
+        """
+        normalized = normalize_title(query)
+        keys, _ = _trigrams([normalized] if normalized else [])
+        slots = np.searchsorted(self.keys, keys)
+        present = slots < len(self.keys)
+        present[present] = self.keys[slots[present]] == keys[present]
+        slots = slots[present]
+
+        # Pigeonhole: a title scoring >= min_score shares at least `needed`
+        # trigrams, hence one of the rarest (n - needed + 1) found trigrams
+        n_query = len(keys)
+        needed = max(1, int(np.ceil(min_score * n_query / (2 - min_score))))
+        n_generating = len(slots) - needed + 1
+        if n_generating <= 0:
+            return []
+        spans = sorted(((self.starts[slot], self.starts[slot + 1])
+                        for slot in slots), key=lambda span: span[1] - span[0])
+
+        candidates, shared = np.unique(np.concatenate(
+            [self.postings[lo:hi] for lo, hi in spans[:n_generating]]),
+            return_counts=True)
+        remaining = spans[n_generating:]
+
+        # Drop candidates that fall short even if they share every remaining
+        # trigram, then count the remaining trigrams for the rest
+        bound = 2 * (shared + len(remaining)) / (
+            n_query + self.sizes[candidates])
+        candidates, shared = candidates[bound >= min_score], \
+            shared[bound >= min_score]
+        for lo, hi in remaining:
+            posting = self.postings[lo:hi]
+            found = np.searchsorted(posting, candidates)
+            found[found == len(posting)] = 0
+            shared += posting[found] == candidates
+
+        scores = 2 * shared / (n_query + self.sizes[candidates])
+        keep = np.flatnonzero(scores >= min_score)
+        if len(keep) > k:
+            keep = keep[np.argpartition(-scores[keep], k - 1)[:k]]
+        keep = keep[np.lexsort((candidates[keep], -scores[keep]))]
+
+        return [(self._title(candidates[i]), float(scores[i])) for i in keep]
+
+    def _title(self, i: int) -> str:
+        """
+        Decode a title, which is stored as bytes once memory-mapped.
+        """
+        title = self.titles[i]
+        return title.decode() if isinstance(title, bytes) else title
+
+
 # -- Load --------------------------------------------------------------------
 
 
@@ -27,6 +27,16 @@ Tools for automated generation of data models from data.
 
     BaseProcessor
 
+.. rubric:: Vectorized validation
+
+Bulk validation of data frames against data models.
+
+.. autosummary::
+    :nosignatures:
+
+    compile_model_checks
+    validate_frame
+
 API
 ~~~
 """
@@ -43,10 +53,12 @@ API
 # https://github.com/matplotlib/matplotlib/blob/v3.9.0/lib/matplotlib/dates.py
 
 
+import re
 import sys
 import json
 import pprint
 import doctest
+import numpy as np
 import pandas as pd
 from jsonschema import validate
 import typing
@@ -423,6 +435,318 @@ class CustomTypes:
     ]
 
 
+# -- Vectorized validation ---------------------------------------------------
+
+
+class ColumnCheck(NamedTuple):
+    """
+    Vectorizable constraints of a single model field.
+    """
+    column: str
+    field: str
+    dtype: type | None
+    required: bool
+    nullable: bool
+    pattern: str | None
+    bounds: dict[str, float]
+    validated: bool
+
+
+class FrameValidation(NamedTuple):
+    """
+    Result of validating a data frame against a data model.
+    """
+    mask: pd.Series
+    failures: pd.Series
+    errors: dict[Any, list[Any]]
+
+
+def _unwrap_annotation(
+    annotation: Any,
+    metadata: list[Any]
+) -> tuple[type | None, bool]:
+    """
+    Strip ``Optional``/``Annotated`` wrappers, collecting nested metadata.
+
+    Returns the innermost base type and whether ``None`` is accepted.
+    Constraint objects found along the way are appended to ``metadata``.
+    """
+    args = typing.get_args(annotation)
+    if hasattr(annotation, '__metadata__'):
+        for item in annotation.__metadata__:
+            metadata.extend(getattr(item, 'metadata', [item]))
+        return _unwrap_annotation(args[0], metadata)
+
+    if args and type(None) in args:
+        members = [arg for arg in args if arg is not type(None)]
+        if len(members) == 1:
+            dtype, _ = _unwrap_annotation(members[0], metadata)
+            return dtype, True
+        return None, True
+
+    if annotation in (str, int, float):
+        return annotation, False
+    return None, False
+
+
+def compile_model_checks(model: type[BaseModel]) -> list[ColumnCheck]:
+    """
+    Translate the declarative constraints of a data model into column checks.
+
+    Supported constraints are base types (``str``, ``int``, ``float``),
+    ``pattern``, the numeric bounds ``ge``/``le``/``gt``/``lt``, and whether
+    a field is required or nullable. Fields with custom field validators, or
+    of other types, are marked ``validated``: their values are checked by
+    the model itself.
+
+    Parameters
+    ----------
+    model : type[BaseModel]
+        The Pydantic data model whose fields are to be compiled.
+
+    Returns
+    -------
+    list[ColumnCheck]
+        One check per model field, keyed by column (alias or field name).
+
+    Examples
+    --------
+    >>> from datopy.modeling import compile_model_checks
+    >>> from datopy.models.media import IMDbFilm
+
+    >>> checks = {check.column: check for check in
+    ...           compile_model_checks(IMDbFilm)}
+    >>> checks['year']
+    ColumnCheck(column='year', field='year', dtype=<class 'int'>, \
+required=True, nullable=False, pattern=None, bounds={'ge': 1880, 'le': 3000}, \
+validated=False)
+    >>> checks['genres'].pattern, checks['genres'].nullable
+    ('^[a-z, ]+$', True)
+    >>> checks['kind'].validated
+    True
+    """
+    validated_fields = {
+        name for decorator in
+        model.__pydantic_decorators__.field_validators.values()
+        for name in decorator.info.fields}
+    checks = []
+    for name, field in model.model_fields.items():
+        metadata = list(field.metadata)
+        dtype, nullable = _unwrap_annotation(field.annotation, metadata)
+
+        pattern = None
+        bounds: dict[str, float] = {}
+        for item in metadata:
+            if getattr(item, 'pattern', None) is not None:
+                pattern = item.pattern
+            for bound in ('ge', 'le', 'gt', 'lt'):
+                if getattr(item, bound, None) is not None:
+                    bounds[bound] = getattr(item, bound)
+
+        checks.append(ColumnCheck(
+            column=field.alias or name,
+            field=name,
+            dtype=dtype,
+            required=field.is_required(),
+            nullable=nullable,
+            pattern=pattern,
+            bounds=bounds,
+            validated=dtype is None or bool({name, '*'} & validated_fields),
+        ))
+    return checks
+
+
+def _is_missing(value: Any) -> bool:
+    """
+    Whether a cell is missing (``None``/``NaN``); containers never are.
+    """
+    return pd.api.types.is_scalar(value) and bool(pd.isna(value))
+
+
+def _factorize(values: pd.Series) -> tuple[np.ndarray, list[Any]]:
+    """
+    Encode a column as codes of its distinct present values (-1 if missing).
+
+    Unhashable entries (e.g. lists) cannot be matched with one another, so
+    each is given a code of its own.
+    """
+    try:
+        codes, index = pd.factorize(values)
+        return codes, list(index)
+    except TypeError:
+        pass
+    seen: dict[Any, int] = {}
+    uniques: list[Any] = []
+    codes = np.full(len(values), -1, dtype=np.intp)
+    for i, value in enumerate(values):
+        if _is_missing(value):
+            continue
+        try:
+            codes[i] = seen.setdefault((type(value), value), len(uniques))
+        except TypeError:
+            codes[i] = len(uniques)
+        if codes[i] == len(uniques):
+            uniques.append(value)
+    return codes, uniques
+
+
+def _distinct_failures(
+    values: pd.Series,
+    accept: Callable[[Any], bool]
+) -> np.ndarray:
+    """
+    Flag the present entries of a column rejected by ``accept``, which is
+    called once per distinct value.
+    """
+    codes, uniques = _factorize(values)
+    unique_ok = np.array([accept(value) for value in uniques], dtype=bool)
+    ok = np.ones(len(values), dtype=bool)
+    ok[codes >= 0] = unique_ok[codes[codes >= 0]]
+    return ~ok
+
+
+def _column_failures(
+    values: pd.Series,
+    check: ColumnCheck,
+    model: type[BaseModel]
+) -> pd.Series:
+    """
+    Flag the entries of a column that violate a compiled check.
+    """
+    present = values.notna()
+    # Absent values are only acceptable for optional fields
+    failed = ~present & check.required
+
+    # Columns repeat heavily; check each distinct value once
+    if check.validated:
+        # Run the field's own validators, and any constraints not compiled
+        instance = model.model_construct()
+
+        def accept(value: Any) -> bool:
+            try:
+                model.__pydantic_validator__.validate_assignment(
+                    instance, check.field, value)
+            except ValidationError:
+                return False
+            return True
+        failed |= _distinct_failures(values, accept)
+
+    elif check.dtype is str:
+        pattern = re.compile(check.pattern or '')
+        failed |= _distinct_failures(values, lambda value: isinstance(
+            value, str) and bool(pattern.search(value)))
+
+    elif check.dtype in (int, float):
+        numeric = pd.to_numeric(values, errors='coerce')
+        failed |= present & numeric.isna()
+        if check.dtype is int:
+            failed |= present & (numeric % 1 != 0) & numeric.notna()
+        operators = {'ge': np.greater_equal, 'le': np.less_equal,
+                     'gt': np.greater, 'lt': np.less}
+        for bound, limit in check.bounds.items():
+            failed |= numeric.notna() & ~operators[bound](numeric, limit)
+
+    return failed
+
+
+def validate_frame(
+    df: pd.DataFrame,
+    model: type[BaseModel],
+    fallback: bool = True
+) -> FrameValidation:
+    """
+    Validate every row of a data frame against a data model in bulk.
+
+    The model's constraints are compiled once (see
+    :func:`compile_model_checks`) and applied column-wise.
+    Only rows that fail the vectorized checks are passed to the model itself,
+    which resolves cases the checks treat conservatively (e.g. lax coercion)
+    and supplies the usual Pydantic error details.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Records to validate, with one column per model field.
+    model : type[BaseModel]
+        The Pydantic data model to validate against.
+    fallback : bool, default=True
+        Whether to re-validate failing rows with the model itself.
+
+    Returns
+    -------
+    FrameValidation
+        A boolean validity ``mask`` aligned with ``df``, per-column
+        ``failures`` counts, and Pydantic ``errors`` by row label.
+
+    Notes
+    -----
+    Columns of fields with custom field validators, or of types the checks
+    do not cover, are validated by the model once per distinct value.
+    Values that cannot be told apart by hashing (e.g. lists) are validated
+    one by one.
+    Missing values (``None``/``NaN``) are treated as absent fields.
+
+    Examples
+    --------
+    >>> import pandas as pd
+    >>> from datopy.modeling import validate_frame
+    >>> from datopy.models.media import IMDbFilm
+
+    >>> films = pd.DataFrame({
+    ...     'title': ['alien', 'heat', 'Up!'],
+    ...     'imdb_id': ['tt0078748', 'tt0113277', 'tt1049413'],
+    ...     'kind': ['movie', 'movie', 'movie'],
+    ...     'year': [1979, 1995, 2009],
+    ...     'rating': [8.5, 8.3, 11.0],
+    ...     'votes': [900000, 700000, 1100000],
+    ...     'genres': ['horror, sci fi', 'crime, drama', None]})
+    >>> result = validate_frame(films, IMDbFilm)
+    >>> result.mask.tolist()
+    [True, True, False]
+    >>> result.failures[result.failures > 0]
+    title     1
+    rating    1
+    dtype: int64
+    >>> sorted(error['loc'][0] for error in result.errors[2])
+    ['rating', 'title']
+
+    Field validators and unhashable values are checked too
+
+    >>> films.loc[0, 'kind'] = 'movie!'
+    >>> films['genres'] = [None, ['crime', 'drama'], None]
+    >>> validate_frame(films, IMDbFilm, fallback=False).mask.tolist()
+    [False, False, False]
+    """
+    checks = compile_model_checks(model)
+    failed_by_column = {}
+    for check in checks:
+        if check.column in df.columns:
+            failed_by_column[check.column] = _column_failures(
+                df[check.column], check, model)
+        else:
+            failed_by_column[check.column] = pd.Series(
+                check.required, index=df.index, dtype=bool)
+
+    failed = pd.DataFrame(failed_by_column, index=df.index)
+    mask = ~failed.any(axis=1)
+
+    errors: dict[Any, list[Any]] = {}
+    if fallback:
+        records = df.loc[~mask].astype(object).to_dict('records')
+        for label, row in zip(df.index[~mask], records):
+            data = {key: value for key, value in row.items()
+                    if not _is_missing(value)}
+            try:
+                model.model_validate(data)
+            except ValidationError as e:
+                errors[label] = e.errors()
+            else:
+                mask[label] = True
+
+    failures = failed.loc[~mask].sum().astype('int64')
+    return FrameValidation(mask, failures, errors)
+
+
 # TODO: implement BaseProcessor
 
 
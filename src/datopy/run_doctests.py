@@ -2,15 +2,25 @@
 Runs doctests for all specified modules as a unittest suite.
 """
 
+import os
 import doctest
 import unittest
+import contextlib
 import pandas as pd
+from typing import cast
+
+from datopy._replay import Mode, use_cassette
 
 
 # TODO: default to all modules and submodules
 
 
-def run_doctest_suite(modules_to_test: tuple[str, ...]):
+def run_doctest_suite(
+    modules_to_test: tuple[str, ...],
+    cassette_dir: str | None = None,
+    mode: Mode = 'replay',
+    latency: float = 0.0
+):
     """
     Run doctests for all specified modules as a unittest suite.
 
@@ -18,6 +28,15 @@ def run_doctest_suite(modules_to_test: tuple[str, ...]):
     ----------
     modules_to_test : tuple[str, ...]
         The filenames of the python modules containing doctests to be run.
+    cassette_dir : str, default=None
+        Optional directory of recorded HTTP traffic, one
+        ``{module}.json.gz`` cassette per module (see
+        :func:`datopy._replay.use_cassette`). Modules without a cassette
+        are run against the network when replaying.
+    mode : {'replay', 'record', 'auto'}, default='replay'
+        Whether to replay the cassettes or record them afresh.
+    latency : float, default=0.0
+        Seconds injected before each replayed response.
     """
 
     total_failures = 0
@@ -31,7 +50,14 @@ def run_doctest_suite(modules_to_test: tuple[str, ...]):
         # Run doctests by module and store results
         temp_module = __import__(module, fromlist=["*"])
         test_suite = doctest.DocTestSuite(temp_module)
-        results = unittest.TextTestRunner().run(test_suite)
+        cassette = None
+        if cassette_dir is not None:
+            cassette = os.path.join(cassette_dir, f"{module}.json.gz")
+            if mode == 'replay' and not os.path.exists(cassette):
+                cassette = None
+        with (use_cassette(cassette, mode, latency) if cassette
+              else contextlib.nullcontext()):
+            results = unittest.TextTestRunner().run(test_suite)
 
         # Store number and name of failed doctests
         failures = results.failures
@@ -60,7 +86,18 @@ if __name__ == "__main__":
         'datopy.models.media',
 
         'datopy._media_scrape',
+        'datopy._imdb_datasets',
+        'datopy._clients',
+        'datopy._cache',
+        'datopy._http',
+        'datopy._replay',
+        'datopy._loadtest',
         # 'datopy._examples',
     )
 
-    run_doctest_suite(MODULES_TO_TEST)
+    # Record once with DOCTEST_CASSETTE_MODE=record, then replay offline
+    run_doctest_suite(MODULES_TO_TEST,
+                      cassette_dir=os.getenv("DOCTEST_CASSETTES"),
+                      mode=cast(Mode, os.getenv("DOCTEST_CASSETTE_MODE",
+                                                'replay')),
+                      latency=float(os.getenv("DOCTEST_LATENCY", 0)))
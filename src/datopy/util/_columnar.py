@@ -0,0 +1,75 @@
+"""
+This module contains helpers for storing columns in memory-mappable files.
+
+Numeric columns are saved with :func:`numpy.save` and loaded with
+``mmap_mode='r'``. String columns are saved as a UTF-8 byte blob plus an
+array of offsets, so that they can be memory-mapped too.
+"""
+
+import os
+import numpy as np
+from typing import Iterable
+from collections.abc import Sequence
+
+
+# -- String columns ----------------------------------------------------------
+
+
+class StringColumn(Sequence[bytes]):
+    """
+    Read-only sequence of UTF-8 strings stored as a byte blob with offsets.
+
+    Items are returned as ``bytes``, whose ordering matches that of the
+    decoded strings, so the column can be searched with :mod:`bisect`.
+    """
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = np.asarray(blob)
+        self._offsets = np.asarray(offsets)
+        # Plain memoryviews avoid the per-item overhead of np.memmap
+        self.blob = self._blob.data
+        self.offsets = self._offsets.data
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):  # type: ignore [override]
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes()
+
+    def take(self, positions: Iterable[int]) -> list[str]:
+        """
+        Decode the strings at ``positions`` with one gather from the blob.
+        """
+        positions = np.fromiter(positions, dtype=np.int64)
+        starts = self._offsets[positions]
+        lengths = self._offsets[positions + 1] - starts
+        ends = np.cumsum(lengths)
+        gather = np.arange(ends[-1] if len(ends) else 0) + np.repeat(
+            starts - (ends - lengths), lengths)
+        buffer = self._blob[gather].tobytes()
+        bounds = zip((ends - lengths).tolist(), ends.tolist())
+        if buffer.isascii():
+            # Byte offsets are character offsets
+            text = buffer.decode()
+            return [text[start:end] for start, end in bounds]
+        return [buffer[start:end].decode() for start, end in bounds]
+
+
+def save_strings(path: str | os.PathLike[str], strings: Iterable[str]) -> None:
+    """
+    Save strings as ``{path}.blob.npy`` and ``{path}.offsets.npy``.
+    """
+    encoded = [string.encode() for string in strings]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64,
+                          count=len(encoded))
+    offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+    np.save(f"{path}.blob.npy", np.frombuffer(b''.join(encoded), np.uint8))
+    np.save(f"{path}.offsets.npy", offsets)
+
+
+def load_strings(path: str | os.PathLike[str]) -> StringColumn:
+    """
+    Memory-map strings saved with :func:`save_strings`.
+    """
+    return StringColumn(np.load(f"{path}.blob.npy", mmap_mode='r'),
+                        np.load(f"{path}.offsets.npy", mmap_mode='r'))
@@ -7,14 +7,27 @@ Included:
 - Manually downloading modules
 """
 
+import io
 import os
 import sys
+import json
 import doctest
-import requests
+import hashlib
+import tarfile
+import zipfile
+import threading
 import importlib
-import urllib.request
-from typing import Dict, List, Any, Callable
+import contextlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Dict, List, Any, Callable, Iterable, Iterator, Literal, NamedTuple,
+)
+
+import requests
 
+from datopy._http import (
+    DeadlineExceeded, carry_deadline, expiry, http_cache, resilient_session,
+)
 from datopy.util._numpydoc_validate import numpydoc_validate_module
 
 # TODO: rename this io.py?
@@ -24,16 +37,183 @@ from datopy.util._numpydoc_validate import numpydoc_validate_module
 # TODO: save_drive
 
 
+class ModuleReport(NamedTuple):
+    """
+    Summary of a :func:`git_module_loader` run, listing modules as
+    ``'{git-user}/{repo-name}/{branch-name}/{module}'``.
+    """
+    downloaded: List[str]
+    skipped: List[str]
+    missing: List[str]
+    failed: List[str]
+
+    def __str__(self) -> str:
+        return "\n".join(
+            f"{field.capitalize()} ({len(paths)}): {', '.join(paths) or '-'}"
+            for field, paths in zip(self._fields, self))
+
+
+def _fetch_module(
+    session: requests.Session,
+    url: str,
+    filename: str,
+    run_download: bool
+) -> str:
+    """
+    Download a module with a single streamed request, unless it is missing,
+    already downloaded, or downloads are disabled.
+
+    The body is written to a temporary file beside ``filename``, which then
+    replaces it, so that an interrupted download leaves no partial module.
+
+    Returns
+    -------
+    str
+        ``'missing'``, ``'present'``, ``'skipped'``, or ``'downloaded'``.
+    """
+    with session.get(url, allow_redirects=False, stream=True) as response:
+        if response.status_code != 200:
+            return 'missing'
+        if os.path.isfile(filename):
+            return 'present'
+        if not run_download:
+            return 'skipped'
+
+        _write_atomic(filename, response.iter_content(chunk_size=2 ** 16))
+    return 'downloaded'
+
+
+def _write_atomic(filename: str, chunks: Iterable[bytes]) -> None:
+    """
+    Write a file by way of a temporary file beside it, which then replaces
+    it, so that an interrupted write leaves no partial file.
+    """
+    save_dir, name = os.path.split(filename)
+    os.makedirs(save_dir, exist_ok=True)
+    partial = os.path.join(
+        save_dir, f".{name}.{os.getpid()}.{threading.get_ident()}.part")
+    try:
+        with open(partial, 'wb') as file:
+            for chunk in chunks:
+                file.write(chunk)
+        os.replace(partial, filename)
+    except BaseException:
+        # Not created if opening it failed; keep the original error
+        with contextlib.suppress(OSError):
+            os.remove(partial)
+        raise
+
+
+def _archive_members(
+    response: requests.Response,
+    archive: str,
+    paths: Iterable[str]
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Read the files at ``paths``, relative to the branch, from a streamed
+    ``'tar.gz'`` or ``'zip'`` archive of the branch.
+
+    A tarball is read as it arrives, and no further than its last wanted
+    file. The index of a zip archive comes last, so a zip archive is read
+    into memory first. Neither is written to disk.
+    """
+    wanted = set(paths)
+    if archive == 'zip':
+        with zipfile.ZipFile(io.BytesIO(response.content)) as zipped:
+            for info in zipped.infolist():
+                # Members are nested in a '{repo}-{branch}/' directory
+                path = info.filename.partition('/')[2]
+                if path in wanted:
+                    yield path, zipped.read(info)
+        return
+
+    response.raw.decode_content = True
+    with tarfile.open(fileobj=response.raw, mode='r|gz') as tar:
+        for member in tar:
+            path = member.name.partition('/')[2]
+            file = tar.extractfile(member) if path in wanted else None
+            if file is None:
+                continue
+            yield path, file.read()
+            wanted.discard(path)
+            if not wanted:
+                return
+
+
+def _fetch_archive(
+    session: requests.Session,
+    url: str,
+    archive: str,
+    repo: str,
+    filenames: Dict[str, str],
+    lock: Dict[str, str],
+    run_download: bool
+) -> Dict[str, str]:
+    """
+    Extract modules from a single streamed archive of their branch.
+
+    Modules whose content hash matches the ``lock`` entry of an existing
+    file are not rewritten; ``lock`` is updated with the hashes of those
+    written.
+
+    Returns
+    -------
+    Dict[str, str]
+        For each module in ``filenames``, ``'missing'``, ``'unchanged'``,
+        ``'skipped'``, or ``'downloaded'``.
+    """
+    outcomes = dict.fromkeys(filenames, 'missing')
+    with session.get(url, stream=True) as response:
+        if response.status_code != 200:
+            return outcomes
+        for module, content in _archive_members(response, archive,
+                                                filenames):
+            filename = filenames[module]
+            digest = hashlib.sha256(content).hexdigest()
+            if lock.get(f"{repo}/{module}") == digest and (
+                    os.path.isfile(filename)):
+                outcomes[module] = 'unchanged'
+            elif not run_download:
+                outcomes[module] = 'skipped'
+            else:
+                _write_atomic(filename, [content])
+                # Each branch's entries are only written by its own task
+                lock[f"{repo}/{module}"] = digest
+                outcomes[module] = 'downloaded'
+    return outcomes
+
+
+# Archives of a branch, by format, served by GitHub
+ARCHIVE_URL = "https://codeload.github.com/{user}/{repo}/{format}/{branch}"
+
+# Content hashes of the modules extracted from archives, in the save dir
+LOCKFILE = ".git-modules.lock"
+
+
 def git_module_loader(
     modules: Dict[str, List[str]],
     save_dir: str | None = None,
     run_tests: bool = False,
-    run_download: bool = False
-) -> None:
+    run_download: bool = False,
+    deadline: float | None = None,
+    max_workers: int = 8,
+    base_url: str = "https://raw.githubusercontent.com",
+    archive: Literal['tar.gz', 'zip'] | None = None,
+    archive_url: str = ARCHIVE_URL
+) -> ModuleReport:
     """
     Download collections of modules directly from their Git repo.
 
-    Retrieved files are stored in the current directory.
+    Retrieved files are stored in the current directory. Modules are fetched
+    concurrently over a pooled session, each with a single streamed request
+    whose body is written atomically. Progress is reported in the order the
+    modules are listed. With ``archive``, each branch is instead fetched as
+    a single archive, from which only the listed modules are extracted.
+    Modules fetched separately go through the shared
+    :func:`~datopy._http.http_cache`, if enabled, so that unchanged files are
+    revalidated rather than downloaded again; the bytes saved by the cache
+    are reported. Archives bypass it, so as to be streamed rather than
+    stored whole.
 
     Parameters
     ----------
@@ -47,18 +227,52 @@ def git_module_loader(
     run_download : bool, default=False
         Additional safeguard to ensure no modules are accidentally downloaded.
 
+    deadline : float, default=None
+        Seconds within which all modules must be downloaded. Modules not
+        retrieved in time are reported as timed out.
+
+    max_workers : int, default=8
+        Number of modules fetched at once.
+
+    base_url : str, default="https://raw.githubusercontent.com"
+        The host serving raw files.
+
+    archive : {'tar.gz', 'zip'}, default=None
+        Fetch each branch as one archive of this format rather than each
+        module separately. Modules are then kept in sync with their branch:
+        a lockfile of content hashes in ``save_dir`` records the modules
+        written, so that unchanged modules are not rewritten and changed
+        ones are.
+
+    archive_url : str, default=ARCHIVE_URL
+        Template of archive URLs, filled in with the ``user``, ``repo``,
+        ``branch``, and archive ``format``.
+
+    Returns
+    -------
+    ModuleReport
+        The modules downloaded, skipped (already downloaded, unchanged, or
+        downloads disabled), missing, and failed (or timed out).
+
     Examples
     --------
     >>> from datopy.workflow import git_module_loader
 
     >>> modules = {'gitusername/repo/branch': ['module1.py', 'module2.py']}
-    >>> git_module_loader(modules, run_tests=True, run_download=True)
+    >>> report = git_module_loader(modules, run_tests=True, run_download=True)
     Module gitusername/repo/branch/module1.py does not exist.
     Module gitusername/repo/branch/module2.py does not exist.
+    >>> print(report)  # doctest: +NORMALIZE_WHITESPACE
+    Downloaded (0): -
+    Skipped (0): -
+    Missing (2): gitusername/repo/branch/module1.py,
+        gitusername/repo/branch/module2.py
+    Failed (0): -
 
     >>> modules = {"HIPS/autograd/master":
     ...     ['autograd/tracer.py', 'autograd/util.py']}
-    >>> git_module_loader(modules, run_tests=False, run_download=False)
+    >>> report = git_module_loader(modules, run_tests=False,
+    ...                            run_download=False)
     Skipping download.
     Skipping download.
     """
@@ -68,35 +282,87 @@ def git_module_loader(
     else:
         pass
 
-    for repo in modules:
-        for module in modules[repo]:
-            module_url = f"https://raw.githubusercontent.com/{repo}/{module}"
-            exists = requests.head(
-                module_url, allow_redirects=False).status_code == 200
-
-            if not exists:
-                print(f"Module {repo}/{module} does not exist.")
+    # Rate limited, retried, and circuit broken per host
+    cache = None if archive else http_cache()
+    session = resilient_session(max_connections=max_workers, cache=cache)
+    saved = cache.stats.bytes_saved if cache else 0
+    expires = expiry(deadline)
+    report = ModuleReport([], [], [], [])
+    lockfile = os.path.join(save_dir, LOCKFILE)
+    lock: Dict[str, str] = {}
+    if archive and os.path.isfile(lockfile):
+        with open(lockfile) as file:
+            lock = json.load(file)
+    hashes = dict(lock)
+
+    with session, ThreadPoolExecutor(max_workers) as executor:
+        futures: Dict[tuple[str, str], Future[Any]] = {}
+        for repo in modules:
+            filenames = {module: os.path.join(save_dir,
+                                              os.path.basename(module))
+                         for module in modules[repo]}
+            if archive:
+                user, name, branch = repo.split('/', 2)
+                url = archive_url.format(user=user, repo=name, branch=branch,
+                                         format=archive)
+                future = executor.submit(
+                    carry_deadline(_fetch_archive, expires), session, url,
+                    archive, repo, filenames, hashes, run_download)
+                futures.update(dict.fromkeys(
+                    [(repo, module) for module in filenames], future))
                 continue
-
-            filename = os.path.join(save_dir, os.path.basename(module))
-            if os.path.isfile(filename):
-                print(f"Module {repo}/{module} already downloaded.")
+            for module, filename in filenames.items():
+                futures[repo, module] = executor.submit(
+                    carry_deadline(_fetch_module, expires), session,
+                    f"{base_url}/{repo}/{module}", filename, run_download)
+
+        for (repo, module), future in futures.items():
+            path = f"{repo}/{module}"
+            try:
+                result: Any = future.result()
+                outcome: str = result[module] if archive else result
+            except DeadlineExceeded:
+                print(f"Module {path} timed out.")
+                report.failed.append(path)
+                continue
+            except (OSError, requests.exceptions.RequestException,
+                    tarfile.TarError, zipfile.BadZipFile) as err:
+                print(f"Module {path} could not be downloaded: {err}")
+                report.failed.append(path)
                 continue
 
-            if not run_download:
+            if outcome == 'missing':
+                print(f"Module {path} does not exist.")
+                report.missing.append(path)
+                continue
+            if outcome == 'present':
+                print(f"Module {path} already downloaded.")
+                report.skipped.append(path)
+                continue
+            if outcome == 'unchanged':
+                print(f"Module {path} unchanged.")
+                report.skipped.append(path)
+                continue
+            if outcome == 'skipped':
                 print("Skipping download.")
+                report.skipped.append(path)
                 continue
 
-            print(f"Downloading {repo}/{module}.")
-            os.makedirs(save_dir, exist_ok=True)
-            urllib.request.urlretrieve(url=module_url, filename=filename)
-
+            print(f"Downloading {path}.")
+            report.downloaded.append(path)
             if run_tests:
                 print('Running tests:\n')
                 module_name = module.split('/')[-1].split('.')[0]
                 mod = importlib.import_module(module_name)
                 doctest.testmod(mod, verbose=True)
 
+    if hashes != lock:
+        _write_atomic(lockfile, [json.dumps(hashes, indent=2).encode()])
+    if cache and cache.stats.bytes_saved > saved:
+        print(f"{cache.stats.bytes_saved - saved} bytes served from the "
+              "HTTP cache.")
+    return report
+
 
 # -- Efficient testing -------------------------------------------------------
 
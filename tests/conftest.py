@@ -1,10 +1,18 @@
 """
 Pytest test configuration file containing boilerplate fixtures
-for use with '_functions_to_test.py'.
+for use with '_functions_to_test.py', and local stand-ins for web APIs.
 """
 
-import pytest
+import re
 import sys
+import json
+import time
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
 
 
 # --- Monkeypatching ---
@@ -20,6 +28,30 @@ def capture_stdout(monkeypatch):
     return buffer
 
 
+# --- Isolated caches ---
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """Give each test its own process-wide singletons: an initially empty
+    cache of retrieval misses, group of coalesced requests, host policies
+    (with short backoff), hedger (disabled), cache of HTTP responses, and
+    shared IMDb session."""
+    from datopy._cache import negative_cache, single_flight
+    from datopy._http import default_hedger, host_registry, http_cache
+    from datopy._media_scrape import _shared_imdb_session
+    monkeypatch.setenv("NEGATIVE_CACHE_PATH",
+                       str(tmp_path / "negative-results"))
+    monkeypatch.setenv("HTTP_CACHE_PATH", str(tmp_path / "http"))
+    monkeypatch.setenv("HTTP_BACKOFF", "0.01")
+    monkeypatch.delenv("HTTP_HEDGE_PERCENTILE", raising=False)
+    shared = [negative_cache, single_flight, host_registry, default_hedger,
+              http_cache, _shared_imdb_session]
+    for getter in shared:
+        getter.cache_clear()
+    yield
+    for getter in shared:
+        getter.cache_clear()
+
+
 # --- Database connection ---
 @pytest.fixture(scope="session")
 def db_conn():
@@ -28,3 +60,120 @@ def db_conn():
     # connection will be torn down after all tests finish
     with db.connect(url) as conn:
         yield conn
+
+
+# --- Local stand-in for the Spotify Web API ---
+class StandInSpotify(BaseHTTPRequestHandler):
+    """Serve a small Spotify catalogue, counting requests per endpoint.
+
+    Tokens issued by the stand-in token endpoint are rejected once expired.
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    albums: dict = {}
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    token_lifetime = 3600
+    tokens: dict = {}
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if urlparse(self.path).path != "/api/token":
+            return self.reply(404, {'error': "not found"})
+        with self.lock:
+            self.counts['/api/token'] += 1
+            token = f"token-{self.counts['/api/token']}"
+            self.tokens[token] = time.time() + self.token_lifetime
+        self.reply(200, {'access_token': token, 'token_type': "Bearer",
+                         'expires_in': self.token_lifetime})
+
+    def do_GET(self):
+        token = self.headers.get('Authorization', '').removeprefix("Bearer ")
+        if self.tokens.get(token, float('inf')) < time.time():
+            with self.lock:
+                self.counts['expired'] += 1
+            return self.reply(401, {'error': {
+                'status': 401, 'message': "The access token expired"}})
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        ids = query['ids'].split(',') if 'ids' in query else []
+        path = url.path.rstrip('/')
+        routes = [
+            (r"/v1/search", lambda: self.search(query['q'])),
+            (r"/v1/albums", lambda: {
+                'albums': [self.album(album_id) for album_id in ids]}),
+            (r"/v1/albums/(\w+)/tracks", lambda album_id: self.track_page(
+                album_id, int(query.get('offset', 0)),
+                int(query.get('limit', 50)))),
+            (r"/v1/albums/(\w+)", self.album),
+            (r"/v1/audio-features", lambda: {
+                'audio_features': [self.features(track) for track in ids]}),
+            (r"/v1/tracks", lambda: {
+                'tracks': [self.track(track) for track in ids]}),
+            (r"/v1/tracks/(\w+)", self.track),
+        ]
+        for pattern, route in routes:
+            match = re.fullmatch(pattern, path)
+            if match:
+                with self.lock:
+                    self.counts[pattern.replace("(\\w+)", "{id}")] += 1
+                return self.reply(200, route(*match.groups()))
+        self.reply(404, {'error': {'status': 404, 'message': "not found"}})
+
+    def search(self, q):
+        artist, title = re.fullmatch(r"artist:(.*) album:(.*)", q).groups()
+        items = [{'id': album_id, 'name': album['name']}
+                 for album_id, album in self.albums.items()
+                 if album['name'] == title and album['artist'] == artist]
+        return {'albums': {'total': len(items), 'items': items}}
+
+    def album(self, album_id):
+        album = self.albums[album_id]
+        return {'id': album_id, 'name': album['name'],
+                'artists': [{'name': album['artist']}],
+                'total_tracks': len(album['tracks']),
+                'tracks': self.track_page(album_id, 0, 50)}
+
+    def track_page(self, album_id, offset, limit):
+        tracks = self.albums[album_id]['tracks']
+        more = offset + limit < len(tracks)
+        host = f"http://{self.headers['Host']}"
+        return {
+            'items': [{'id': track_id, 'name': f"track {track_id}"}
+                      for track_id in tracks[offset:offset + limit]],
+            'next': (f"{host}/v1/albums/{album_id}/tracks?offset="
+                     f"{offset + limit}&limit={limit}" if more else None),
+        }
+
+    def features(self, track_id):
+        return {'id': track_id, 'danceability': len(track_id) / 100,
+                'duration_ms': 1000 * len(track_id)}
+
+    def track(self, track_id):
+        return {'id': track_id, 'popularity': int(track_id[1:]) % 100}
+
+    def reply(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def spotify_server():
+    """A running stand-in Spotify API; yields its handler class."""
+    StandInSpotify.counts = Counter()
+    StandInSpotify.tokens = {}
+    StandInSpotify.token_lifetime = 3600
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInSpotify)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StandInSpotify.url = f"http://127.0.0.1:{server.server_port}"
+    yield StandInSpotify
+    server.shutdown()
+    server.server_close()
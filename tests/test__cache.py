@@ -0,0 +1,152 @@
+"""
+Tests and benchmarks for the caches and request coalescing in '_cache.py'.
+"""
+
+import time
+import random
+import asyncio
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from datopy._cache import SingleFlight, negative_cache
+
+
+# --- Testing expected behaviour ---
+def slow_fetch(fetches, delay=0.1):
+    def fetch(title):
+        fetches[title] += 1
+        time.sleep(delay)
+        if title == "missing":
+            raise LookupError(f"No result found for {title}.")
+        return {'title': title}
+    return fetch
+
+
+def test_threads_share_result_and_exception():
+    group, fetches = SingleFlight(), Counter()
+    fetch = slow_fetch(fetches)
+
+    def request(title):
+        try:
+            return group.do(title, fetch, title)
+        except LookupError as err:
+            return err
+
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(request, ["stalker", "missing"] * 4))
+
+    assert fetches == {"stalker": 1, "missing": 1}
+    assert all(result is results[0] for result in results[::2])
+    assert all(isinstance(result, LookupError) for result in results[1::2])
+    assert group.stats == (8, 6)
+
+    # Completed fetches are not cached
+    group.do("stalker", fetch, "stalker")
+    assert fetches["stalker"] == 2
+
+
+def test_tasks_share_coroutine_and_blocking_fetches():
+    group, fetches = SingleFlight(), Counter()
+
+    async def afetch(title):
+        fetches[title] += 1
+        await asyncio.sleep(0.1)
+        return title.upper()
+
+    async def main():
+        waiter = asyncio.ensure_future(group.do_async("solaris", afetch,
+                                                      "solaris"))
+        results = asyncio.gather(
+            *[group.do_async("solaris", afetch, "solaris") for _ in range(3)],
+            *[group.do_async("mirror", slow_fetch(fetches), "mirror")
+              for _ in range(3)])
+        await asyncio.sleep(0.01)
+        # Cancelling one waiter leaves the shared fetch running
+        waiter.cancel()
+        return await results
+
+    # Blocking fetches are also coalesced with requests from threads
+    thread = threading.Thread(target=group.do,
+                              args=("mirror", slow_fetch(fetches), "mirror"))
+    thread.start()
+    results = asyncio.run(main())
+    thread.join()
+
+    assert results[:3] == ["SOLARIS"] * 3
+    assert results[3:] == [{'title': "mirror"}] * 3
+    assert fetches == {"solaris": 1, "mirror": 1}
+    assert group.stats.coalesced == 6
+
+
+def test_task_exception():
+    group = SingleFlight()
+
+    async def afetch():
+        await asyncio.sleep(0.05)
+        raise LookupError("No result found.")
+
+    async def main():
+        return await asyncio.gather(
+            *[group.do_async("missing", afetch) for _ in range(3)],
+            return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, LookupError) for result in results)
+    assert group.stats == (3, 2)
+
+
+def test_misses_persisted_only_on_request(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("NEGATIVE_CACHE_PATH")
+    negative_cache().add('imdb', "stalker")
+    assert negative_cache().contains('imdb', "stalker")
+    assert list(tmp_path.iterdir()) == []
+
+    monkeypatch.setenv("NEGATIVE_CACHE_PATH", "misses")
+    negative_cache.cache_clear()
+    negative_cache().add('imdb', "stalker")
+    negative_cache.cache_clear()
+    assert negative_cache().contains('imdb', "stalker")
+    assert [path.name for path in tmp_path.iterdir()] == ["misses"]
+
+
+# --- Benchmarking ---
+# Compare wall time and the number of fetches of concurrent workers issuing
+# requests with a skewed (Zipf-like) query distribution, with and without
+# coalescing, as with overlapping batches of popular titles.
+def skewed_queries(n_requests, n_titles=500, exponent=1.2, seed=0):
+    rng = random.Random(seed)
+    titles = [f"title {i}" for i in range(n_titles)]
+    weights = [1 / rank ** exponent for rank in range(1, n_titles + 1)]
+    return rng.choices(titles, weights, k=n_requests)
+
+
+@pytest.mark.parametrize("coalesce", [False, True])
+@pytest.mark.benchmark(
+    group="single_flight",
+    min_rounds=3,
+    warmup=False,
+)
+def test_skewed_requests_benchmark(benchmark, coalesce):
+    queries = skewed_queries(2000)
+    fetches = Counter()
+    fetch = slow_fetch(fetches, delay=0.005)
+
+    def run():
+        fetches.clear()
+        group = SingleFlight()
+        request = ((lambda title: group.do(title, fetch, title)) if coalesce
+                   else fetch)
+        with ThreadPoolExecutor(32) as executor:
+            list(executor.map(request, queries))
+        return group
+
+    group = benchmark(run)
+    benchmark.extra_info['fetches'] = sum(fetches.values())
+    benchmark.extra_info['coalesced'] = group.stats.coalesced
+    if coalesce:
+        assert group.stats.coalesced > 0
+        assert group.stats.calls == len(queries)
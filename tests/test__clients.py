@@ -0,0 +1,138 @@
+"""
+Tests for the shared clients in '_clients.py'.
+"""
+
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+import spotipy
+
+from datopy._examples import Album, spotify_albums_retrieve
+from datopy._clients import ClientPool, SharedClientCredentials, spotify_client
+
+
+# --- Testing expected behaviour ---
+def test_pool_reuses_clients_across_threads():
+    created = []
+    pool = ClientPool(lambda: created.append(object()) or created[-1], size=3)
+    in_use, peak = set(), []
+    lock = threading.Lock()
+
+    def work():
+        for _ in range(50):
+            with pool.client() as client:
+                with lock:
+                    assert client not in in_use
+                    in_use.add(client)
+                    peak.append(len(in_use))
+                with lock:
+                    in_use.remove(client)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) <= 3
+    assert max(peak) <= 3
+    assert pool.stats.checkouts == 400
+    assert pool.stats.created == len(created)
+
+
+def test_pool_checkout_timeout():
+    pool = ClientPool(object, size=1)
+    with pool.client():
+        with pytest.raises(TimeoutError):
+            with pool.client(timeout=0.01):
+                pass
+    assert pool.stats.waits == 1
+    assert pool.stats.wait_seconds >= 0.01
+
+
+def test_pool_factory_failure_frees_slot():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise ConnectionError("setup failed")
+        return object()
+
+    pool = ClientPool(flaky, size=1)
+    with pytest.raises(ConnectionError):
+        with pool.client():
+            pass
+    with pool.client(timeout=0.1) as client:
+        assert client is not None
+    assert pool.stats.created == 1
+
+
+# --- Spotify client against a local stand-in ---
+def make_client(url, cache_path, refresh_margin=300):
+    credentials = SharedClientCredentials(
+        cache_path, refresh_margin=refresh_margin,
+        token_url=f"{url}/api/token",
+        client_id="client-id", client_secret="client-secret")
+    sp = spotipy.Spotify(auth_manager=credentials, retries=0)
+    sp.prefix = f"{url}/v1/"
+    return sp, credentials
+
+
+def fetch_album(url, cache_path):
+    """Worker process: fetch an album with a client of its own."""
+    sp, credentials = make_client(url, cache_path)
+    for _ in range(3):
+        sp.album("a1")
+    return credentials.exchanges
+
+
+@pytest.fixture
+def spotify_catalogue(spotify_server):
+    spotify_server.albums = {
+        'a1': {'name': "kid a", 'artist': "radiohead",
+               'tracks': [f"t{i}" for i in range(10)]},
+    }
+    return spotify_server
+
+
+def test_token_shared_across_processes(spotify_catalogue, tmp_path):
+    cache_path = tmp_path / "token.json"
+    with ProcessPoolExecutor(4) as executor:
+        exchanges = list(executor.map(
+            fetch_album, [spotify_catalogue.url] * 8, [cache_path] * 8))
+
+    assert sum(exchanges) == 1
+    assert spotify_catalogue.counts['/api/token'] == 1
+    assert spotify_catalogue.counts['/v1/albums/{id}'] == 24
+
+
+def test_token_refreshed_before_expiry(spotify_catalogue, tmp_path):
+    spotify_catalogue.token_lifetime = 2
+    sp, credentials = make_client(spotify_catalogue.url,
+                                  tmp_path / "token.json", refresh_margin=1)
+    sp.album("a1")
+    sp.album("a1")
+    assert credentials.exchanges == 1
+
+    time.sleep(1.2)
+    sp.album("a1")
+    assert credentials.exchanges == 2
+    assert spotify_catalogue.counts['expired'] == 0
+
+
+def test_spotify_client_is_shared(spotify_catalogue, tmp_path, monkeypatch):
+    monkeypatch.setenv("SPOTIPY_CLIENT_ID", "client-id")
+    monkeypatch.setenv("SPOTIPY_CLIENT_SECRET", "client-secret")
+    url = spotify_catalogue.url
+    settings = (str(tmp_path / "token.json"), f"{url}/api/token",
+                f"{url}/v1/")
+    sp = spotify_client(*settings)
+    assert spotify_client(*settings) is sp
+
+    with pytest.warns(DeprecationWarning):
+        objs = spotify_albums_retrieve([Album("kid a", "radiohead")] * 3, sp)
+    assert len(objs) == 3
+    assert spotify_catalogue.counts['/api/token'] == 1
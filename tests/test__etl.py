@@ -0,0 +1,101 @@
+"""
+Tests for the batch normalizer and fuzzy title index in 'etl.py'.
+"""
+
+import random
+import string
+
+import pandas as pd
+import pytest
+
+from datopy.etl import TrigramIndex, _trigrams, normalize_title, \
+    normalize_to_type
+from datopy.modeling import CustomTypes
+
+
+# --- Synthetic titles ---
+def make_titles(n_titles, seed=0):
+    """Titles of one to four words, some sharing very common words."""
+    rng = random.Random(seed)
+    words = ["the", "of", "and"] + [
+        ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8)))
+        for _ in range(300)]
+    return [' '.join(rng.choices(words, k=rng.randint(1, 4)))
+            for _ in range(n_titles)]
+
+
+def misspell(title, rng):
+    """Swap, drop, or replace a random character."""
+    i = rng.randrange(len(title))
+    edit = rng.choice(['swap', 'drop', 'replace'])
+    if edit == 'swap' and i + 1 < len(title):
+        return title[:i] + title[i + 1] + title[i] + title[i + 2:]
+    if edit == 'drop' and len(title) > 1:
+        return title[:i] + title[i + 1:]
+    return title[:i] + rng.choice(string.ascii_lowercase) + title[i + 1:]
+
+
+def trigram_set(title):
+    padded = f"  {normalize_title(title)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def brute_force(titles, query, min_score):
+    """Dice similarity of the query to every title, above ``min_score``."""
+    grams = trigram_set(query)
+    scores = {}
+    for title in {normalize_title(title) for title in titles}:
+        other = trigram_set(title)
+        score = 2 * len(grams & other) / (len(grams) + len(other))
+        if score >= min_score:
+            scores[title] = score
+    return scores
+
+
+# --- Testing expected behaviour ---
+def test_normalize_all_missing():
+    for values in [pd.Series([None, float('nan')], index=[3, 5], name="cast"),
+                   pd.Series([], dtype=object)]:
+        result = normalize_to_type(values, CustomTypes.CSVstr)
+        assert result.values.isna().all()
+        assert result.values.index.equals(values.index)
+        assert result.values.name == values.name
+        assert not result.changed.any()
+        assert result.changed.index.equals(values.index)
+
+
+def test_trigrams_distinct_per_title():
+    keys, owner = _trigrams(["aaaa", "ab", ""])
+    # '  aaaa ' has trigrams '  a', ' aa', 'aaa' (twice), 'aa '
+    assert keys.tolist() == sorted(keys.tolist())
+    assert list(owner).count(0) == 4
+    assert list(owner).count(1) == 3
+    assert list(owner).count(2) == 1
+    assert len(set(zip(keys.tolist(), owner.tolist()))) == len(keys)
+
+
+@pytest.mark.parametrize("min_score", [0.3, 0.5, 0.7, 0.9])
+def test_search_finds_every_title_above_threshold(min_score):
+    titles = make_titles(1000)
+    index = TrigramIndex(titles)
+    rng = random.Random(1)
+    queries = [misspell(title, rng) for title in rng.sample(titles, 50)]
+    queries += ["the of and", "the", "zzzz"]
+    for query in queries:
+        expected = brute_force(titles, query, min_score)
+        found = dict(index.search(query, k=len(titles), min_score=min_score))
+        # Skipping the most common trigrams (pigeonhole bound) loses no
+        # title at or above the threshold, and admits none below it
+        assert found.keys() == expected.keys(), query
+        for title, score in found.items():
+            assert score == pytest.approx(expected[title])
+
+
+def test_search_ranks_best_first():
+    titles = make_titles(1000)
+    index = TrigramIndex(titles)
+    query = misspell(titles[7], random.Random(2))
+    results = index.search(query, k=3, min_score=0.0)
+    expected = sorted(brute_force(titles, query, 0.0).values(), reverse=True)
+    assert [score for _, score in results] == pytest.approx(expected[:3])
+    assert index.search(query, k=3, min_score=1.01) == []
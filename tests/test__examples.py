@@ -0,0 +1,259 @@
+"""
+Tests and benchmarks for the bulk data model routines in '_examples.py'.
+"""
+
+import os
+import time
+import random
+
+import warnings
+
+import jsonschema
+import pandas as pd
+import pytest
+import spotipy
+
+from datopy.modeling import list_to_dict
+from datopy import _examples
+from datopy._examples import (
+    Album, Book, Film, extract_datamodel, extract_datamodels,
+    retrieve_all_sources, retrieve_media, run_auto_datamodel_example,
+    spotify_album_retrieve, spotify_albums_retrieve,
+)
+from datopy._http import AdaptiveLimiter
+
+
+# --- Local benchmark corpus ---
+def make_corpus(n_payloads, seed=0):
+    """Generate album-like payloads resembling cached Spotify responses."""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(n_payloads):
+        n_tracks = rng.randint(5, 15)
+        corpus.append({
+            'id': f"album{i:06d}",
+            'name': f"album number {i}",
+            'total_tracks': n_tracks,
+            'label': rng.choice(['xl', 'parlophone', None]),
+            'artists': [{'name': f"artist {rng.randint(0, 500)}",
+                         'type': 'artist'}],
+            'track_audio_features': {
+                track: {'loudness': rng.uniform(-20, 0),
+                        'duration_ms': rng.randint(120_000, 480_000),
+                        'key': rng.randint(0, 11)}
+                for track in range(1, n_tracks + 1)
+            },
+        })
+    return corpus
+
+
+# --- Testing expected behaviour ---
+def test_bulk_matches_single_extraction():
+    corpus = make_corpus(50)
+    bulk = extract_datamodels(corpus, max_workers=2, chunksize=8)
+
+    expected = pd.concat(
+        [extract_datamodel(obj).normalized for obj in corpus],
+        ignore_index=True)
+    pd.testing.assert_frame_equal(
+        bulk.normalized[expected.columns], expected)
+
+    assert bulk.schema['label'] == 'NoneType | str'
+    assert bulk.json_schema['properties']['label'] == {
+        'type': ['null', 'string']}
+    for obj in corpus:
+        jsonschema.validate(obj, bulk.json_schema)
+
+
+def test_bulk_json_schema_accepts_every_payload():
+    objs = [{'a': 'x', 'n': 1, 'tags': ['new']},
+            {'a': None, 'n': 2.5, 'tags': [], 'extra': True}]
+    bulk = extract_datamodels(objs, max_workers=1)
+    assert bulk.json_schema['properties']['a'] == {'type': ['null', 'string']}
+    assert bulk.json_schema['properties']['n'] == {'type': 'number'}
+    assert bulk.json_schema['required'] == ['a', 'n', 'tags']
+    for obj in objs:
+        jsonschema.validate(obj, bulk.json_schema)
+    with pytest.raises(jsonschema.ValidationError):
+        jsonschema.validate({'a': 1, 'n': 1, 'tags': []}, bulk.json_schema)
+
+
+def test_bulk_empty():
+    bulk = extract_datamodels([], max_workers=1)
+    assert bulk.schema == {}
+    assert bulk.normalized.empty
+
+
+# --- Spotify retrieval against a local stand-in ---
+def stub_client(server):
+    sp = spotipy.Spotify(auth="stand-in-token", retries=0)
+    sp.prefix = f"{server.url}/v1/"
+    return sp
+
+
+def legacy_album_retrieve(album, sp):
+    """Previous per-track retrieval, for comparing request counts."""
+    results = sp.search(
+        q=f'artist:{album.artist} album:{album.title}', type='album')
+    album_id = results['albums']['items'][0]['id']
+    album_details = sp.album(album_id)
+    tracks = sp.album_tracks(album_id)['items']
+    features, streams = [], []
+    for track_info in tracks:
+        features.append(sp.audio_features(track_info['id'])[0])
+        streams.append(sp.track(track_info['id'])['popularity'])
+    return album_details, list_to_dict(features), list_to_dict(streams)
+
+
+@pytest.fixture
+def catalogue(spotify_server):
+    shared = [f"t{i}" for i in range(10)]
+    spotify_server.albums = {
+        'a1': {'name': "kid a", 'artist': "radiohead",
+               'tracks': shared + [f"t{i}" for i in range(100, 102)]},
+        'a2': {'name': "amnesiac", 'artist': "radiohead",
+               'tracks': [f"t{i}" for i in range(200, 211)]},
+        'a3': {'name': "best of", 'artist': "radiohead",
+               'tracks': shared + [f"t{i}" for i in range(300, 420)]},
+    }
+    return spotify_server
+
+
+ALBUMS = [Album("kid a", "radiohead"), Album("amnesiac", "radiohead"),
+          Album("best of", "radiohead")]
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_spotify_batch_retrieval(catalogue):
+    sp = stub_client(catalogue)
+    objs = spotify_albums_retrieve(ALBUMS, sp)
+    batched = dict(catalogue.counts)
+
+    assert [obj['id'] for obj in objs] == ['a1', 'a2', 'a3']
+    # Every page of a long album's tracks is included
+    assert len(objs[2]['track_streams']) == 130
+    assert objs[2]['track_streams'][130] == 19
+    assert objs[0]['track_audio_features'][1]['id'] == 't0'
+    # Shared tracks are requested once: 143 distinct tracks
+    assert batched == {
+        '/v1/search': 3, '/v1/albums': 1, '/v1/albums/{id}/tracks': 2,
+        '/v1/audio-features': 2, '/v1/tracks': 3,
+    }
+
+    catalogue.counts.clear()
+    legacy = [legacy_album_retrieve(album, sp) for album in ALBUMS[:2]]
+    for obj, (details, features, streams) in zip(objs, legacy):
+        assert obj['track_audio_features'] == features
+        assert obj['track_streams'] == streams
+        assert obj['name'] == details['name']
+
+    catalogue.counts.clear()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for album in ALBUMS:
+            legacy_album_retrieve(album, sp)
+    print(f"\nSpotify requests for {len(ALBUMS)} albums: "
+          f"{sum(catalogue.counts.values())} per track, "
+          f"{sum(batched.values())} batched")
+    assert sum(batched.values()) < sum(catalogue.counts.values()) / 10
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_spotify_single_album(catalogue):
+    obj = spotify_album_retrieve(ALBUMS[1], stub_client(catalogue))
+    assert obj['track_streams'] == {i: (200 + i - 1) % 100
+                                    for i in range(1, 12)}
+    with pytest.raises(LookupError):
+        spotify_album_retrieve(Album("ok computer", "radiohead"),
+                               stub_client(catalogue))
+
+
+# --- Concurrent multi-source retrieval ---
+def slow_retriever(delay, **obj):
+    def retrieve(query):
+        time.sleep(delay)
+        return {'title': query.title, **obj}
+    return retrieve
+
+
+def failing_retriever(query):
+    raise LookupError(f"No results found for {query.title}.")
+
+
+def test_all_sources_concurrent(monkeypatch):
+    monkeypatch.setitem(_examples.RETRIEVERS, 'imdb',
+                        slow_retriever(0.3, genres=['drama']))
+    monkeypatch.setitem(_examples.RETRIEVERS, 'wiki',
+                        slow_retriever(0.3, budget='$1'))
+
+    start = time.perf_counter()
+    datamodel = run_auto_datamodel_example('all', Film("stalker"))
+    elapsed = time.perf_counter() - start
+
+    # Roughly the slowest source, not the sum
+    assert elapsed < 0.5
+    assert datamodel.obj == {
+        'imdb': {'title': "stalker", 'genres': ['drama']},
+        'wiki': {'title': "stalker", 'budget': '$1'},
+    }
+    assert {'imdb.genres.1', 'wiki.budget'} <= set(datamodel.normalized)
+
+
+def test_all_sources_partial(monkeypatch, capsys):
+    monkeypatch.setitem(_examples.RETRIEVERS, 'spotify',
+                        slow_retriever(2, label='xl'))
+    monkeypatch.setitem(_examples.RETRIEVERS, 'wiki',
+                        slow_retriever(0, genre='rock'))
+
+    start = time.perf_counter()
+    datamodel = run_auto_datamodel_example(
+        'all', Album("kid a", "radiohead"), timeout=0.2)
+    assert time.perf_counter() - start < 1
+    assert list(datamodel.obj) == ['wiki']
+    assert "Omitted spotify" in capsys.readouterr().out
+
+    monkeypatch.setitem(_examples.RETRIEVERS, 'wiki', failing_retriever)
+    with pytest.raises(LookupError, match="No results found for kid a"):
+        retrieve_all_sources(Album("kid a", "radiohead"), timeout=0.2)
+
+    with pytest.raises(LookupError):
+        retrieve_all_sources(Book("dune"))
+
+
+def test_retrieve_media_adapts_concurrency(monkeypatch, capsys):
+    def retrieve(query):
+        if query.title == "missing":
+            return failing_retriever(query)
+        if query.title == "broken":
+            raise ConnectionError("Connection reset.")
+        return slow_retriever(0.02)(query)
+
+    monkeypatch.setitem(_examples.RETRIEVERS, 'wiki', retrieve)
+    limiter = AdaptiveLimiter(initial=1, max_limit=8)
+    queries = [Book(f"novel {i}") for i in range(60)]
+    objs = retrieve_media(queries + [Book("missing"), Book("novel 1")],
+                          'wiki', max_workers=8, limiter=limiter)
+
+    assert len(objs) == 61
+    assert objs[Book("novel 7")] == {'title': "novel 7"}
+    assert objs[Book("missing")] is None
+    assert limiter.stats.peak_limit > 1
+
+    assert retrieve_media([Book("broken")], 'wiki') == {Book("broken"): None}
+    assert "Failed to retrieve" in capsys.readouterr().out
+
+
+# --- Benchmarking ---
+# Compare wall time across worker counts; expect near-linear speedup up to
+# the number of physical cores.
+@pytest.mark.parametrize("max_workers", sorted({1, 2, os.cpu_count() or 1}))
+@pytest.mark.benchmark(
+    group="extract_datamodels",
+    min_rounds=3,
+    warmup=False,
+)
+def test_bulk_scaling_benchmark(benchmark, max_workers):
+    corpus = make_corpus(2000)
+    bulk = benchmark(extract_datamodels, corpus,
+                     max_workers=max_workers, chunksize=100)
+    assert len(bulk.normalized) == len(corpus)
@@ -0,0 +1,658 @@
+"""
+Tests and benchmarks for the resilient HTTP session in '_http.py', against
+local fault-injecting and capacity-limited servers.
+"""
+
+import time
+import random
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from datopy._http import (
+    AdaptiveLimiter, CircuitOpenError, DeadlineExceeded, Hedger, HTTPCache,
+    HostRegistry, ResilientSession, TokenBucket, _retry_after, carry_deadline,
+    deadline, http_cache, remaining,
+)
+
+
+# --- Local fault-injecting server ---
+class FaultyServer(BaseHTTPRequestHandler):
+    """Inject failures by path, counting requests per path.
+
+    - ``/flaky?fail=N``: the first N requests get 503
+    - ``/throttle?after=S``: the first request gets 429 with Retry-After S
+    - ``/limited``: requests beyond ``rate`` per second get 429
+    - ``/down``: 503 while ``down`` is set
+    - ``/hang``: responds after ``hang`` seconds
+    - ``/tail``: responds after 5 ms, or after ``hang`` seconds for a random
+      ``tail`` fraction of requests
+    - ``/cached?max_age=S&validator=V&chunked=1``: a page at ``version``,
+      with an ``etag``, a ``date`` (Last-Modified), or no validator,
+      answered with 304 when the request's validator matches, and sent in
+      chunks, without a Content-Length, if ``chunked`` is set
+    """
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    rate = 20
+    admitted: list = []
+    down = True
+    hang = 1.0
+    tail = 0.02
+    rng = random.Random(0)
+    version = 1
+
+    def do_GET(self):
+        cls = type(self)
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with cls.lock:
+            cls.counts[url.path] += 1
+            count = cls.counts[url.path]
+
+        if url.path == "/flaky" and count <= int(query['fail']):
+            return self.reply(503)
+        if url.path == "/throttle" and count == 1:
+            return self.reply(429, {'Retry-After': query['after']})
+        if url.path == "/limited":
+            with cls.lock:
+                now = time.monotonic()
+                cls.admitted = [t for t in cls.admitted if now - t < 1]
+                if len(cls.admitted) >= cls.rate:
+                    cls.counts['429'] += 1
+                    return self.reply(429, {'Retry-After': "1"})
+                cls.admitted.append(now)
+        if url.path == "/down" and cls.down:
+            return self.reply(503)
+        if url.path == "/hang":
+            time.sleep(cls.hang)
+        if url.path == "/cached":
+            return self.cached(query.get('max_age', "0"),
+                               query.get('validator', "etag"),
+                               'chunked' in query)
+        if url.path == "/tail":
+            with cls.lock:
+                slow = cls.rng.random() < cls.tail
+            time.sleep(cls.hang if slow else 0.005)
+        try:
+            self.reply(200)
+        except ConnectionError:
+            pass  # The client timed out and hung up
+
+    do_POST = do_GET
+
+    def cached(self, max_age, validator, chunked=False):
+        cls = type(self)
+        validators = {
+            'etag': ('ETag', 'If-None-Match', f'"v{cls.version}"'),
+            'date': ('Last-Modified', 'If-Modified-Since',
+                     formatdate(1e9 + cls.version, usegmt=True)),
+        }
+        headers = {'Cache-Control': f"max-age={max_age}"}
+        if validator in validators:
+            field, condition, value = validators[validator]
+            headers[field] = value
+            if self.headers.get(condition) == value:
+                with cls.lock:
+                    cls.counts['304'] += 1
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                return self.end_headers()
+        body = f"page v{cls.version}\n".encode() * 1000
+        if not chunked:
+            return self.reply(200, headers, body)
+        self.send_response(200)
+        for name, value in {**headers, 'Transfer-Encoding': "chunked"}.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(b"%x\r\n%s\r\n0\r\n\r\n" % (len(body), body))
+
+    def reply(self, status, headers={}, body=None):
+        body = str(status).encode() if body is None else body
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    FaultyServer.counts = Counter()
+    FaultyServer.admitted = []
+    FaultyServer.down = True
+    FaultyServer.rng = random.Random(0)
+    FaultyServer.version = 1
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), FaultyServer)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def session(**policy):
+    registry = HostRegistry(**{'backoff': 0.01, **policy})
+    return ResilientSession(registry, timeout=5)
+
+
+# --- Testing expected behaviour ---
+def test_retries_until_success(server):
+    sp = session(max_retries=4)
+    assert sp.get(f"{server}/flaky?fail=3").status_code == 200
+    assert FaultyServer.counts['/flaky'] == 4
+    assert sp.registry.stats.retries == 3
+
+
+def test_gives_up_after_max_retries(server):
+    sp = session(max_retries=2)
+    response = sp.get(f"{server}/flaky?fail=10")
+    assert response.status_code == 503
+    with pytest.raises(requests.exceptions.HTTPError):
+        response.raise_for_status()
+    assert FaultyServer.counts['/flaky'] == 3
+
+    # Requests that may not be repeated safely are sent once
+    assert sp.post(f"{server}/flaky?fail=10").status_code == 503
+    assert FaultyServer.counts['/flaky'] == 4
+
+
+def test_retry_after_pauses_the_host(server):
+    sp = session()
+    start = time.monotonic()
+    with ThreadPoolExecutor(4) as executor:
+        first = executor.submit(sp.get, f"{server}/throttle?after=1")
+        time.sleep(0.2)
+        # Sent while the host is paused, so held back until it resumes
+        others = [executor.submit(sp.get, f"{server}/ok") for _ in range(3)]
+        for future in others:
+            assert future.result().status_code == 200
+        others_elapsed = time.monotonic() - start
+        assert first.result().status_code == 200
+    assert others_elapsed >= 0.95
+    assert FaultyServer.counts['/throttle'] == 2
+
+
+def test_retry_after_header_formats():
+    response = requests.Response()
+    response.headers['Retry-After'] = "3"
+    assert _retry_after(response) == 3
+    response.headers['Retry-After'] = formatdate(time.time() + 60,
+                                                 usegmt=True)
+    assert 55 < _retry_after(response) <= 60
+    response.headers['Retry-After'] = "soon"
+    assert _retry_after(response) is None
+
+
+def test_timeouts_retried_then_raised(server):
+    FaultyServer.hang = 0.5
+    sp = session(max_retries=1)
+    start = time.monotonic()
+    with pytest.raises(requests.exceptions.Timeout):
+        sp.get(f"{server}/hang", timeout=0.1)
+    assert time.monotonic() - start < 0.5
+    assert sp.registry.stats.requests == 2
+
+
+def test_circuit_breaker_fails_fast(server):
+    sp = session(max_retries=0, failure_threshold=3, reset_timeout=0.3)
+    for _ in range(3):
+        assert sp.get(f"{server}/down").status_code == 503
+
+    start = time.monotonic()
+    for _ in range(5):
+        with pytest.raises(CircuitOpenError):
+            sp.get(f"{server}/down")
+    assert time.monotonic() - start < 0.05
+    assert FaultyServer.counts['/down'] == 3
+    assert sp.registry.stats.rejected == 5
+
+    # A failed trial reopens the circuit; a successful one closes it
+    time.sleep(0.3)
+    assert sp.get(f"{server}/down").status_code == 503
+    with pytest.raises(CircuitOpenError):
+        sp.get(f"{server}/ok")
+    time.sleep(0.3)
+    FaultyServer.down = False
+    assert sp.get(f"{server}/down").status_code == 200
+    assert sp.get(f"{server}/ok").status_code == 200
+    assert FaultyServer.counts['/down'] == 5
+
+
+def test_rate_limit_predictable_throughput(server):
+    host = urlparse(server).netloc
+    sp = session()
+    sp.registry.limit(host, rate=FaultyServer.rate, burst=1)
+
+    start = time.monotonic()
+    with ThreadPoolExecutor(8) as executor:
+        responses = list(executor.map(
+            lambda _: sp.get(f"{server}/limited"), range(30)))
+    elapsed = time.monotonic() - start
+
+    assert all(response.status_code == 200 for response in responses)
+    # Spaced out to the server's limit: no 429s, and 30 requests at 20/s
+    assert FaultyServer.counts['429'] == 0
+    assert 1.3 < elapsed < 2.5
+    assert sp.registry.stats.throttled_seconds > 0
+
+
+def test_token_bucket_burst_and_pause():
+    bucket = TokenBucket(rate=None)
+    assert [bucket.acquire() for _ in range(100)] == [0.0] * 100
+    bucket.pause(0.1)
+    assert 0.05 < bucket.acquire() <= 0.15
+
+
+def test_deadline_caps_nested_requests(server):
+    FaultyServer.hang = 1.0
+    sp = session(max_retries=4)
+
+    def nested():
+        # A generous request timeout, cut short by the enclosing deadline
+        return sp.get(f"{server}/hang", timeout=5)
+
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.3):
+            nested()
+    assert time.monotonic() - start < 0.6
+    # Not retried once the budget ran out, nor counted against the host
+    assert FaultyServer.counts['/hang'] == 1
+    assert sp.registry.host(urlparse(server).netloc)[1].state == 'closed'
+
+    # Requests made after expiry are not sent
+    with pytest.raises(DeadlineExceeded):
+        with deadline(0.01):
+            time.sleep(0.02)
+            sp.get(f"{server}/ok")
+    assert FaultyServer.counts['/ok'] == 0
+
+
+def test_deadline_carried_to_worker_threads(server):
+    FaultyServer.hang = 1.0
+    sp = session()
+    with deadline(0.3):
+        assert 0.2 < remaining() <= 0.3
+        with ThreadPoolExecutor(2) as executor:
+            assert executor.submit(remaining).result() is None
+            future = executor.submit(
+                carry_deadline(sp.get), f"{server}/hang")
+            with pytest.raises(DeadlineExceeded):
+                future.result()
+    assert remaining() is None
+
+
+def test_deadline_shortened_not_extended():
+    with deadline(0.2):
+        with deadline(10):
+            assert remaining() <= 0.2
+        with deadline(0.05):
+            assert remaining() <= 0.05
+    with deadline(None):
+        assert remaining() is None
+
+
+def test_cache_revalidates_unchanged_pages(server, tmp_path):
+    cache = HTTPCache(tmp_path / "http")
+    sp = ResilientSession(HostRegistry(), cache=cache)
+    for validator in ["etag", "date"]:
+        url = f"{server}/cached?validator={validator}"
+        first, second = sp.get(url), sp.get(url)
+        assert first.status_code == second.status_code == 200
+        assert first.content == second.content == b"page v1\n" * 1000
+        assert second.headers['Cache-Control'] == "max-age=0"
+    assert FaultyServer.counts['/cached'] == 4
+    assert FaultyServer.counts['304'] == 2
+    assert cache.stats == (4, 0, 2, 2, 16_000)
+
+    # Changed pages are downloaded and stored again
+    FaultyServer.version = 2
+    assert sp.get(f"{server}/cached").content == b"page v2\n" * 1000
+    assert FaultyServer.counts['304'] == 2
+    assert cache.stats.stored == 3
+
+    # Requests with their own conditions, and other methods, pass through
+    assert sp.get(f"{server}/cached", headers={
+        'If-None-Match': '"v1"'}).content == b"page v2\n" * 1000
+    assert sp.post(f"{server}/cached").status_code == 200
+    assert cache.stats.lookups == 5
+
+
+def test_cache_serves_fresh_pages_without_requests(server, tmp_path):
+    cache = HTTPCache(tmp_path / "http")
+    sp = ResilientSession(HostRegistry(), cache=cache)
+    fresh = f"{server}/cached?max_age=60&validator=none"
+    stale = f"{server}/cached?max_age=0&validator=none"
+    for url in [fresh, stale]:
+        for _ in range(3):
+            assert sp.get(url).content == b"page v1\n" * 1000
+    # Fresh pages are shared with other sessions and processes; stale pages
+    # without validators are not stored
+    assert HTTPCache(tmp_path / "http").lookup(fresh).fresh
+    assert FaultyServer.counts['/cached'] == 4
+    assert cache.stats == (6, 2, 0, 1, 16_000)
+
+
+def test_shared_cache_enabled_by_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("HTTP_CACHE_PATH")
+    assert http_cache() is None
+    monkeypatch.setenv("HTTP_CACHE_PATH", "http")
+    http_cache.cache_clear()
+    assert http_cache().path == "http"
+    assert [path.name for path in tmp_path.iterdir()] == ["http"]
+
+
+def test_fresh_hits_bypass_host_policies(server, tmp_path):
+    registry = HostRegistry()
+    limiter = AdaptiveLimiter(initial=4, max_limit=8)
+    hedger = Hedger(percentile=50, budget=0, min_samples=5)
+    sp = ResilientSession(registry, limiter=limiter, hedger=hedger,
+                          cache=HTTPCache(tmp_path / "http"))
+    fresh = f"{server}/cached?max_age=60&validator=none"
+    FaultyServer.hang = 0.02
+    try:
+        for i in range(80):
+            sp.get(fresh if i % 4 == 0 else f"{server}/hang")
+    finally:
+        FaultyServer.hang = 1.0
+
+    # One in four requests is answered locally, unseen by the host's token
+    # bucket, the limiter, and the hedger: their near-zero latencies do not
+    # make the live requests look like spikes
+    assert FaultyServer.counts['/cached'] == 1
+    assert registry.stats.requests == hedger.stats.requests == 61
+    assert limiter.stats.decreases == 0 and limiter.limit == 8
+    assert hedger.delay(urlparse(server).netloc) >= 0.02
+
+
+def test_cache_skips_streamed_bodies_of_unknown_size(server, tmp_path):
+    cache = HTTPCache(tmp_path / "http")
+    sp = ResilientSession(HostRegistry(), cache=cache)
+    url = f"{server}/cached?chunked=1"
+    # Streamed bodies without a Content-Length are left to the caller
+    with sp.get(url, stream=True) as response:
+        assert b"".join(response.iter_content(1024)) == b"page v1\n" * 1000
+    assert cache.stats.stored == 0
+    assert sp.get(url).content == b"page v1\n" * 1000
+    assert cache.stats.stored == 1
+    # Others are stored, and still streamed to the caller
+    with sp.get(f"{server}/cached", stream=True) as response:
+        assert response.raw.read() == b"page v1\n" * 1000
+    assert cache.stats.stored == 2
+
+
+def latencies(url, n_requests, hedger=None):
+    """Time ``n_requests`` requests from four threads."""
+    sp = ResilientSession(HostRegistry(), hedger=hedger)
+
+    def timed(_):
+        start = time.monotonic()
+        assert sp.get(url).status_code == 200
+        return time.monotonic() - start
+
+    with ThreadPoolExecutor(4) as executor:
+        return sorted(executor.map(timed, range(n_requests)))
+
+
+def percentile(values, q):
+    return values[round(q / 100 * (len(values) - 1))]
+
+
+def test_hedging_cuts_tail_latency_within_budget(server):
+    FaultyServer.hang = 0.3
+    unhedged = latencies(f"{server}/tail", 300)
+    hedger = Hedger(percentile=95, budget=0.05)
+    hedged = latencies(f"{server}/tail", 300, hedger)
+
+    assert percentile(unhedged, 99) >= 0.3
+    assert percentile(hedged, 99) < 0.15
+    assert percentile(hedged, 50) < 0.05
+    stats = hedger.stats
+    assert stats.requests == 300
+    assert 0 < stats.won <= stats.hedged <= 0.05 * 300
+    assert FaultyServer.counts['/tail'] == 600 + stats.hedged
+
+
+def test_hedging_waits_for_samples_and_budget():
+    hedger = Hedger(percentile=50, budget=0.25, min_samples=3)
+    assert hedger.delay('host') is None
+    for delay in [0.01, 0.02, 0.03]:
+        hedger.call('host', lambda: time.sleep(delay))
+    assert 0.015 < hedger.delay('host') < 0.03
+    assert hedger.delay('other') is None
+
+    # Hedges are limited to a quarter of the requests
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+    hedger.call('host', slow)
+    assert hedger.stats == (4, 1, 0)
+    assert len(calls) == 2
+    hedger.call('host', slow)
+    assert hedger.stats == (5, 1, 0)
+    assert len(calls) == 3
+
+    def fail():
+        raise ValueError
+    with pytest.raises(ValueError):
+        hedger.call('host', fail)
+
+
+def test_hedging_never_queues_for_workers():
+    hedger = Hedger(percentile=50, budget=1, min_samples=3, max_workers=2)
+    for _ in range(3):
+        hedger.call('host', lambda: time.sleep(0.01))
+
+    # Six slow requests at once run together: those finding no idle worker
+    # run on their calling thread, and none is hedged while both are busy
+    start = time.monotonic()
+    with ThreadPoolExecutor(6) as executor:
+        list(executor.map(
+            lambda _: hedger.call('host', lambda: time.sleep(0.2)), range(6)))
+    assert time.monotonic() - start < 0.35
+    assert hedger.stats.hedged == 0
+
+
+def test_hedges_wait_for_rate_limit(server):
+    host = urlparse(server).netloc
+    registry = HostRegistry()
+    registry.limit(host, rate=10, burst=1)
+    sp = ResilientSession(registry, hedger=Hedger(
+        percentile=50, budget=1, min_samples=3))
+    FaultyServer.tail, FaultyServer.hang = 0, 0.2
+    try:
+        for _ in range(3):
+            sp.get(f"{server}/tail")
+        throttled = registry.stats.throttled_seconds
+        assert sp.get(f"{server}/hang").status_code == 200
+    finally:
+        FaultyServer.tail, FaultyServer.hang = 0.02, 1.0
+
+    # The request and its hedge each waited about 0.1 s for a token
+    assert registry.stats.throttled_seconds - throttled > 0.15
+    assert registry.stats.requests == 5 == sum(FaultyServer.counts.values())
+
+
+# --- Local capacity-limited server ---
+class CapacityServer(BaseHTTPRequestHandler):
+    """Serve ``capacity`` concurrent requests promptly. Beyond that, latency
+    grows with the requests in flight, as they queue for the capacity, and
+    beyond ``1.5 * capacity`` requests are refused with 429."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    capacity = 8
+    latency = 0.02
+    lock = threading.Lock()
+    in_flight = 0
+    counts: Counter = Counter()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            in_flight = cls.in_flight
+        try:
+            if in_flight > 1.5 * cls.capacity:
+                status = 429
+            else:
+                status = 200
+                time.sleep(cls.latency * max(1, in_flight / cls.capacity))
+            with cls.lock:
+                cls.counts[status] += 1
+            self.send_response(status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def capacity_server():
+    CapacityServer.counts = Counter()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), CapacityServer)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def fetch_all(url, n_requests, max_workers, limiter=None):
+    """Fetch ``url`` repeatedly, retrying throttled requests."""
+    registry = HostRegistry(max_retries=20, backoff=0.02, max_backoff=0.5)
+    sp = ResilientSession(registry, limiter=limiter,
+                          max_connections=max_workers)
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(lambda _: sp.get(url).status_code,
+                                 range(n_requests)))
+
+
+def test_limiter_converges_to_capacity(capacity_server):
+    limiter = AdaptiveLimiter(initial=1, max_limit=64)
+    fetch_all(capacity_server, 600, max_workers=64, limiter=limiter)
+
+    history = [limit for _, limit in limiter.history]
+    assert history[0] == 1
+    assert limiter.stats.increases > 0 and limiter.stats.decreases > 0
+    # Grows past the server's capacity, then backs off below its 429 point
+    assert limiter.stats.peak_limit >= CapacityServer.capacity
+    assert max(history[len(history) // 2:]) <= 2 * CapacityServer.capacity
+    assert CapacityServer.counts[429] < 60
+
+
+def test_limiter_blocks_at_limit():
+    limiter = AdaptiveLimiter(initial=2, max_limit=2)
+    first, second = limiter.acquire(), limiter.acquire()
+    acquired = []
+    thread = threading.Thread(
+        target=lambda: acquired.append(limiter.acquire()))
+    thread.start()
+    thread.join(0.1)
+    assert not acquired
+    assert limiter.stats.in_flight == 2
+    limiter.release(first)
+    thread.join(1)
+    assert acquired
+    for slot in [second, *acquired]:
+        limiter.release(slot)
+
+    with pytest.raises(ValueError):
+        with limiter.slot():
+            raise ValueError
+    assert limiter.limit == 1
+
+
+def test_limiter_ignores_fast_outliers():
+    limiter = AdaptiveLimiter(initial=4, max_limit=4)
+
+    def complete(latency):
+        slot = limiter.acquire()
+        slot.start -= latency
+        limiter.release(slot)
+
+    # Spikes are only looked for once enough latencies are known
+    complete(0.1)
+    complete(0.5)
+    for _ in range(18):
+        complete(0.1)
+    assert limiter.stats.decreases == 0
+
+    # A request far faster than usual does not make typical ones spikes,
+    # nor do a tenth of requests answered almost instantly
+    complete(0.01)
+    for _ in range(20):
+        complete(0.15)
+    for i in range(60):
+        complete(0.0001 if i % 10 == 0 else 0.1)
+    assert limiter.stats.decreases == 0
+    complete(0.5)
+    assert limiter.stats.decreases == 1
+
+
+# --- Benchmarking ---
+# Compare wall time and throttled requests of fixed worker counts, too timid
+# and too aggressive for the server's capacity, against the adaptive limit.
+@pytest.mark.parametrize("workers", ['fixed-2', 'fixed-32', 'adaptive'])
+@pytest.mark.benchmark(
+    group="adaptive_concurrency",
+    min_rounds=3,
+    warmup=False,
+)
+def test_adaptive_concurrency_benchmark(benchmark, capacity_server, workers):
+    def run():
+        CapacityServer.counts.clear()
+        if workers == 'adaptive':
+            limiter = AdaptiveLimiter(initial=2, max_limit=32)
+            return fetch_all(capacity_server, 400, 32, limiter), limiter
+        return fetch_all(capacity_server, 400, int(workers[6:])), None
+
+    statuses, limiter = benchmark(run)
+    assert statuses == [200] * 400
+    benchmark.extra_info['throttled'] = CapacityServer.counts[429]
+    if limiter is not None:
+        benchmark.extra_info['final_limit'] = limiter.limit
+        benchmark.extra_info['limit_changes'] = len(limiter.history) - 1
+
+
+# Compare the latency percentiles of requests to a host with a slow tail,
+# with and without hedging.
+@pytest.mark.parametrize("hedging", [False, True])
+@pytest.mark.benchmark(
+    group="hedging",
+    min_rounds=3,
+    warmup=False,
+)
+def test_hedging_benchmark(benchmark, server, hedging):
+    FaultyServer.hang = 0.3
+
+    def run():
+        hedger = Hedger(percentile=95, budget=0.05) if hedging else None
+        return latencies(f"{server}/tail", 300, hedger), hedger
+
+    values, hedger = benchmark(run)
+    benchmark.extra_info['p50'] = percentile(values, 50)
+    benchmark.extra_info['p99'] = percentile(values, 99)
+    if hedger is not None:
+        benchmark.extra_info['extra_requests'] = (
+            hedger.stats.hedged / hedger.stats.requests)
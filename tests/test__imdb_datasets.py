@@ -0,0 +1,142 @@
+"""
+Tests and benchmarks for the offline IMDb stores in '_imdb_datasets.py'.
+"""
+
+import gzip
+import random
+
+import pandas as pd
+import pytest
+
+from datopy._clients import ClientPool
+from datopy._imdb_datasets import DATASET_FILES, IMDbMetadataStore
+from datopy._media_scrape import get_film_metadata
+
+
+# --- Synthetic datasets ---
+def write_datasets(path, n_titles, n_names=None, seed=0):
+    """Write gzipped TSV files shaped like the IMDb non-commercial datasets."""
+    rng = random.Random(seed)
+    n_names = n_names or n_titles // 2
+    genres = ['Drama', 'Comedy', 'Sci-Fi', 'Horror', 'Romance', 'Mystery']
+    kinds = ['movie'] * 6 + ['tvSeries', 'short', 'tvEpisode']
+    tables = {key: [] for key in DATASET_FILES}
+    tables['basics'].append("tconst\ttitleType\tprimaryTitle\toriginalTitle"
+                            "\tisAdult\tstartYear\tendYear\truntimeMinutes"
+                            "\tgenres")
+    tables['ratings'].append("tconst\taverageRating\tnumVotes")
+    tables['crew'].append("tconst\tdirectors\twriters")
+    tables['principals'].append("tconst\tordering\tnconst\tcategory\tjob"
+                                "\tcharacters")
+    tables['names'].append("nconst\tprimaryName\tbirthYear")
+    for i in range(1, n_titles + 1):
+        tt = f"tt{i:07d}"
+        year = rng.choice([str(rng.randint(1920, 2024)), '\\N'])
+        genre = ','.join(rng.sample(genres, rng.randint(1, 3)))
+        tables['basics'].append(
+            f"{tt}\t{rng.choice(kinds)}\tfilm number {i}\tfilm number {i}"
+            f"\t0\t{year}\t\\N\t{rng.randint(5, 200)}\t{genre}")
+        if rng.random() < 0.7:
+            tables['ratings'].append(
+                f"{tt}\t{rng.randint(10, 100) / 10}\t{rng.randint(5, 10**6)}")
+        people = [f"nm{rng.randint(1, n_names):07d}" for _ in range(3)]
+        tables['crew'].append(f"{tt}\t{','.join(people[:2])}\t{people[2]}")
+        # Principals listed out of billing order
+        orderings = list(range(1, rng.randint(2, 10)))
+        rng.shuffle(orderings)
+        for ordering in orderings:
+            category = rng.choice(['actor', 'actress', 'composer', 'editor'])
+            tables['principals'].append(
+                f"{tt}\t{ordering}\tnm{rng.randint(1, n_names):07d}"
+                f"\t{category}\t\\N\t\\N")
+    for i in range(1, n_names + 1):
+        tables['names'].append(f"nm{i:07d}\tperson {i}\t\\N")
+
+    for key, rows in tables.items():
+        with gzip.open(path / DATASET_FILES[key], "wt") as file:
+            file.write("\n".join(rows) + "\n")
+
+
+@pytest.fixture(scope="module")
+def datasets(tmp_path_factory):
+    path = tmp_path_factory.mktemp("imdb")
+    write_datasets(path, 100_000)
+    return path
+
+
+@pytest.fixture(scope="module")
+def store(datasets):
+    return IMDbMetadataStore.build(datasets, datasets / "store",
+                                   verbose=False)
+
+
+# --- Testing expected behaviour ---
+def test_batch_matches_single_lookups(store):
+    titles = [f"film number {i}" for i in range(1, 100_001, 997)]
+    batch = store.film_metadata(titles + ["no such film"])
+
+    assert len(batch) == len(titles) + 1
+    assert batch.iloc[-1].isna().all()
+    singles = pd.concat([store.film_metadata([title]) for title in titles],
+                        ignore_index=True)
+    pd.testing.assert_frame_equal(batch.iloc[:-1], singles)
+
+
+def test_cast_in_billing_order(store, datasets):
+    ids = [f"tt{i:07d}" for i in range(1, 2001)]
+    films = store.film_metadata_by_id(ids)
+
+    principals = pd.read_csv(datasets / DATASET_FILES['principals'],
+                             sep='\t')
+    principals = principals[principals['tconst'].isin(ids)]
+    # The fixture lists principals out of billing order
+    in_order = principals.groupby('tconst')['ordering'].is_monotonic_increasing
+    assert not in_order.all()
+    billed = principals[principals['category'].isin(['actor', 'actress'])]
+    billed = billed.sort_values(['tconst', 'ordering'])
+    names = "person " + billed['nconst'].str[2:].astype(int).astype(str)
+    expected = names.groupby(billed['tconst']).agg(', '.join)
+
+    cast = films.set_index('imdbID')['cast']
+    cast.index = "tt" + cast.index
+    assert cast.dropna().to_dict() == expected.to_dict()
+    assert set(films['type'].dropna()) <= {
+        'movie', 'tv series', 'short', 'episode'}
+
+
+class NoResults:
+    """A stand-in IMDb client whose searches find nothing."""
+    def search_movie(self, title):
+        return []
+
+
+def test_film_metadata_corrected_only_on_request(tmp_path, capsys):
+    write_datasets(tmp_path, 200)
+    store = IMDbMetadataStore.build(tmp_path, tmp_path / "store", fuzzy=True,
+                                    verbose=False)
+    pool = ClientPool(NoResults, size=1)
+
+    film = get_film_metadata("Film Number 12", store=store, pool=pool)
+    assert film.loc[0, 'imdbID'] == "0000012"
+
+    # Titles absent from the store and from IMDb's search are not matched
+    # to another film unless asked to
+    missing = get_film_metadata("film numbr 12", store=store, pool=pool)
+    assert missing.iloc[0].isna().all()
+    assert "film numbr 12 not found." in capsys.readouterr().out
+    corrected = get_film_metadata("film numbr 12", store=store, pool=pool,
+                                  min_score=0.5)
+    assert corrected.loc[0, 'imdbID'] == "0000012"
+
+
+# --- Benchmarking ---
+# Enriching 100k titles should take a few seconds at most.
+@pytest.mark.benchmark(
+    group="film_metadata",
+    min_rounds=3,
+    warmup=False,
+)
+def test_film_metadata_benchmark(benchmark, store):
+    titles = [f"film number {i}" for i in range(1, 100_001)]
+    films = benchmark(store.film_metadata, titles)
+    assert films['title'].notna().all()
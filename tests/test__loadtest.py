@@ -0,0 +1,67 @@
+"""
+Tests for the load-testing harness in '_loadtest.py'.
+"""
+
+import json
+
+import pytest
+import requests
+
+from datopy._loadtest import OPERATIONS, StandInServer, main, run_load_test
+
+
+# --- Testing expected behaviour ---
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_report_written(tmp_path):
+    path = tmp_path / "report.json"
+    returned = run_load_test(concurrency=50, duration=1.0, n_works=100,
+                             output=str(path))
+    report = json.loads(path.read_text())
+    assert report == returned
+
+    assert report['settings']['concurrency'] == 50
+    assert set(report['operations']) == set(OPERATIONS)
+    assert report['calls'] == sum(
+        stats['calls'] for stats in report['operations'].values())
+    for stats in [report, *report['operations'].values()]:
+        assert stats['calls'] > 0 and stats['errors'] == 0
+        latency = stats['latency_ms']
+        assert 0 < latency['p50'] <= latency['p90'] <= latency['p99'] <= (
+            latency['max'])
+    assert report['throughput_per_s'] > 0
+    assert report['server_requests'] >= report['calls']
+    assert report['peak_rss_mb'] >= report['peak_rss_before_mb'] > 0
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_errors_reported(capsys):
+    report = run_load_test(concurrency=4, duration=0.5, n_works=10,
+                           mix={'imdb_id': 1, 'wiki_metadata': 1},
+                           error_rate=1.0)
+    assert report['error_rate'] == 1.0
+    assert report['errors'] == report['calls'] > 0
+    assert sum(report['operations']['imdb_id']['error_types'].values()) == (
+        report['operations']['imdb_id']['calls'])
+
+
+def test_mix_and_command_line(tmp_path, capsys):
+    with pytest.raises(ValueError):
+        run_load_test(mix={'imdb_id': 1, 'nothing': 1})
+
+    path = tmp_path / "report.json"
+    main(["--concurrency", "2", "--duration", "0.3", "--works", "10",
+          "--mix", "imdb_id=3,film_metadata", "--output", str(path)])
+    report = json.loads(path.read_text())
+    assert report['settings']['mix'] == {'imdb_id': 3, 'film_metadata': 1}
+    assert str(path) in capsys.readouterr().out
+
+
+def test_stand_in_catalogue():
+    with StandInServer(n_works=5, latency=0, error_rate=0) as server:
+        found = requests.get(f"{server.url}/find", params={'q': "Film 4"})
+        missing = requests.get(f"{server.url}/find", params={'q': "film 5"})
+        album = requests.get(f"{server.url}/v1/albums/a2").json()
+    assert 'href="/title/tt0000004/' in found.text
+    assert '/title/' not in missing.text
+    assert album['artists'] == [{'name': "artist 2"}]
+    assert len(album['tracks']['items']) == 12
@@ -0,0 +1,502 @@
+"""
+Tests for the IMDb retrieval routines in '_media_scrape.py', run against a
+local stand-in for imdb.com.
+"""
+
+import gzip
+import json
+import time
+import random
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from bs4 import BeautifulSoup
+
+from datopy._cache import negative_cache, single_flight
+from datopy._examples import Book, wiki_metadata_retrieve
+from datopy._http import DeadlineExceeded
+from datopy._imdb_datasets import IMDbTitleIndex
+from datopy._media_scrape import (
+    MediaWikiBackend, _first_title_id, _parse_review_page, get_imdb_id,
+    get_imdb_ids, get_imdb_reviews, get_wiki_infoboxes, iter_imdb_ids,
+)
+
+
+# --- Local stand-in server ---
+class StandInIMDb(BaseHTTPRequestHandler):
+    """Serve IMDb-like search pages, recording concurrency and connections."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    titles: dict = {}
+    delay = 0.02
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+    requests = 0
+    connections: set = set()
+    paths: list = []
+    n_review_pages = 4
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+            cls.connections.add(self.client_address)
+        try:
+            time.sleep(cls.delay)
+            url = urlparse(self.path)
+            cls.paths.append(self.path)
+            if url.path.startswith("/title/"):
+                return self.review_page(url)
+            if url.path != "/find":
+                return self.reply(404, b"not found")
+            query = parse_qs(url.query)['q'][0]
+            if query == "server error":
+                return self.reply(500, b"oops")
+            links = ''.join(
+                f'<li><a href="/title/{tt}/?ref_=fn_al_tt_1">{title}</a></li>'
+                for title, tt in cls.titles.items() if query in title)
+            body = ('<html><body><a href="/chart/top">Top 250</a>'
+                    f'<ul class="find-results">{links}</ul></body></html>')
+            self.reply(200, body.encode())
+        finally:
+            with cls.lock:
+                cls.in_flight -= 1
+
+    def review_page(self, url):
+        """Serve ``n_review_pages`` pages of 25 reviews."""
+        cls = type(self)
+        if url.path.endswith("/_ajax"):
+            page = int(parse_qs(url.query)['paginationKey'][0])
+        else:
+            page = 0
+        reviews = ''.join(
+            f'<div class="text show-more__control">review {page * 25 + i}'
+            '</div>' for i in range(25))
+        load_more = (f'<div class="load-more-data" data-key="{page + 1}">'
+                     '</div>' if page + 1 < cls.n_review_pages else '')
+        self.reply(200, f'<html><body>{reviews}{load_more}</body></html>'
+                   .encode())
+
+    def reply(self, status, body):
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except ConnectionError:
+            pass  # The client timed out and hung up
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def imdb_server():
+    StandInIMDb.titles = {f"film {i:04d}": f"tt{i:07d}" for i in range(200)}
+    StandInIMDb.max_in_flight = StandInIMDb.requests = 0
+    StandInIMDb.connections = set()
+    StandInIMDb.paths = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInIMDb)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+class StandInWikipedia(BaseHTTPRequestHandler):
+    """Answer MediaWiki ``action=query`` revision requests."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    pages: dict = {}
+    redirects: dict = {}
+    queries: list = []
+
+    def do_GET(self):
+        query = {key: values[0]
+                 for key, values in parse_qs(urlparse(self.path).query).items()}
+        titles = query['titles'].split('|')
+        type(self).queries.append(titles)
+
+        normalized, redirects, pages = [], [], []
+        for title in titles:
+            name = title[0].upper() + title[1:]
+            if name != title:
+                normalized.append({'from': title, 'to': name})
+            if name in self.redirects:
+                redirects.append({'from': name, 'to': self.redirects[name]})
+                name = self.redirects[name]
+            if name in self.pages:
+                pages.append({'title': name, 'revisions': [{'slots': {
+                    'main': {'content': self.pages[name]}}}]})
+            else:
+                pages.append({'title': name, 'missing': True})
+
+        body = json.dumps({'batchcomplete': True, 'query': {
+            'normalized': normalized, 'redirects': redirects,
+            'pages': pages}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def wiki_api():
+    StandInWikipedia.pages = {
+        f"Novel {i}": ("{{Short description|A novel}}\n{{Infobox book\n"
+                       f"| name = Novel {i}\n| author = [[Author {i}]]\n"
+                       f"| pages = {100 + i}\n}}}}\nNovel {i} is a novel.")
+        for i in range(120)
+    }
+    StandInWikipedia.pages["Stub"] = "Stub has no infobox."
+    StandInWikipedia.redirects = {"Old title": "Novel 7"}
+    StandInWikipedia.queries = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInWikipedia)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield MediaWikiBackend(f"http://127.0.0.1:{server.server_port}/w/api.php")
+    server.shutdown()
+    server.server_close()
+
+
+# --- Page corpus ---
+# Synthetic pages shaped like IMDb's: navigation, inline scripts and styles,
+# and tracking markup surrounding the few elements we read.
+def _page_chrome(rng, n_blocks):
+    blocks = []
+    for i in range(n_blocks):
+        blocks.append(
+            f'<div class="ipc-nav__item" data-testid="nav-{i}">'
+            f'<a href="/chart/{rng.randint(0, 999)}/?ref_=nv_{i}" '
+            f'class="ipc-link">Item {i}</a>'
+            f'<span class="sc-{rng.getrandbits(32):x}">'
+            f'{"lorem ipsum " * rng.randint(1, 8)}</span></div>')
+    script = "<script>window.__data = {%s};</script>" % ",".join(
+        f'"k{i}": {rng.random()}' for i in range(n_blocks))
+    return "".join(blocks), script
+
+
+def make_search_page(seed=0, n_blocks=2000):
+    """An IMDb-like search page whose results follow the site chrome."""
+    rng = random.Random(seed)
+    chrome, script = _page_chrome(rng, n_blocks)
+    results = "".join(
+        f'<li class="find-result-item"><a class="ipc-metadata-list-summary-'
+        f'item__t" href="/title/tt{rng.randint(1, 9_999_999):07d}/?ref_=fn_al'
+        f'_tt_{i}">Result {i}</a></li>' for i in range(1, 26))
+    return (f'<html><head>{script}<style>.a{{color:red}}</style></head>'
+            f'<body>{chrome}<ul class="ipc-metadata-list">{results}</ul>'
+            f'{chrome}</body></html>').encode()
+
+
+def make_review_page(seed=0, n_blocks=1000, n_reviews=25):
+    """An IMDb-like review page with ``n_reviews`` reviews."""
+    rng = random.Random(seed)
+    chrome, script = _page_chrome(rng, n_blocks)
+    reviews = "".join(
+        f'<div class="lister-item-content"><div class="ipl-ratings-bar">'
+        f'<span>{rng.randint(1, 10)}</span></div>'
+        f'<a class="title" href="/review/rw{i}/">Review {i}</a>'
+        f'<div class="content"><div class="text show-more__control">'
+        f'Review {i}: {"a fine film, " * rng.randint(20, 200)}<br/>The end.'
+        f'</div></div></div>' for i in range(n_reviews))
+    return (f'<html><head>{script}</head><body>{chrome}'
+            f'<div class="lister-list">{reviews}</div></body></html>').encode()
+
+
+def full_tree_title_id(html):
+    """Previous approach: build the whole tree and scan every link."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for link in soup.find_all('a', href=True):
+        if '/title/tt' in link['href']:
+            return link['href'].split('/title/')[1].split('/')[0]
+    return None
+
+
+def full_tree_reviews(html):
+    """Previous approach: build the whole tree and find the review divs."""
+    soup = BeautifulSoup(html, 'html.parser')
+    return [review.text.strip() for review in soup.find_all(
+        'div', class_='text show-more__control')]
+
+
+# --- Testing expected behaviour ---
+@pytest.mark.parametrize("seed", range(5))
+def test_targeted_parsing_matches_full_tree(seed):
+    search_page = make_search_page(seed, n_blocks=50)
+    review_page = make_review_page(seed, n_blocks=50)
+    assert _first_title_id(search_page) == full_tree_title_id(search_page)
+    assert _parse_review_page(review_page)[0] == full_tree_reviews(review_page)
+
+
+def test_title_link_variants():
+    assert _first_title_id(b"<a href='/title/tt0000001'>x</a>") == "tt0000001"
+    assert _first_title_id(
+        b'<A CLASS="x" HREF="https://www.imdb.com/title/tt0000002/">'
+    ) == "tt0000002"
+    assert _first_title_id(b'<link href="/title/tt0000003/">') is None
+    assert _first_title_id(b'<a data-href="/title/tt0000004/">') is None
+    assert _first_title_id(b'<a href="/name/nm0000001/">') is None
+
+
+def test_single_search(imdb_server):
+    assert get_imdb_id("film 0042", base_url=imdb_server) == "tt0000042"
+    assert get_imdb_id("nothing", base_url=imdb_server) == (
+        "No IMDb Identifier found for 'nothing'.")
+
+
+def test_batch_mapping(imdb_server):
+    titles = [f"film {i:04d}" for i in range(100)]
+    ids = get_imdb_ids(titles + ["nothing", "server error", "film 0001"],
+                       max_workers=4, base_url=imdb_server)
+
+    assert len(ids) == 102
+    assert all(ids[f"film {i:04d}"] == f"tt{i:07d}" for i in range(100))
+    assert ids["nothing"] is None
+    assert ids["server error"] is None
+    # Repeated titles are searched once; the failing search is retried
+    assert StandInIMDb.requests == 102 + 4
+
+
+def test_batch_concurrency_and_keep_alive(imdb_server):
+    titles = [f"film {i:04d}" for i in range(120)]
+    get_imdb_ids(titles, max_workers=6, base_url=imdb_server)
+
+    assert StandInIMDb.max_in_flight <= 6
+    assert StandInIMDb.max_in_flight > 1
+    assert len(StandInIMDb.connections) <= 6
+
+
+def test_results_stream_and_stop_early(imdb_server):
+    titles = [f"film {i:04d}" for i in range(200)]
+    results = iter_imdb_ids(titles, max_workers=4, base_url=imdb_server)
+
+    first = next(results)
+    assert first[1] == "tt" + first[0][-4:].rjust(7, '0')
+    results.close()
+    time.sleep(0.1)
+    assert StandInIMDb.requests < 20
+
+
+def test_reviews_follow_pagination(imdb_server):
+    reviews = list(get_imdb_reviews("tt0000001", num_reviews=None,
+                                    base_url=imdb_server))
+    assert reviews == [f"review {i}" for i in range(100)]
+    assert len(StandInIMDb.paths) == 4
+
+
+def test_reviews_stop_at_num_reviews(imdb_server):
+    reviews = list(get_imdb_reviews("tt0000001", num_reviews=30,
+                                    base_url=imdb_server))
+    assert reviews == [f"review {i}" for i in range(30)]
+    assert len(StandInIMDb.paths) == 2
+
+    assert list(get_imdb_reviews("tt0000001", num_reviews=25,
+                                 base_url=imdb_server))[-1] == "review 24"
+    assert len(StandInIMDb.paths) == 3
+
+
+def test_reviews_prefetch_and_stop_when_closed(imdb_server):
+    reviews = get_imdb_reviews("tt0000001", num_reviews=None,
+                               base_url=imdb_server)
+    assert next(reviews) == "review 0"
+    # The second page is requested while the first is consumed
+    time.sleep(0.2)
+    assert len(StandInIMDb.paths) == 2
+    reviews.close()
+    time.sleep(0.2)
+    assert len(StandInIMDb.paths) == 2
+
+
+def test_reviews_failure(imdb_server, capsys):
+    reviews = get_imdb_reviews("tt0000001", base_url=f"{imdb_server}/x")
+    assert list(reviews) == []
+    assert "Failed to retrieve reviews" in capsys.readouterr().out
+
+
+def test_wiki_infoboxes_in_batches(wiki_api):
+    titles = [f"Novel {i}" for i in range(120)]
+    pages = get_wiki_infoboxes(
+        titles + ["novel 3", "Old title", "Missing", "Stub"], wiki_api)
+
+    assert [len(query) for query in StandInWikipedia.queries] == [50, 50, 24]
+    assert pages["Novel 42"].infobox == {
+        'infobox': "Infobox book", 'name': "Novel 42",
+        'author': "[[Author 42]]", 'pages': "142"}
+    assert pages["novel 3"].page_title == "Novel 3"
+    assert pages["Old title"].redirected_from == "Old title"
+    assert pages["Old title"].infobox['name'] == "Novel 7"
+    assert pages["Missing"].missing and pages["Missing"].infobox is None
+    assert not pages["Stub"].missing and pages["Stub"].infobox is None
+
+
+def test_wiki_metadata_retrieve(wiki_api):
+    obj = wiki_metadata_retrieve(Book("novel 5"), backend=wiki_api)
+    assert obj['author'] == "[[Author 5]]"
+    for title in ["Missing", "Stub"]:
+        with pytest.raises(LookupError):
+            wiki_metadata_retrieve(Book(title), backend=wiki_api)
+
+
+def test_misses_not_searched_again(imdb_server):
+    message = "No IMDb Identifier found for 'nothing'."
+    assert get_imdb_id("nothing", base_url=imdb_server) == message
+    assert get_imdb_id("Nothing ", base_url=imdb_server) == (
+        "No IMDb Identifier found for 'Nothing '.")
+    ids = get_imdb_ids(["nothing", "server error", "film 0001"],
+                       base_url=imdb_server)
+    assert ids == {"nothing": None, "server error": None,
+                   "film 0001": "tt0000001"}
+    get_imdb_id("film 0002", base_url=imdb_server)
+    get_imdb_ids(["server error"], base_url=imdb_server)
+
+    # Failed searches are not misses: 'server error' is searched (and
+    # retried) each time
+    assert StandInIMDb.requests == 3 + 2 * 5
+    assert negative_cache().stats.avoided == 2
+
+    negative_cache().ttl = 0
+    get_imdb_id("no match", base_url=imdb_server)
+    get_imdb_id("no match", base_url=imdb_server)
+    assert StandInIMDb.requests == 15
+
+    # Misses are remembered per host
+    negative_cache().ttl = 3600
+    get_imdb_id("no match", base_url=imdb_server)
+    other_host = imdb_server.replace("127.0.0.1", "localhost")
+    assert get_imdb_id("no match", base_url=other_host) == (
+        "No IMDb Identifier found for 'no match'.")
+    assert StandInIMDb.requests == 17
+
+
+def test_titles_corrected_only_after_search_misses(imdb_server, tmp_path):
+    basics = tmp_path / "title.basics.tsv.gz"
+    with gzip.open(basics, "wt") as file:
+        file.write("tconst\ttitleType\tprimaryTitle\toriginalTitle\tisAdult"
+                   "\tstartYear\tendYear\truntimeMinutes\tgenres\n"
+                   "tt0435761\tmovie\tToy Story 3\tToy Story 3\t0\t2010"
+                   "\t\\N\t103\tAnimation\n")
+    index = IMDbTitleIndex.build(basics, tmp_path / "index", fuzzy=True,
+                                 verbose=False)
+    StandInIMDb.titles["toy story 4"] = "tt1979376"
+
+    # Exact matches resolve locally
+    assert get_imdb_id("Toy Story 3", index=index,
+                       base_url=imdb_server) == "tt0435761"
+    assert StandInIMDb.requests == 0
+
+    # Similar titles are searched, not resolved to the indexed one
+    for min_score in [None, 0.5]:
+        assert get_imdb_id("toy story 4", index=index, min_score=min_score,
+                           base_url=imdb_server) == "tt1979376"
+        assert get_imdb_ids(["toy story 4"], index=index, min_score=min_score,
+                            base_url=imdb_server) == {
+                                "toy story 4": "tt1979376"}
+
+    # Misspellings the search misses are corrected only on request, whether
+    # searched or remembered as misses
+    assert get_imdb_id("toy stroy 3", index=index, base_url=imdb_server) == (
+        "No IMDb Identifier found for 'toy stroy 3'.")
+    assert get_imdb_id("toy stroy 3", index=index, min_score=0.5,
+                       base_url=imdb_server) == "tt0435761"
+    assert get_imdb_ids(["toy stroy 3", "tyo story 3"], index=index,
+                        min_score=0.5, base_url=imdb_server) == {
+                            "toy stroy 3": "tt0435761",
+                            "tyo story 3": "tt0435761"}
+
+
+def test_concurrent_searches_coalesced(imdb_server):
+    StandInIMDb.delay = 0.2
+    try:
+        with ThreadPoolExecutor(8) as executor:
+            # The search of a differently spelled title leads; the stand-in
+            # only matches lowercase queries
+            leader = executor.submit(get_imdb_id, "Film 0007 ",
+                                     base_url=imdb_server)
+            while not StandInIMDb.requests:
+                time.sleep(0.01)
+            followers = list(executor.map(
+                lambda title: get_imdb_id(title, base_url=imdb_server),
+                ["film 0007", "FILM 0007"] * 3 + ["film 0007"]))
+            ids = [leader.result(), *followers]
+    finally:
+        StandInIMDb.delay = 0.02
+    assert ids == ["tt0000007"] * 8
+    assert StandInIMDb.requests == 1
+    assert single_flight().stats.coalesced == 7
+
+
+def test_batch_reports_timed_out_searches(imdb_server):
+    StandInIMDb.delay = 0.3
+    titles = [f"film {i:04d}" for i in range(20)]
+    start = time.monotonic()
+    try:
+        with pytest.raises(DeadlineExceeded) as exc_info:
+            get_imdb_ids(titles, max_workers=4, base_url=imdb_server,
+                         deadline=0.5)
+    finally:
+        StandInIMDb.delay = 0.02
+    assert time.monotonic() - start < 1.0
+
+    err = exc_info.value
+    assert err.timed_out and err.completed
+    assert sorted([*err.timed_out, *err.completed]) == titles
+    assert all(err.completed[title] == "tt" + title[-4:].rjust(7, '0')
+               for title in err.completed)
+    # Searches cut short are not remembered as misses
+    assert not any(negative_cache().contains('imdb_id', title, imdb_server)
+                   for title in err.timed_out)
+
+
+def test_wiki_misses_not_requested_again(wiki_api):
+    for _ in range(3):
+        for title in ["Missing", "Stub"]:
+            with pytest.raises(LookupError):
+                wiki_metadata_retrieve(Book(title), backend=wiki_api)
+    assert len(StandInWikipedia.queries) == 2
+    assert negative_cache().stats.avoided == 4
+
+
+# --- Benchmarking ---
+# Compare parse time (and peak traced memory, in extra_info) of the previous
+# full-tree parsing against the targeted parsers on large synthetic pages.
+PARSERS = {
+    'search': {'full_tree': full_tree_title_id, 'targeted': _first_title_id},
+    'reviews': {'full_tree': full_tree_reviews,
+                'targeted': _parse_review_page},
+}
+PAGES = {'search': make_search_page, 'reviews': make_review_page}
+
+
+@pytest.mark.parametrize("approach", ['full_tree', 'targeted'])
+@pytest.mark.parametrize("page", ['search', 'reviews'])
+@pytest.mark.benchmark(
+    group="imdb_page_parsing",
+    min_rounds=3,
+    warmup=False,
+)
+def test_page_parsing_benchmark(benchmark, page, approach):
+    html = PAGES[page]()
+    parse = PARSERS[page][approach]
+
+    tracemalloc.start()
+    parse(html)
+    benchmark.extra_info['peak_kib'] = (
+        tracemalloc.get_traced_memory()[1] // 1024)
+    benchmark.extra_info['page_kib'] = len(html) // 1024
+    tracemalloc.stop()
+
+    assert benchmark(parse, html)
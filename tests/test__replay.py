@@ -0,0 +1,192 @@
+"""
+Tests and benchmarks for recording and replaying HTTP traffic with
+'_replay.py', against local stand-in servers.
+"""
+
+import time
+import threading
+import urllib.error
+import urllib.request
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+import spotipy
+from wptools.request import WPToolsRequest
+
+from datopy._clients import SharedClientCredentials
+from datopy._examples import Album, spotify_albums_retrieve
+from datopy._replay import Cassette, UnrecordedRequest, use_cassette
+
+
+# --- Local stand-in server ---
+class Pages(BaseHTTPRequestHandler):
+    """Serve ``page {path} #{n}`` for the n-th request of a path, and 404
+    for ``/missing``."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    counts: Counter = Counter()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.counts[self.path] += 1
+            count = cls.counts[self.path]
+        status = 404 if self.path == "/missing" else 200
+        body = f"page {self.path} #{count}".encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def pages():
+    Pages.counts = Counter()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Pages)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+def total_requests():
+    return sum(Pages.counts.values())
+
+
+# --- Testing expected behaviour ---
+def test_requests_replayed_in_order(pages, tmp_path):
+    path = str(tmp_path / "pages.json.gz")
+    with use_cassette(path, mode='record') as cassette:
+        recorded = [requests.get(f"{pages}/a", params={'x': 1, 'y': 2}).text
+                    for _ in range(2)]
+        assert requests.get(f"{pages}/missing").status_code == 404
+    assert recorded == ["page /a?x=1&y=2 #1", "page /a?x=1&y=2 #2"]
+    assert cassette.stats == (3, 0)
+
+    with use_cassette(path) as cassette:
+        replayed = [requests.get(f"{pages}/a?y=2&x=1").text
+                    for _ in range(3)]
+        response = requests.get(f"{pages}/missing")
+        with pytest.raises(UnrecordedRequest):
+            requests.get(f"{pages}/b")
+    # Recorded order, the last response repeating
+    assert replayed == recorded + recorded[-1:]
+    assert response.status_code == 404
+    assert response.headers['Content-Type'] == "text/plain"
+    assert cassette.stats == (0, 4)
+    assert total_requests() == 3
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_urllib_and_curl_replayed(pages, tmp_path):
+    path = str(tmp_path / "pages.json")
+
+    def fetch():
+        with urllib.request.urlopen(f"{pages}/a") as response:
+            page = response.read()
+        with pytest.raises(urllib.error.HTTPError) as exc_info:
+            urllib.request.urlopen(f"{pages}/missing")
+        curl = WPToolsRequest(silent=True)
+        return page, exc_info.value.code, curl.get(f"{pages}/c", "GET"), \
+            curl.info['status']
+
+    with use_cassette(path, mode='record'):
+        recorded = fetch()
+    with use_cassette(path):
+        replayed = fetch()
+    assert recorded == replayed == (b"page /a #1", 404, b"page /c #1", 200)
+    assert total_requests() == 3
+
+
+def test_auto_mode_records_only_new_requests(pages, tmp_path):
+    path = str(tmp_path / "pages.json")
+    with use_cassette(path, mode='auto'):
+        requests.get(f"{pages}/a")
+    with use_cassette(path, mode='auto') as cassette:
+        assert requests.get(f"{pages}/a").text == "page /a #1"
+        assert requests.get(f"{pages}/b").text == "page /b #1"
+    assert cassette.stats == (1, 1)
+    assert total_requests() == 2
+    with pytest.raises(FileNotFoundError):
+        Cassette(str(tmp_path / "none.json"))
+
+
+def test_injected_latency(tmp_path):
+    cassette = Cassette(str(tmp_path / "pages.json"), mode='record')
+    urls = [f"http://stand-in/{i}" for i in range(8)]
+    for url in urls:
+        cassette.add('GET', url, b"page")
+    cassette.latency = 0.1
+    cassette.mode = 'replay'
+
+    start = time.monotonic()
+    with use_cassette(cassette), ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(lambda url: requests.get(url).text,
+                                 urls)) == ["page"] * 8
+    # Served concurrently, each after the injected latency
+    assert 0.1 <= time.monotonic() - start < 0.4
+
+
+@pytest.mark.filterwarnings("ignore::DeprecationWarning")
+def test_spotify_retrieval_replayed(spotify_server, tmp_path):
+    spotify_server.albums = {
+        'a1': {'name': "kid a", 'artist': "radiohead",
+               'tracks': [f"t{i}" for i in range(60)]},
+        'a2': {'name': "amnesiac", 'artist': "radiohead",
+               'tracks': [f"t{i}" for i in range(100, 111)]},
+    }
+    albums = [Album("kid a", "radiohead"), Album("amnesiac", "radiohead")]
+
+    def retrieve(cache_path):
+        credentials = SharedClientCredentials(
+            str(cache_path), token_url=f"{spotify_server.url}/api/token",
+            client_id="client-id", client_secret="client-secret")
+        sp = spotipy.Spotify(auth_manager=credentials, retries=0)
+        sp.prefix = f"{spotify_server.url}/v1/"
+        return spotify_albums_retrieve(albums, sp)
+
+    path = str(tmp_path / "spotify.json.gz")
+    with use_cassette(path, mode='record'):
+        recorded = retrieve(tmp_path / "token-1")
+    counts = dict(spotify_server.counts)
+    with use_cassette(path):
+        replayed = retrieve(tmp_path / "token-2")
+
+    assert replayed == recorded
+    assert len(replayed[0]['track_streams']) == 60
+    assert dict(spotify_server.counts) == counts
+
+
+# --- Benchmarking ---
+# Replay throughput of recorded pages, without and with injected latency.
+@pytest.mark.parametrize("latency", [0.0, 0.01])
+@pytest.mark.benchmark(
+    group="replay",
+    min_rounds=3,
+    warmup=False,
+)
+def test_replay_throughput_benchmark(benchmark, tmp_path, latency):
+    cassette = Cassette(str(tmp_path / "pages.json"), mode='record')
+    urls = [f"http://stand-in/{i}" for i in range(200)]
+    for url in urls:
+        cassette.add('GET', url, b"x" * 10_000)
+    cassette.latency = latency
+    cassette.mode = 'replay'
+
+    def run():
+        with use_cassette(cassette), requests.Session() as session, \
+                ThreadPoolExecutor(8) as executor:
+            return list(executor.map(lambda url: session.get(url).content,
+                                     urls))
+
+    pages = benchmark(run)
+    assert len(pages) == 200
@@ -0,0 +1,280 @@
+"""
+Tests for fetching modules with 'workflow.py', against a local stand-in for
+a raw Git file host.
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import shutil
+import tarfile
+import zipfile
+import tempfile
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from datopy import workflow
+from datopy._http import http_cache
+from datopy.workflow import LOCKFILE, git_module_loader
+
+
+# --- Local stand-in raw file host ---
+class RawFiles(BaseHTTPRequestHandler):
+    """Serve ``files`` by path after ``latency`` seconds, counting requests
+    per method and the most requests in flight. ``/broken`` paths hang up
+    midway through their body, and ``/archive/{user}/{repo}/{format}/
+    {branch}`` serves a ``tar.gz`` or ``zip`` archive of a branch's files,
+    with an ETag, or a corrupt one for a ``corrupt`` branch."""
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    files: dict = {}
+    latency = 0.0
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    in_flight = 0
+    max_in_flight = 0
+
+    def do_GET(self):
+        cls = type(self)
+        with cls.lock:
+            cls.counts[self.command] += 1
+            cls.in_flight += 1
+            cls.max_in_flight = max(cls.max_in_flight, cls.in_flight)
+        time.sleep(cls.latency)
+        with cls.lock:
+            cls.in_flight -= 1
+
+        if self.path.startswith("/archive/"):
+            body = self.archive(*self.path.split('/', 6)[2:])
+        else:
+            body = cls.files.get(self.path.lstrip('/'))
+        if body is None:
+            body = b"404: Not Found"
+            self.send_response(404)
+        else:
+            self.send_response(200)
+            if self.path.startswith("/archive/"):
+                self.send_header("ETag", f'"{hashlib.md5(body).hexdigest()}"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if "/broken" in self.path:
+            self.wfile.write(body[:len(body) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+    def archive(self, user, repo, format, branch):
+        if branch == "corrupt":
+            return b"not an archive"
+        prefix = f"{user}/{repo}/{branch}/"
+        files = {path.removeprefix(prefix): content
+                 for path, content in type(self).files.items()
+                 if path.startswith(prefix)}
+        if not files:
+            return None
+        buffer = io.BytesIO()
+        top = f"{repo}-{branch}"
+        if format == "zip":
+            with zipfile.ZipFile(buffer, 'w') as zipped:
+                for path, content in files.items():
+                    zipped.writestr(f"{top}/{path}", content)
+            return buffer.getvalue()
+        with tarfile.open(fileobj=buffer, mode='w:gz') as tar:
+            for path, content in files.items():
+                info = tarfile.TarInfo(f"{top}/{path}")
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+        return buffer.getvalue()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def raw_files():
+    RawFiles.files = {}
+    RawFiles.latency = 0.0
+    RawFiles.counts = Counter()
+    RawFiles.max_in_flight = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), RawFiles)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def save_dir(tmp_path):
+    return tmp_path / "modules"
+
+
+def listing(save_dir):
+    return sorted(os.listdir(save_dir))
+
+
+# --- Testing expected behaviour ---
+def test_modules_fetched_concurrently(raw_files, save_dir, capsys):
+    RawFiles.latency = 0.1
+    modules = {
+        'user/repo/main': [f"pkg/mod{i}.py" for i in range(8)] + ["gone.py"],
+        'user/other/dev': [f"lib{i}.py" for i in range(4)],
+    }
+    for repo, paths in modules.items():
+        for path in paths[:8]:
+            RawFiles.files[f"{repo}/{path}"] = f"# {repo}/{path}\n".encode()
+
+    start = time.monotonic()
+    report = git_module_loader(modules, save_dir=str(save_dir),
+                               run_download=True, base_url=raw_files)
+    # Thirteen round trips of 0.1 s, eight at a time
+    assert time.monotonic() - start < 0.6
+    assert RawFiles.max_in_flight == 8
+    # One request per module, no separate existence check
+    assert RawFiles.counts == {'GET': 13}
+
+    assert report.missing == ["user/repo/main/gone.py"]
+    assert len(report.downloaded) == 12 and not report.skipped
+    assert listing(save_dir) == sorted(
+        [f"mod{i}.py" for i in range(8)] + [f"lib{i}.py" for i in range(4)])
+    assert (save_dir / "lib3.py").read_text() == "# user/other/dev/lib3.py\n"
+
+    # Reported in the order listed
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Downloading user/repo/main/pkg/mod0.py."
+    assert lines[8] == "Module user/repo/main/gone.py does not exist."
+    assert lines[-1] == "Downloading user/other/dev/lib3.py."
+
+
+def test_present_and_disabled_downloads_skipped(raw_files, save_dir, capsys):
+    RawFiles.files = {"u/r/b/a.py": b"a = 1\n", "u/r/b/b.py": b"b = 1\n"}
+    save_dir.mkdir()
+    (save_dir / "a.py").write_text("a = 0\n")
+    report = git_module_loader({'u/r/b': ["a.py", "b.py"]},
+                               save_dir=str(save_dir), base_url=raw_files)
+    assert capsys.readouterr().out == (
+        "Module u/r/b/a.py already downloaded.\nSkipping download.\n")
+    assert report.skipped == ["u/r/b/a.py", "u/r/b/b.py"]
+    assert listing(save_dir) == ["a.py"]
+    assert (save_dir / "a.py").read_text() == "a = 0\n"
+
+
+def test_interrupted_download_leaves_no_file(raw_files, save_dir, capsys):
+    RawFiles.files = {"u/r/b/broken.py": b"x = 1\n" * 10_000,
+                      "u/r/b/ok.py": b"ok = 1\n"}
+    report = git_module_loader({'u/r/b': ["broken.py", "ok.py"]},
+                               save_dir=str(save_dir), run_download=True,
+                               base_url=raw_files)
+    assert report.failed == ["u/r/b/broken.py"]
+    assert report.downloaded == ["u/r/b/ok.py"]
+    assert listing(save_dir) == ["ok.py"]
+    assert "Module u/r/b/broken.py could not be downloaded" in (
+        capsys.readouterr().out)
+    assert str(report).splitlines()[0] == "Downloaded (1): u/r/b/ok.py"
+
+
+def test_unwritable_module_reported(raw_files, save_dir, monkeypatch,
+                                    capsys):
+    RawFiles.files = {"u/r/b/a.py": b"a = 1\n"}
+
+    def denied(*args, **kwargs):
+        raise PermissionError("Permission denied")
+    monkeypatch.setattr(workflow, "open", denied, raising=False)
+    report = git_module_loader({'u/r/b': ["a.py"]}, save_dir=str(save_dir),
+                               run_download=True, base_url=raw_files)
+    assert report.failed == ["u/r/b/a.py"]
+    assert "Permission denied" in capsys.readouterr().out
+    assert listing(save_dir) == []
+
+
+ARCHIVE_PATH = "/archive/{user}/{repo}/{format}/{branch}"
+
+
+def bundle(n_modules, repo="user/repo/main"):
+    """List ``n_modules`` modules in a branch holding twice as many files."""
+    for i in range(2 * n_modules):
+        RawFiles.files[f"{repo}/pkg/mod{i}.py"] = f"x = {i}\n".encode() * 100
+    return {repo: [f"pkg/mod{i}.py" for i in range(n_modules)]}
+
+
+@pytest.mark.parametrize("archive", ["tar.gz", "zip"])
+def test_archive_extracts_listed_modules(raw_files, save_dir, archive):
+    modules = bundle(5)
+    modules['user/repo/main'].append("gone.py")
+    modules['user/none/main'] = ["mod.py"]
+
+    def load():
+        return git_module_loader(
+            modules, save_dir=str(save_dir), run_download=True,
+            archive=archive, archive_url=raw_files + ARCHIVE_PATH)
+
+    report = load()
+    # One request per branch, extracting only the listed files, streamed
+    # past the HTTP cache
+    assert RawFiles.counts == {'GET': 2}
+    assert http_cache().stats.lookups == 0
+    assert len(report.downloaded) == 5
+    assert report.missing == ["user/repo/main/gone.py", "user/none/main/mod.py"]
+    assert listing(save_dir) == sorted(
+        [LOCKFILE] + [f"mod{i}.py" for i in range(5)])
+    assert (save_dir / "mod4.py").read_bytes() == b"x = 4\n" * 100
+    lock = json.loads((save_dir / LOCKFILE).read_text())
+    assert set(lock) == {f"user/repo/main/pkg/mod{i}.py" for i in range(5)}
+
+    # Unchanged modules are not rewritten; changed ones are
+    RawFiles.files["user/repo/main/pkg/mod1.py"] = b"x = -1\n"
+    mtimes = {path: path.stat().st_mtime_ns for path in save_dir.iterdir()}
+    time.sleep(0.01)
+    report = load()
+    assert report.downloaded == ["user/repo/main/pkg/mod1.py"]
+    assert len(report.skipped) == 4
+    assert (save_dir / "mod1.py").read_bytes() == b"x = -1\n"
+    assert {path.name for path, mtime in mtimes.items()
+            if path.stat().st_mtime_ns != mtime} == {"mod1.py", LOCKFILE}
+
+
+@pytest.mark.parametrize("archive", ["tar.gz", "zip"])
+def test_corrupt_archive_reported(raw_files, save_dir, archive, capsys):
+    modules = bundle(2)
+    modules['user/repo/corrupt'] = ["pkg/mod0.py"]
+    report = git_module_loader(
+        modules, save_dir=str(save_dir), run_download=True, archive=archive,
+        archive_url=raw_files + ARCHIVE_PATH)
+    assert report.failed == ["user/repo/corrupt/pkg/mod0.py"]
+    assert len(report.downloaded) == 2
+    assert "user/repo/corrupt/pkg/mod0.py could not be downloaded" in (
+        capsys.readouterr().out)
+
+
+# --- Benchmarking ---
+# Fetching 60 modules of one branch, one request per module or one archive,
+# from a host answering after 20 ms.
+@pytest.mark.parametrize("archive", [None, "tar.gz", "zip"])
+@pytest.mark.benchmark(
+    group="git-module-loader",
+    min_rounds=3,
+    warmup=False,
+)
+def test_module_fetch_benchmark(benchmark, raw_files, archive, capsys):
+    RawFiles.latency = 0.02
+    modules = bundle(60)
+
+    def run():
+        save_dir = tempfile.mkdtemp()
+        try:
+            return git_module_loader(
+                modules, save_dir=save_dir, run_download=True,
+                base_url=raw_files, archive=archive,
+                archive_url=raw_files + ARCHIVE_PATH)
+        finally:
+            shutil.rmtree(save_dir)
+
+    report = benchmark(run)
+    assert len(report.downloaded) == 60